@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Benchmark CLI cold-start time per subcommand.
+
+Runs each subcommand in a fresh interpreter with ``-X importtime`` and
+reports wall-clock time, total import time and the slowest top-level
+imports. Commands run in a scratch directory holding a dummy ``.env`` and
+a copy of ``config.yaml``, so no network or API keys are needed.
+
+Usage:
+    python benchmarks/bench_cli_startup.py --repeat 5 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+COMMANDS = {
+    "help": ["--help"],
+    "list-sites": ["list-sites"],
+    "init": ["init", "example_config.yaml"],
+    "easy --help": ["easy", "--help"],
+    "batch --help": ["batch", "--help"],
+}
+
+RUNNER = "import sys; sys.argv = ['auto-browser'] + sys.argv[1:]; from browser_automation.cli import main; main()"
+
+
+def parse_importtime(stderr: str) -> Tuple[int, List[Tuple[str, int]]]:
+    """Parse ``-X importtime`` output.
+
+    Returns:
+        Total import time in microseconds and the top-level packages sorted
+        by the time spent importing their own modules
+    """
+    packages: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|", 2)
+        # Summing self time per package avoids double counting nested imports
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    return sum(packages.values()), ranked
+
+
+def run_command(args: List[str], cwd: Path) -> Tuple[float, str]:
+    """Run one CLI invocation and return wall time (ms) and stderr."""
+    env = dict(os.environ, PYTHONPATH=str(PROJECT_DIR))
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUNNER, *args],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{proc.stdout}\n{proc.stderr[-2000:]}")
+    return elapsed, proc.stderr
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per subcommand")
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports to show per subcommand")
+    parser.add_argument("--json", dest="json_path", type=Path, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        (workdir / ".env").write_text("LLM_PROVIDER=openai\nOPENAI_API_KEY=sk-benchmark\n")
+        shutil.copy(PROJECT_DIR / "config.yaml", workdir / "config.yaml")
+
+        for label, command in COMMANDS.items():
+            walls, imports = [], []
+            ranked: List[Tuple[str, int]] = []
+            for _ in range(args.repeat):
+                (workdir / "example_config.yaml").unlink(missing_ok=True)
+                wall_ms, stderr = run_command(command, workdir)
+                total_us, ranked = parse_importtime(stderr)
+                walls.append(wall_ms)
+                imports.append(total_us / 1000)
+
+            results[label] = {
+                "wall_ms_median": round(statistics.median(walls), 1),
+                "wall_ms_min": round(min(walls), 1),
+                "import_ms_median": round(statistics.median(imports), 1),
+                "top_imports_ms": {name: round(us / 1000, 1) for name, us in ranked[:args.top]},
+            }
+            top = ", ".join(f"{name} {ms}" for name, ms in results[label]["top_imports_ms"].items())
+            print(f"{label:<14} wall {results[label]['wall_ms_median']:8.1f} ms   "
+                  f"imports {results[label]['import_ms_median']:8.1f} ms   [{top}]")
+
+    if args.json_path:
+        args.json_path.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark loading a large site-template config.
+
+Generates a config with many site templates and times cold loads (YAML
+parse, no compiled cache), warm loads (compiled cache hit), a single site
+lookup and validating every site.
+
+Usage:
+    python benchmarks/bench_config.py --sites 10000
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from browser_automation.config import load_config, _cache_path  # noqa: E402
+
+
+def generate_config(path: Path, num_sites: int) -> None:
+    """Write a config file with ``num_sites`` site templates."""
+    sites = {}
+    for i in range(num_sites):
+        sites[f"site_{i}"] = {
+            "name": f"Site {i}",
+            "description": f"Benchmark site template {i}",
+            "url_pattern": f"https://site{i}.example.com/items/{{item_id}}",
+            "selectors": {
+                "title": "h1",
+                "price": {"css": ".price", "description": "Item price"},
+                "reviews": {"css": ".review p", "multiple": True, "required": False},
+            },
+            "wait_for": "main",
+            "delay": 1.0,
+        }
+    with open(path, "w") as f:
+        yaml.dump({"sites": sites, "output_dir": "output", "default_site": "site_0"}, f, sort_keys=False)
+
+
+def timed(func, repeat: int) -> list:
+    """Run ``func`` ``repeat`` times and return durations in milliseconds."""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def report(label: str, durations: list) -> None:
+    """Print summary statistics for a set of durations."""
+    print(f"{label:<28} median {statistics.median(durations):9.2f} ms   min {min(durations):9.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sites", type=int, default=10000, help="Number of site templates")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / "config.yaml"
+        generate_config(config_path, args.sites)
+        print(f"Config with {args.sites} sites: {config_path.stat().st_size / 1024:.0f} KiB\n")
+
+        def cold_load():
+            _cache_path(config_path).unlink(missing_ok=True)
+            load_config(config_path)
+
+        report("cold load (YAML parse)", timed(cold_load, args.repeat))
+        report("cold load (no cache)", timed(lambda: load_config(config_path, use_cache=False), args.repeat))
+        load_config(config_path)
+        report("warm load (compiled cache)", timed(lambda: load_config(config_path), args.repeat))
+        report("load + one site", timed(lambda: load_config(config_path).sites[f"site_{args.sites // 2}"], args.repeat))
+        report("load + validate all sites", timed(lambda: list(load_config(config_path).sites.values()), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
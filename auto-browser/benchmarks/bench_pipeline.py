@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""Benchmark the extraction pipeline end to end, fully offline.
+
+Serves fixture pages from a local HTTP server and replaces the LLM with a
+scripted fake through ``ModelFactory.set_override``, then times each stage:
+formatters, content analysis, report generation, selector and agent
+extraction (``BrowserAutomation.process_url``), template generation and
+the whole ``run_all_tasks`` pipeline. Reports latency percentiles and peak
+Python heap per stage, and writes the results to JSON for comparison
+across versions.
+
+Browser stages need Playwright's Chromium (``playwright install chromium``);
+pass ``--skip-browser`` to run only the in-process stages.
+
+Usage:
+    python benchmarks/bench_pipeline.py --iterations 20 --json pipeline.json
+    python benchmarks/bench_pipeline.py --compare pipeline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_llm import ScriptedChatModel  # noqa: E402
+from fixture_server import ARTICLE_SELECTORS, LISTING_SELECTORS, FixtureServer  # noqa: E402
+
+ARTICLE_DATA = {
+    "title": "Offline Benchmarking of Browser Pipelines",
+    "author": "Jane Doe",
+    "published": "2024-03-01",
+    "tags": ["benchmarks", "browsers", "performance"],
+}
+
+Stage = Callable[[], Awaitable[Any]]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: List[float], peak_bytes: int) -> Dict[str, float]:
+    """Latency percentiles (ms) and peak heap (KiB) for one stage."""
+    ms = [value * 1000 for value in latencies]
+    return {
+        "iterations": len(ms),
+        "mean_ms": round(statistics.mean(ms), 3),
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p90_ms": round(percentile(ms, 90), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "min_ms": round(min(ms), 3),
+        "max_ms": round(max(ms), 3),
+        "peak_heap_kib": round(peak_bytes / 1024, 1),
+    }
+
+
+async def measure(stage: Stage, iterations: int, warmup: int) -> Dict[str, float]:
+    """Time a stage, then run it once more under tracemalloc for peak memory."""
+    for _ in range(warmup):
+        await stage()
+
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await stage()
+        latencies.append(time.perf_counter() - started)
+
+    # Tracing slows allocation-heavy code, so memory gets its own run
+    tracemalloc.start()
+    try:
+        await stage()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return summarize(latencies, peak)
+
+
+def build_stages(server: FixtureServer, rows: int, skip_browser: bool) -> Dict[str, Stage]:
+    """Create the benchmark stages."""
+    from browser_automation.cli import run_all_tasks
+    from browser_automation.formatters.jsonl import JsonlSink
+    from browser_automation.formatters.markdown import MarkdownFormatter
+    from browser_automation.processors.content import ContentProcessor
+    from browser_automation.processors.report import ReportGenerator
+
+    article_url = server.url("article")
+    listing_url = server.url(f"listing?rows={rows}")
+    result = {
+        "title": "Analysis Result",
+        "content": json.dumps(ARTICLE_DATA, indent=2),
+        "metadata": {"url": article_url, "timestamp": datetime.now().isoformat(),
+                     "description": "Benchmark", "extraction_method": "selectors"},
+    }
+    large_result = dict(result, content="\n".join(
+        f"2024-{i:06d}-01 Study {i} of treatment response in adults" for i in range(rows * 20)
+    ))
+
+    processor = ContentProcessor()
+    formatter = MarkdownFormatter()
+    analyzed = processor.analyze_page(result)
+    sink = JsonlSink(Path("output") / "bench.jsonl")
+
+    async def analyze() -> None:
+        processor.analyze_page(result)
+
+    async def format_markdown() -> None:
+        formatter.format_content(analyzed)
+
+    async def write_markdown() -> None:
+        formatter.write_markdown(analyzed, article_url).unlink()
+
+    async def write_jsonl() -> None:
+        sink.write_run(article_url, result, {"extract": 0.0})
+
+    async def report() -> None:
+        await ReportGenerator().agenerate_report(analyzed, "Summarize the article")
+
+    async def report_large() -> None:
+        await ReportGenerator().agenerate_report(processor.analyze_page(large_result), "Summarize the trials")
+
+    stages: Dict[str, Stage] = {
+        "content.analyze_page": analyze,
+        "formatter.format_content": format_markdown,
+        "formatter.write_markdown": write_markdown,
+        "formatter.jsonl_sink": write_jsonl,
+        "report.generate": report,
+        "report.generate_map_reduce": report_large,
+    }
+    if skip_browser:
+        return stages
+
+    from browser_automation.browser import BrowserAutomation
+    from browser_automation.template_generator import TemplateGenerator
+
+    site = {"name": "Benchmark Article", "description": "Extract the article",
+            "url_pattern": article_url, "selectors": ARTICLE_SELECTORS}
+    listing_site = {"name": "Benchmark Listing", "description": "Extract the trials",
+                    "url_pattern": listing_url, "selectors": LISTING_SELECTORS}
+
+    async def process_selectors() -> None:
+        await BrowserAutomation(site).process_url(article_url)
+
+    async def process_listing() -> None:
+        await BrowserAutomation(listing_site).process_url(listing_url)
+
+    # Detail pages of the listing, as one multi-tab job versus one context each
+    detail_urls = [server.url(f"article?id={i}") for i in range(8)]
+
+    async def process_tabs() -> None:
+        await BrowserAutomation(site, max_tabs=4).process_url(detail_urls)
+
+    async def process_sequential() -> None:
+        automation = BrowserAutomation(site)
+        for url in detail_urls:
+            await automation.process_url(url)
+
+    async def process_agent() -> None:
+        await BrowserAutomation({"description": "Extract the article"}).process_url(article_url)
+
+    async def create_template() -> None:
+        await TemplateGenerator().create_template(article_url, "bench", "Extract the article")
+
+    async def pipeline() -> None:
+        await run_all_tasks(article_url, "Extract the article", interactive=False, verbose=False,
+                            report=False, refresh_template=True, detect_changes=False)
+
+    async def pipeline_report() -> None:
+        await run_all_tasks(article_url, "Extract the article", interactive=False, verbose=False,
+                            report=True, site_config=site, detect_changes=False)
+
+    stages.update({
+        "browser.process_url.selectors": process_selectors,
+        "browser.process_url.listing": process_listing,
+        "browser.process_url.tabs": process_tabs,
+        "browser.process_url.sequential": process_sequential,
+        "browser.process_url.agent": process_agent,
+        "template.create_template": create_template,
+        "cli.run_all_tasks": pipeline,
+        "cli.run_all_tasks.report": pipeline_report,
+    })
+    return stages
+
+
+def git_revision() -> Optional[str]:
+    """Current git commit, if available."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: Dict[str, Any], baseline_path: Path) -> None:
+    """Print p50/p95 changes against a previous results file."""
+    baseline = json.loads(baseline_path.read_text())["stages"]
+    print(f"\nCompared with {baseline_path}:")
+    for name, stats in results["stages"].items():
+        if name not in baseline:
+            continue
+        old = baseline[name]
+        deltas = []
+        for key in ("p50_ms", "p95_ms", "peak_heap_kib"):
+            change = (stats[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+            deltas.append(f"{key} {change:+6.1f}%")
+        print(f"{name:<32} " + "   ".join(deltas))
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run all selected stages against a fresh fixture server."""
+    from browser_automation.browser_pool import close_browser_pool
+    from browser_automation.models import ModelFactory
+
+    model = ScriptedChatModel(selectors=ARTICLE_SELECTORS, extracted=ARTICLE_DATA, latency=args.llm_latency)
+    ModelFactory.set_override(lambda config: model)
+
+    results: Dict[str, Any] = {}
+    try:
+        with FixtureServer() as server:
+            stages = build_stages(server, args.rows, args.skip_browser)
+            for name, stage in stages.items():
+                if args.only and not any(pattern in name for pattern in args.only):
+                    continue
+                results[name] = await measure(stage, args.iterations, args.warmup)
+                stats = results[name]
+                print(f"{name:<32} p50 {stats['p50_ms']:9.2f} ms   p95 {stats['p95_ms']:9.2f} ms   "
+                      f"p99 {stats['p99_ms']:9.2f} ms   peak {stats['peak_heap_kib']:9.1f} KiB")
+    finally:
+        await close_browser_pool()
+        ModelFactory.set_override(None)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "rows": args.rows,
+            "llm_latency_s": args.llm_latency,
+            "llm_calls": model.calls,
+            "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+        "stages": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20, help="Timed runs per stage")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed runs per stage")
+    parser.add_argument("--rows", type=int, default=200, help="Rows on the generated listing page")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated seconds per LLM call")
+    parser.add_argument("--only", nargs="*", help="Run only stages whose name contains one of these")
+    parser.add_argument("--skip-browser", action="store_true", help="Skip stages that need Chromium")
+    parser.add_argument("--json", dest="json_path", type=Path, help="Write results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="Previous results file to compare against")
+    args = parser.parse_args()
+
+    json_path = args.json_path.resolve() if args.json_path else None
+    compare_path = args.compare.resolve() if args.compare else None
+
+    # Run in a scratch directory so outputs and caches do not touch the repo
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        os.environ.update({
+            "LLM_PROVIDER": "openai",
+            "OPENAI_API_KEY": "sk-benchmark",
+            "HTTP_CACHE_MODE": "off",
+            "BROWSER_HEADLESS": "true",
+            "ANONYMIZED_TELEMETRY": "false",
+        })
+        results = asyncio.run(run(args))
+
+    if json_path:
+        json_path.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {json_path}")
+    if compare_path:
+        compare(results, compare_path)
+
+
+if __name__ == "__main__":
+    main()
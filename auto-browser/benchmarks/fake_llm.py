@@ -0,0 +1,122 @@
+"""Scripted chat model for offline benchmarks.
+
+Plays the part of the LLM for every component that talks to one:
+
+- browser_use agents get structured output that navigates to the URL in
+  their task and then finishes with a canned result
+- template generation gets a JSON selector mapping
+- report generation and chunk summaries get a fixed markdown report
+
+An optional fixed latency simulates provider response time.
+"""
+
+import asyncio
+import json
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+_TASK_URL = re.compile(r"(?:Navigate to|already on) '([^']+)'")
+_CURRENT_URL = re.compile(r"Current url: (\S+)")
+
+REPORT = """# Benchmark Report
+
+## Executive Summary
+Scripted report produced by the offline benchmark model.
+
+## Analysis Details
+| Field | Value |
+|-------|-------|
+| source | fixture |
+
+## Key Insights
+- Pipeline timings exclude provider latency unless it is simulated.
+"""
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model returning scripted responses without any network calls."""
+
+    selectors: Dict[str, Any] = {}
+    extracted: Dict[str, Any] = {}
+    report: str = REPORT
+    latency: float = 0.0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    @staticmethod
+    def _text(messages: List[BaseMessage]) -> str:
+        return "\n".join(str(message.content) for message in messages)
+
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        """Pick the scripted text reply for a prompt."""
+        self.calls += 1
+        text = self._text(messages)
+        if "mapping descriptive field names to selectors" in text:
+            return json.dumps({
+                name: spec if isinstance(spec, dict) else {"css": spec}
+                for name, spec in self.selectors.items()
+            })
+        if "Part " in text and "too large to analyze" in text:
+            return "- Scripted summary of this part"
+        return self.report
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._reply(messages)))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._reply(messages)))])
+
+    def _agent_step(self, messages: List[BaseMessage]) -> Dict[str, Any]:
+        """Script a browser_use agent: navigate to the task URL, then finish."""
+        self.calls += 1
+        task_url = _TASK_URL.search(self._text(messages[:3]))
+        current_url = _CURRENT_URL.findall(str(messages[-1].content))
+        target = task_url.group(1) if task_url else None
+
+        if target and (not current_url or current_url[-1].rstrip("/") != target.rstrip("/")):
+            action = {"go_to_url": {"url": target}}
+            goal = f"Open {target}"
+        elif "mapping descriptive field names to selectors" in self._text(messages[:3]):
+            action = {"done": {"text": self._reply(messages[:3])}}
+            goal = "Return the selectors"
+        else:
+            action = {"done": {"text": json.dumps(self.extracted)}}
+            goal = "Return the extracted content"
+
+        return {
+            "current_state": {
+                "evaluation_previous_goal": "Success",
+                "memory": "Scripted benchmark run",
+                "next_goal": goal
+            },
+            "action": [action]
+        }
+
+    def with_structured_output(self, schema: Any, *, include_raw: bool = False, **kwargs: Any):
+        """Return scripted agent steps validated against the agent's output schema."""
+        async def respond(messages: List[BaseMessage]) -> Any:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            payload = self._agent_step(messages)
+            parsed = schema.model_validate(payload)
+            if not include_raw:
+                return parsed
+            return {"raw": AIMessage(content=json.dumps(payload)), "parsed": parsed, "parsing_error": None}
+
+        return RunnableLambda(lambda messages: asyncio.run(respond(messages)), afunc=respond)
@@ -0,0 +1,120 @@
+"""Local HTTP server for benchmark fixture pages.
+
+Serves the static pages in ``benchmarks/fixtures`` and a generated
+``/listing`` page whose size is set with ``?rows=N``, so benchmarks can
+load realistic pages without touching the network.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# Selectors matching the fixture pages
+ARTICLE_SELECTORS = {
+    "title": "h1.title",
+    "author": ".byline .author",
+    "published": "time.published",
+    "paragraphs": {"css": ".body p", "multiple": True},
+    "tags": {"css": ".tags li", "multiple": True},
+}
+LISTING_SELECTORS = {
+    "heading": "h1",
+    "trial_ids": {"css": "td.trial-id", "multiple": True},
+    "statuses": {"css": "td.status", "multiple": True},
+}
+
+
+def render_listing(rows: int) -> str:
+    """Render a clinical-trials style listing with ``rows`` table rows."""
+    body = "\n".join(
+        f"<tr><td class=\"trial-id\">2024-{i:06d}-01</td>"
+        f"<td class=\"title\">Study {i} of treatment response in adults</td>"
+        f"<td class=\"status\">{'Recruiting' if i % 3 else 'Completed'}</td>"
+        f"<td><a href=\"/article?id={i}\">Details</a></td></tr>"
+        for i in range(rows)
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>Trial Listing</title></head>
+<body>
+  <main>
+    <h1>Clinical Trials ({rows} results)</h1>
+    <table class="results">
+      <thead><tr><th>ID</th><th>Title</th><th>Status</th><th></th></tr></thead>
+      <tbody>
+{body}
+      </tbody>
+    </table>
+  </main>
+</body>
+</html>"""
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """Serve fixture pages; unknown assets get an empty 200 response."""
+
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        if parsed.path == "/listing":
+            rows = int(parse_qs(parsed.query).get("rows", ["200"])[0])
+            self._send(render_listing(rows).encode("utf-8"), "text/html; charset=utf-8")
+            return
+
+        name = parsed.path.strip("/") or "article"
+        page = FIXTURES_DIR / f"{name}.html"
+        if page.is_file():
+            self._send(page.read_bytes(), "text/html; charset=utf-8")
+        else:
+            self._send(b"", "application/octet-stream")
+
+    def _send(self, body: bytes, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class FixtureServer:
+    """Run the fixture server on a free local port in a background thread."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    def url(self, path: str) -> str:
+        """Absolute URL for a fixture path."""
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def start(self) -> "FixtureServer":
+        self._server = ThreadingHTTPServer((self.host, self.port), _FixtureHandler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
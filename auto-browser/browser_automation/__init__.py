@@ -13,15 +13,39 @@ def configure_logging(verbose: bool = False):
 # Set default logging to warnings
 configure_logging(False)
 
-# Import main components
-from .browser import BrowserAutomation
-from .template_generator import TemplateGenerator, Template, Selector
-from .processors.content import ContentProcessor, PageElement
-from .processors.interactive import InteractiveProcessor, BrowserAction
-from .formatters.markdown import MarkdownFormatter
+# Main components are imported on first access so that light entry points
+# (e.g. `auto-browser list-sites`) do not pay for browser_use and LLM SDKs
+_LAZY_IMPORTS = {
+    'BrowserAutomation': '.browser',
+    'BrowserPool': '.browser_pool',
+    'BrowserPoolConfig': '.browser_pool',
+    'get_browser_pool': '.browser_pool',
+    'TemplateGenerator': '.template_generator',
+    'Template': '.template_generator',
+    'Selector': '.template_generator',
+    'ContentProcessor': '.processors.content',
+    'PageElement': '.processors.content',
+    'InteractiveProcessor': '.processors.interactive',
+    'BrowserAction': '.processors.interactive',
+    'MarkdownFormatter': '.formatters.markdown',
+    'JsonlSink': '.formatters.jsonl',
+}
+
+def __getattr__(name):
+    """Import public components lazily."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     'BrowserAutomation',
+    'BrowserPool',
+    'BrowserPoolConfig',
+    'get_browser_pool',
     'TemplateGenerator',
     'Template',
     'Selector',
@@ -29,5 +53,6 @@ __all__ = [
     'PageElement',
     'InteractiveProcessor',
     'BrowserAction',
-    'MarkdownFormatter'
+    'MarkdownFormatter',
+    'JsonlSink'
 ]
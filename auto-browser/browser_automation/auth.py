@@ -0,0 +1,108 @@
+"""Persistent authenticated browser state for login workflows."""
+
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from playwright.async_api import BrowserContext
+from .browser_pool import ContextHook
+
+logger = logging.getLogger(__name__)
+
+# Restores localStorage for the page's origin without clobbering newer values
+RESTORE_LOCAL_STORAGE_SCRIPT = """
+(() => {
+    const origins = %s;
+    const items = origins[window.location.origin];
+    if (!items) return;
+    for (const item of items) {
+        if (window.localStorage.getItem(item.name) === null) {
+            window.localStorage.setItem(item.name, item.value);
+        }
+    }
+})();
+"""
+
+
+class AuthProfileStore:
+    """Save and restore cookies and localStorage under named profiles.
+
+    Profiles hold session credentials, so they are kept outside the output
+    directory and written with owner-only permissions.
+    """
+
+    def __init__(self, profiles_dir: Optional[Path] = None):
+        """Initialize the profile store.
+
+        Args:
+            profiles_dir: Directory holding profiles. Defaults to the
+                          AUTH_PROFILES_DIR environment variable or
+                          ~/.auto-browser/profiles.
+        """
+        default_dir = os.getenv("AUTH_PROFILES_DIR") or Path.home() / ".auto-browser" / "profiles"
+        self.profiles_dir = Path(profiles_dir or default_dir).expanduser()
+
+    def path(self, profile: str) -> Path:
+        """Get the storage-state file for a profile."""
+        if not re.fullmatch(r"[\w.-]+", profile):
+            raise ValueError(f"Invalid profile name: {profile!r}")
+        return self.profiles_dir / f"{profile}.json"
+
+    def exists(self, profile: str) -> bool:
+        """Check whether a profile has saved state."""
+        return self.path(profile).exists()
+
+    def load(self, profile: str) -> Optional[Dict[str, Any]]:
+        """Load a profile's storage state, or None if it was never saved."""
+        try:
+            return json.loads(self.path(profile).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+
+    def restore_hook(self, profile: str) -> ContextHook:
+        """Create a browser pool hook that restores a profile into a context."""
+        async def restore(context: BrowserContext) -> None:
+            await self.restore(profile, context)
+        return restore
+
+    async def restore(self, profile: str, context: BrowserContext) -> bool:
+        """Restore a saved profile into a Playwright context.
+
+        Returns:
+            True if state was restored, False if the profile does not exist
+        """
+        state = self.load(profile)
+        if state is None:
+            return False
+
+        if state.get("cookies"):
+            await context.add_cookies(state["cookies"])
+
+        origins: Dict[str, List[Dict[str, str]]] = {
+            origin["origin"]: origin.get("localStorage", [])
+            for origin in state.get("origins", [])
+            if origin.get("localStorage")
+        }
+        if origins:
+            await context.add_init_script(RESTORE_LOCAL_STORAGE_SCRIPT % json.dumps(origins))
+
+        logger.info("Restored auth profile '%s' (%d cookies)", profile, len(state.get("cookies", [])))
+        return True
+
+    async def save(self, profile: str, context: BrowserContext) -> Path:
+        """Save a context's cookies and localStorage under a profile."""
+        path = self.path(profile)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = await context.storage_state()
+
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        logger.info("Saved auth profile '%s' to %s", profile, path)
+        return path
+
+    def clear(self, profile: str) -> None:
+        """Delete a saved profile."""
+        self.path(profile).unlink(missing_ok=True)
@@ -1,105 +1,414 @@
 """Browser automation module for auto-browser."""
 
 import asyncio
+import json
+import logging
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Sequence, Tuple, Union
 from dotenv import load_dotenv
 from browser_use import Agent
-from browser_use.browser.browser import Browser, BrowserConfig
+from browser_use.agent.views import AgentHistoryList
+from langchain_core.messages import HumanMessage
+from browser_use.browser.browser import Browser
+from .browser_pool import BrowserPool, ContextHook, get_browser_pool
+from .auth import AuthProfileStore
+from .config import AuthConfig, NetworkPolicy
+from .dom_pruning import DomPruner
+from .extractor import SelectorExtractor
+from .http_cache import HarPlan, HttpCache
+from .network import ResourceBlocker, build_context_hooks
+from .tracing import span, trace_agent
 from .models import ModelConfig, ModelFactory
 from rich.console import Console
 
 console = Console()
+logger = logging.getLogger(__name__)
 
 class BrowserAutomation:
     """Handle browser automation and content extraction."""
 
-    def __init__(self, config: Dict[str, Any], output_dir: str = "output"):
+    def __init__(self, config: Dict[str, Any], output_dir: str = "output",
+                 browser_pool: Optional[BrowserPool] = None,
+                 network_policy: Optional[NetworkPolicy] = None,
+                 auth_store: Optional[AuthProfileStore] = None,
+                 http_cache: Optional[HttpCache] = None,
+                 max_tabs: Optional[int] = None):
         """Initialize browser automation.
 
         Args:
             config: Site configuration dictionary
             output_dir: Directory for output files
+            browser_pool: Optional browser pool. Defaults to the shared pool.
+            network_policy: Policy used when the site config has none
+            auth_store: Optional store for saved login sessions
+            http_cache: Optional record/replay cache for page loads
+            max_tabs: Tabs open at once when processing a list of URLs.
+                      Defaults to the BROWSER_MAX_TABS environment variable or 4.
         """
         load_dotenv()
         self.config = config
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.model_config = ModelConfig.from_env()
+        self.browser_pool = browser_pool or get_browser_pool()
+        self.network_policy = network_policy or NetworkPolicy.default()
+        self.auth_store = auth_store or AuthProfileStore()
+        self.http_cache = http_cache or HttpCache()
+        self.max_tabs = max_tabs or int(os.getenv("BROWSER_MAX_TABS", "4"))
 
-    async def process_url(self, url: str, output_name: Optional[str] = None) -> Dict[str, Any]:
+    async def process_url(self, url: Union[str, Sequence[str]], output_name: Optional[str] = None,
+                          max_tabs: Optional[int] = None) -> Dict[str, Any]:
         """Process a URL and extract content.
 
         Args:
-            url: URL to process
+            url: URL to process, or a list of URLs sharing this site template
             output_name: Optional name for output file
+            max_tabs: Maximum tabs open at once when processing a list of URLs.
+                      Defaults to the instance's max_tabs.
 
         Returns:
-            Dictionary of extracted content
+            Dictionary of extracted content. For a list of URLs, a dictionary
+            mapping each URL (in input order) to its extracted content.
         """
-        # Always use headless mode in non-GUI environment
-        browser = Browser(config=BrowserConfig(
-            headless=True  # Force headless mode
-        ))
+        if not isinstance(url, str):
+            return await self._process_urls(list(url), max_tabs or self.max_tabs)
 
-        try:
-            # Create task description
-            task = self._create_task(url)
-
-            # Create agent with configured model
-            agent = Agent(
-                task=task,
-                llm=ModelFactory.create_model(self.model_config),
-                browser=browser,
-                use_vision=True
+        hooks, blocker, har_plan, auth = self._context_hooks(url)
+
+        # Borrow an isolated context from the warm browser pool
+        async with self.browser_pool.context(hooks=hooks) as browser_context:
+            result = None
+
+            if auth:
+                with span('auth.login', profile=auth.profile):
+                    await self._ensure_logged_in(browser_context, url, auth)
+
+            # Try the deterministic selector path before involving the LLM
+            if self.config.get('selectors'):
+                with span('extract.selectors') as info:
+                    result = await self._extract_with_selectors(browser_context, url)
+                    info['complete'] = result is not None
+
+            result, extraction_method, interactive_result, dom_pruning = await self._run_agents(
+                browser_context, url, result
             )
 
-            # Run agent and get result
-            result = await agent.run()
+            if auth:
+                # Persist refreshed cookies for the next run
+                session = await browser_context.get_session()
+                await self.auth_store.save(auth.profile, session.context)
 
-            # If there are interactive actions, create a new task for them
-            if self.config.get('actions'):
-                actions_desc = "\n".join([
-                    f"- {action['action_type']}: {action.get('description', '')}"
-                    for action in self.config['actions']
-                ])
-
-                interactive_task = f"""
-                1. Navigate to '{url}'
-                2. Perform these actions in sequence:
-                {actions_desc}
-                3. Extract and return the results
-                """
-
-                # Create new agent for interactive task
-                interactive_agent = Agent(
-                    task=interactive_task,
+        return self._structure_content(url, result, extraction_method, interactive_result, blocker, har_plan,
+                                       dom_pruning)
+
+    async def _process_urls(self, urls: List[str], max_tabs: int) -> Dict[str, Dict[str, Any]]:
+        """Extract many URLs as concurrent tabs of one browser context.
+
+        Selector extraction runs in up to ``max_tabs`` tabs at once. URLs whose
+        selectors come back incomplete, and interactive actions, then run one
+        at a time through the agent, which drives a single tab.
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+
+        # One HAR archive covers the whole set of tabs
+        hooks, blocker, har_plan, auth = self._context_hooks(HttpCache.batch_key(urls))
+        extracted: Dict[str, Optional[str]] = {}
+        results: Dict[str, Dict[str, Any]] = {}
+
+        async with self.browser_pool.context(hooks=hooks) as browser_context:
+            if auth:
+                with span('auth.login', profile=auth.profile):
+                    await self._ensure_logged_in(browser_context, urls[0], auth)
+
+            session = await browser_context.get_session()
+            main_page = session.current_page
+
+            if self.config.get('selectors'):
+                tabs = asyncio.Semaphore(max(1, max_tabs))
+
+                async def extract_tab(url: str) -> None:
+                    async with tabs:
+                        page = await session.context.new_page()
+                        try:
+                            with span('extract.selectors', url=url) as info:
+                                extracted[url] = await self._extract_with_selectors(browser_context, url, page=page)
+                                info['complete'] = extracted[url] is not None
+                        finally:
+                            await page.close()
+
+                with span('extract.tabs', tabs=len(urls), max_tabs=max_tabs):
+                    await asyncio.gather(*(extract_tab(url) for url in urls))
+
+            # browser_use follows every new tab; hand the agent back the original one
+            session.current_page = main_page
+
+            for url in urls:
+                # Selectors ran in tabs that are closed now, so the agent's page is elsewhere
+                result, extraction_method, interactive_result, dom_pruning = await self._run_agents(
+                    browser_context, url, extracted.get(url), on_page=False
+                )
+                results[url] = self._structure_content(url, result, extraction_method, interactive_result,
+                                                       blocker, har_plan, dom_pruning)
+
+            if auth:
+                await self.auth_store.save(auth.profile, session.context)
+
+        return results
+
+    def _context_hooks(self, cache_key: str) -> Tuple[List[ContextHook], ResourceBlocker, Optional[HarPlan], Optional[AuthConfig]]:
+        """Build the browser context hooks for a job.
+
+        Returns:
+            Hooks, the resource blocker, the HAR plan and the login settings
+        """
+        auth = self._get_auth_config()
+        hooks, blocker, har_plan = build_context_hooks(
+            self._get_network_policy(), self.http_cache, cache_key,
+            extra_hooks=[self.auth_store.restore_hook(auth.profile)] if auth else ()
+        )
+        return hooks, blocker, har_plan, auth
+
+    async def _run_agents(self, browser_context, url: str, result: Optional[str],
+                          on_page: bool = True) -> Tuple[Any, str, Optional[Any], Optional[Dict[str, Any]]]:
+        """Fall back to the agent if selectors did not extract, then run interactive actions.
+
+        Args:
+            browser_context: Browser context the agents drive
+            url: URL being processed
+            result: Selector extraction result, or None if the agent should extract
+            on_page: Whether the context's current page already shows ``url``
+
+        Returns:
+            Extraction result, extraction method, interactive result and DOM pruning stats
+        """
+        extraction_method = 'selectors' if result is not None else 'agent'
+        interactive_result = None
+        agent = None
+
+        pruner = None
+        if result is None or self.config.get('actions'):
+            # Selectors that extracted this page show the interactive agent where
+            # the content is; otherwise only the text and interactive rules apply
+            if result is not None:
+                pruner = DomPruner.from_env(self.config['selectors'], self.config['actions'])
+            else:
+                pruner = DomPruner.from_env()
+            if pruner is not None:
+                pruner.attach(browser_context)
+
+        try:
+            if result is None:
+                # Create task description
+                task = self._create_task(url)
+
+                # Create agent with configured model
+                agent = Agent(
+                    task=task,
                     llm=ModelFactory.create_model(self.model_config),
-                    browser=browser,
+                    browser_context=browser_context,
                     use_vision=True
                 )
 
+                # Run agent and get result
+                with span('agent.extract', category='agent'):
+                    result = await trace_agent(agent, 'agent.extract').run()
+
+            # Continue with interactive actions on the page the extraction left open
+            if self.config.get('actions'):
+                if agent is None and not on_page:
+                    on_page = await self._open_page(browser_context, url)
+                interactive_task = self._create_interactive_task(url, on_page=on_page or agent is not None)
+
+                if agent is not None:
+                    # Keep the extraction agent's message history and page state
+                    self._continue_agent(agent, interactive_task)
+                    interactive_agent = agent
+                else:
+                    interactive_agent = Agent(
+                        task=f"{interactive_task}\nContent already extracted from this page:\n{result}",
+                        llm=ModelFactory.create_model(self.model_config),
+                        browser_context=browser_context,
+                        use_vision=True
+                    )
+
                 # Run interactive task
-                interactive_result = await interactive_agent.run()
-                result = f"{result}\n\nInteractive Results:\n{interactive_result}"
-
-            # Structure the content
-            structured_content = {
-                'title': 'Analysis Result',
-                'content': str(result),  # Convert result to string
-                'metadata': {
-                    'url': url,
-                    'timestamp': datetime.now().isoformat(),
-                    'description': self.config.get('description', '')
-                }
+                with span('agent.interactive', category='agent'):
+                    interactive_result = await trace_agent(interactive_agent, 'agent.interactive').run()
+        finally:
+            # The context serves more URLs; later ones must not see this page's pruning
+            if pruner is not None:
+                pruner.detach(browser_context)
+
+        return result, extraction_method, interactive_result, pruner.stats() if pruner else None
+
+    def _structure_content(self, url: str, result: Any, extraction_method: str,
+                           interactive_result: Optional[Any], blocker: ResourceBlocker,
+                           har_plan: Optional[HarPlan],
+                           dom_pruning: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Structure an extraction result with its metadata."""
+        structured_content = {
+            'title': 'Analysis Result',
+            'content': self._result_text(result),
+            'metadata': {
+                'url': url,
+                'timestamp': datetime.now().isoformat(),
+                'description': self.config.get('description', ''),
+                'extraction_method': extraction_method,
+                'network': blocker.stats.to_dict(),
+                'http_cache': har_plan.action if har_plan else 'off'
             }
+        }
+        if dom_pruning is not None:
+            structured_content['metadata']['dom_pruning'] = dom_pruning
+        if interactive_result is not None:
+            structured_content['interactive_results'] = self._result_text(interactive_result)
 
-            return structured_content
+        return structured_content
 
-        finally:
-            await browser.close()
+    @staticmethod
+    def _result_text(result: Union[str, AgentHistoryList]) -> str:
+        """Get the extracted text, preferring the agent's final answer over its full history."""
+        if isinstance(result, AgentHistoryList):
+            return result.final_result() or str(result)
+        return str(result)
+
+    def _get_network_policy(self) -> NetworkPolicy:
+        """Get the site's network policy, falling back to the default."""
+        policy = self.config.get('network') or self.network_policy
+        if isinstance(policy, dict):
+            policy = NetworkPolicy.model_validate(policy)
+        return policy
+
+    def _get_auth_config(self) -> Optional[AuthConfig]:
+        """Get the site's login settings, if any."""
+        auth = self.config.get('auth')
+        if isinstance(auth, dict):
+            auth = AuthConfig.model_validate(auth)
+        return auth
+
+    async def _ensure_logged_in(self, browser_context, url: str, auth: AuthConfig) -> None:
+        """Run the login flow only if the restored session is logged out."""
+        if not auth.logged_out_selector:
+            return
+
+        page = await browser_context.get_current_page()
+        await page.goto(auth.login_url or url, wait_until='domcontentloaded')
+        if await page.query_selector(auth.logged_out_selector) is None:
+            logger.info(f"Auth profile '{auth.profile}' is still logged in")
+            return
+
+        logger.info(f"Logging in for auth profile '{auth.profile}'")
+        login_agent = Agent(
+            task=self._create_login_task(auth),
+            llm=ModelFactory.create_model(self.model_config),
+            browser_context=browser_context,
+            use_vision=True
+        )
+        await trace_agent(login_agent, 'agent.login').run()
+
+        page = await browser_context.get_current_page()
+        if await page.query_selector(auth.logged_out_selector) is not None:
+            raise RuntimeError(f"Login failed for auth profile '{auth.profile}'")
+
+        session = await browser_context.get_session()
+        await self.auth_store.save(auth.profile, session.context)
+
+    def _create_login_task(self, auth: AuthConfig) -> str:
+        """Create the login task description for the agent."""
+        if auth.login_task:
+            # Allow $LOGIN_USERNAME style references to environment variables
+            return os.path.expandvars(auth.login_task)
+
+        return "\n".join([
+            "1. Log in on the current page",
+            f"   - Username: {os.getenv('LOGIN_USERNAME', '')}",
+            f"   - Password: {os.getenv('LOGIN_PASSWORD', '')}",
+            "2. Submit the login form and wait for the page to load",
+            "3. Verify the login succeeded"
+        ])
+
+    async def _extract_with_selectors(self, browser_context, url: str, page=None) -> Optional[str]:
+        """Extract content with the site's selectors without an LLM.
+
+        Args:
+            browser_context: Browser context whose current page is used by default
+            url: URL to extract
+            page: Optional Playwright page (tab) to use instead
+
+        Returns:
+            JSON string of extracted fields, or None if a required selector
+            came back empty and the agent should take over
+        """
+        extractor = SelectorExtractor(self.config['selectors'], wait_for=self.config.get('wait_for'))
+        try:
+            page = page or await browser_context.get_current_page()
+            extraction = await extractor.extract(page, url)
+        except Exception as e:
+            logger.info(f"Selector extraction failed, falling back to agent: {e}")
+            return None
+
+        if not extraction.complete:
+            logger.info(f"Required selectors empty ({', '.join(extraction.missing_required)}), falling back to agent")
+            return None
+
+        return json.dumps(extraction.data, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    async def _open_page(browser_context, url: str) -> bool:
+        """Load a URL in the context's current page.
+
+        Returns:
+            Whether the page is now on the URL
+        """
+        try:
+            page = await browser_context.get_current_page()
+            with span('navigate', url=url):
+                await page.goto(url)
+                await page.wait_for_load_state()
+            return True
+        except Exception as e:
+            logger.info(f"Could not open {url} for interactive actions, leaving it to the agent: {e}")
+            return False
+
+    def _create_interactive_task(self, url: str, on_page: bool = True) -> str:
+        """Create the follow-up task for interactive actions.
+
+        Args:
+            url: URL the actions apply to
+            on_page: Whether the agent's page already shows the URL
+        """
+        actions_desc = "\n".join([
+            f"- {action['action_type']}: {action.get('description', '')}"
+            for action in self.config['actions']
+        ])
+        if on_page:
+            location = f"You are already on '{url}'; do not reload or navigate away unless an action requires it."
+        else:
+            location = f"First navigate to '{url}'."
+
+        return f"""
+        {location}
+        1. Perform these actions in sequence:
+        {actions_desc}
+        2. Extract and return the results
+        """
+
+    @staticmethod
+    def _continue_agent(agent: Agent, task: str) -> None:
+        """Hand a finished agent a follow-up task, keeping its accumulated state."""
+        agent.task = task
+        agent.message_manager._add_message_with_tokens(
+            HumanMessage(content=f"Your new ultimate task is: {task}. "
+                                 "Build on what you have already done on this page. "
+                                 "If you achieved your new task, use the done action in the next step.")
+        )
+        # Start a fresh history so the previous done action does not end the run
+        agent.history = AgentHistoryList(history=[])
+        agent.consecutive_failures = 0
 
     def _create_task(self, url: str) -> str:
         """Create task description for the agent."""
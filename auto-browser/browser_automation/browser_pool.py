@@ -0,0 +1,210 @@
+"""Pooled browser management for auto-browser."""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Sequence
+from pydantic import BaseModel, Field
+from playwright.async_api import Browser as PlaywrightBrowser
+from playwright.async_api import BrowserContext as PlaywrightBrowserContext
+from browser_use.browser.browser import Browser, BrowserConfig
+from browser_use.browser.context import BrowserContext, BrowserContextConfig
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPoolConfig(BaseModel):
+    """Configuration for the browser pool.
+
+    Attributes:
+        size: Number of long-lived Chromium instances to keep
+        recycle_after: Number of jobs a browser serves before it is replaced
+        headless: Whether to launch browsers in headless mode
+    """
+    size: int = Field(default=1, ge=1)
+    recycle_after: int = Field(default=50, ge=1)
+    headless: bool = True
+
+    @classmethod
+    def from_env(cls) -> "BrowserPoolConfig":
+        """Create a BrowserPoolConfig from environment variables.
+
+        Environment variables:
+            BROWSER_POOL_SIZE: Number of browsers in the pool
+            BROWSER_RECYCLE_AFTER: Jobs per browser before recycling
+            BROWSER_HEADLESS: Whether to run headless (true/false)
+
+        Returns:
+            BrowserPoolConfig instance
+        """
+        return cls(
+            size=int(os.getenv("BROWSER_POOL_SIZE", "1")),
+            recycle_after=int(os.getenv("BROWSER_RECYCLE_AFTER", "50")),
+            headless=os.getenv("BROWSER_HEADLESS", "true").lower() != "false"
+        )
+
+
+# Called with the Playwright context before its first page is opened
+ContextHook = Callable[[PlaywrightBrowserContext], Awaitable[None]]
+
+
+class ManagedBrowserContext(BrowserContext):
+    """Browser context that runs setup hooks on the Playwright context it creates."""
+
+    def __init__(self, browser: Browser, config: BrowserContextConfig,
+                 hooks: Sequence[ContextHook] = ()):
+        super().__init__(browser=browser, config=config)
+        self.hooks = list(hooks)
+
+    async def _create_context(self, browser: PlaywrightBrowser) -> PlaywrightBrowserContext:
+        context = await super()._create_context(browser)
+        for hook in self.hooks:
+            await hook(context)
+        return context
+
+
+@dataclass
+class _PooledBrowser:
+    """A browser instance tracked by the pool."""
+    browser: Browser
+    jobs: int = 0
+    active: int = 0
+    retired: bool = False
+    # Shared launch of the Chromium process, so concurrent jobs never launch twice
+    launch: Optional["asyncio.Future[PlaywrightBrowser]"] = None
+
+
+class BrowserPool:
+    """Keep a fixed number of Chromium instances warm and hand out contexts.
+
+    Every job gets a fresh, isolated browser context on the least busy
+    browser. Browsers are retired after ``recycle_after`` jobs and closed
+    once their last context is released.
+    """
+
+    def __init__(self, config: Optional[BrowserPoolConfig] = None):
+        """Initialize the browser pool.
+
+        Args:
+            config: Optional pool configuration. If not provided,
+                    will be loaded from environment variables.
+        """
+        self.config = config or BrowserPoolConfig.from_env()
+        self._browsers: List[_PooledBrowser] = []
+        self._lock = asyncio.Lock()
+
+    async def warm(self) -> None:
+        """Launch browsers up to the pool size ahead of the first job."""
+        async with self._lock:
+            missing = self.config.size - len([b for b in self._browsers if not b.retired])
+            launched = [
+                _PooledBrowser(browser=Browser(config=BrowserConfig(headless=self.config.headless)))
+                for _ in range(max(0, missing))
+            ]
+            self._browsers.extend(launched)
+            launches = [self._launch(pooled) for pooled in launched]
+        await asyncio.gather(*launches)
+        if launched:
+            logger.info("Warmed %d pooled browser(s)", len(launched))
+
+    @staticmethod
+    def _launch(pooled: _PooledBrowser) -> "asyncio.Future[PlaywrightBrowser]":
+        """Start a pooled browser's launch once; must be called with the pool lock held."""
+        if pooled.launch is None:
+            pooled.launch = asyncio.ensure_future(pooled.browser.get_playwright_browser())
+        return pooled.launch
+
+    async def _acquire(self) -> _PooledBrowser:
+        """Reserve a slot on the least busy live browser, once that browser is running."""
+        async with self._lock:
+            live = [b for b in self._browsers if not b.retired]
+            if len(live) < self.config.size:
+                logger.info("Launching pooled browser %d/%d", len(live) + 1, self.config.size)
+                pooled = _PooledBrowser(browser=Browser(config=BrowserConfig(
+                    headless=self.config.headless
+                )))
+                self._browsers.append(pooled)
+            else:
+                pooled = min(live, key=lambda b: b.active)
+
+            pooled.jobs += 1
+            pooled.active += 1
+            if pooled.jobs >= self.config.recycle_after:
+                pooled.retired = True
+            launch = self._launch(pooled)
+
+        try:
+            # Shielded so a cancelled job does not abort a launch other jobs wait on
+            await asyncio.shield(launch)
+        except BaseException:
+            async with self._lock:
+                # Let the next job retry a launch that failed
+                if pooled.launch is launch and launch.done() and not launch.cancelled() and launch.exception():
+                    pooled.launch = None
+            await self._release(pooled)
+            raise
+        return pooled
+
+    async def _release(self, pooled: _PooledBrowser) -> None:
+        """Release a slot and close the browser if it has been retired."""
+        async with self._lock:
+            pooled.active -= 1
+            if not (pooled.retired and pooled.active == 0):
+                return
+            self._browsers.remove(pooled)
+
+        logger.info("Recycling pooled browser after %d jobs", pooled.jobs)
+        await pooled.browser.close()
+
+    @asynccontextmanager
+    async def context(self, config: Optional[BrowserContextConfig] = None,
+                      hooks: Sequence[ContextHook] = ()) -> AsyncIterator[ManagedBrowserContext]:
+        """Borrow a fresh browser context for a single job.
+
+        Args:
+            config: Optional context configuration
+            hooks: Coroutines run on the Playwright context when it is created,
+                   e.g. to install request routing
+
+        Yields:
+            Isolated browser context, closed when the block exits
+        """
+        pooled = await self._acquire()
+        browser_context = ManagedBrowserContext(
+            browser=pooled.browser,
+            config=config or pooled.browser.config.new_context_config,
+            hooks=hooks
+        )
+        try:
+            yield browser_context
+        finally:
+            await browser_context.close()
+            await self._release(pooled)
+
+    async def close(self) -> None:
+        """Close every browser in the pool."""
+        async with self._lock:
+            browsers, self._browsers = self._browsers, []
+        for pooled in browsers:
+            await pooled.browser.close()
+
+
+_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get the process-wide browser pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
+
+
+async def close_browser_pool() -> None:
+    """Close the process-wide browser pool if it was started."""
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.close()
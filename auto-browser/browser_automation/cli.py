@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 
 import asyncio
+from contextlib import nullcontext
 from pathlib import Path
 import sys
 import os
 import json
-from typing import Optional
+import time
+from datetime import datetime
+from typing import Optional, List, Tuple, Dict, Any
 import click
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
@@ -30,13 +33,19 @@ def load_environment(verbose: bool = False):
             loaded = True
     return loaded
 
-from .config import load_config, create_example_config
-from .browser import BrowserAutomation
+from .config import load_config, create_example_config, AuthConfig, NetworkPolicy, SiteRegistry
 from .template_generator import TemplateGenerator
+from .template_cache import TemplateCache
+from .http_cache import HttpCache, HttpCacheMode
+from .rate_limits import configure_rate_limits
+from .fingerprints import FingerprintStore, change_key
+from .tracing import Tracer, span
 from .processors.content import ContentProcessor
 from .processors.interactive import InteractiveProcessor
 from .processors.report import ReportGenerator
 from .formatters.markdown import MarkdownFormatter
+from .formatters.jsonl import JsonlSink
+from .models import ModelFactory
 
 console = Console()
 
@@ -50,6 +59,21 @@ def create_progress() -> Progress:
         console=console
     )
 
+# browser_use and Playwright are imported only by commands that drive a
+# browser, keeping startup fast for commands like list-sites and init
+
+async def close_browser_pool():
+    """Shut down the shared browser pool if one was started"""
+    from .browser_pool import close_browser_pool as close_pool
+    await close_pool()
+
+async def with_browser_pool(coro):
+    """Await a coroutine and shut down the shared browser pool afterwards"""
+    try:
+        return await coro
+    finally:
+        await close_browser_pool()
+
 @click.group()
 @click.option(
     '--config',
@@ -61,11 +85,14 @@ def create_progress() -> Progress:
 def cli(ctx, config):
     """Browser automation CLI tool for web interaction and data extraction"""
     ctx.ensure_object(dict)
+    ctx.obj['config_path'] = config
     try:
         ctx.obj['config'] = load_config(config)
     except Exception as e:
         console.print(f"[red]Error loading config:[/red] {e}")
         ctx.exit(1)
+    # Page loads and model calls share token buckets with other processes
+    configure_rate_limits(ctx.obj['config'].rate_limits, ctx.obj['config'].output_dir)
 
 @cli.command()
 @click.argument('url')
@@ -74,17 +101,46 @@ def cli(ctx, config):
 @click.option('--verbose', '-v', is_flag=True, help='Show detailed output')
 @click.option('--report', '-r', is_flag=True, help='Generate a structured report')
 @click.option('--site', help='Site template to use')
+@click.option('--refresh-template', is_flag=True, help='Regenerate the AI template even if a cached one exists')
+@click.option('--jsonl', 'jsonl_path', type=click.Path(path_type=Path),
+              help='Append each run as one record to this JSONL file instead of writing markdown files')
+@click.option('--force', is_flag=True, help='Write output even if the extracted content has not changed')
+@click.option('--auth-profile', help='Restore and save the login session under this profile name')
+@click.option('--http-cache', 'http_cache_mode', type=click.Choice([m.value for m in HttpCacheMode]),
+              help='Record or replay page loads (default: HTTP_CACHE_MODE or off)')
+@click.option('--profile', is_flag=True, help='Write a Chrome trace of phase, agent step and LLM call timings next to the output')
+@click.option('--llm-cache', type=click.Choice(['off', 'readwrite', 'readonly']),
+              help='Cache LLM responses in SQLite (default: LLM_CACHE_MODE or off)')
 @click.option('--provider', type=click.Choice(['openai', 'google'], case_sensitive=False), help='Override LLM provider')
 @click.option('--model', help='Override LLM model name')
+@click.option('--no-daemon', is_flag=True, help='Run in this process even if a serve daemon is running')
 @click.pass_context
-def easy(ctx, url: str, prompt: str, interactive: bool, verbose: bool, report: bool, site: str, provider: str = None, model: str = None):
+def easy(ctx, url: str, prompt: str, interactive: bool, verbose: bool, report: bool, site: str,
+         refresh_template: bool = False, jsonl_path: Optional[Path] = None, force: bool = False,
+         auth_profile: str = None, http_cache_mode: str = None, profile: bool = False,
+         llm_cache: str = None, provider: str = None, model: str = None, no_daemon: bool = False):
     """Easy mode: Describe what you want to do with the webpage"""
     try:
+        # Options that change this process's models or outputs always run locally
+        local_only = interactive or profile or jsonl_path or provider or model or llm_cache
+        if not no_daemon and not local_only:
+            from .daemon import DaemonClient
+            client = DaemonClient()
+            # A daemon started with another config, directory or environment would run the job differently
+            if client.serves(ctx.obj['config_path']):
+                run_in_daemon(client, config_path=ctx.obj['config_path'], url=url, prompt=prompt,
+                              site=site, report=report,
+                              refresh_template=refresh_template, force=force,
+                              auth_profile=auth_profile, http_cache=http_cache_mode, verbose=verbose)
+                return
+
         # Override environment variables if CLI options provided
         if provider:
             os.environ['LLM_PROVIDER'] = provider.lower()
         if model:
             os.environ['LLM_MODEL'] = model
+        if llm_cache:
+            os.environ['LLM_CACHE_MODE'] = llm_cache
 
         # Configure logging
         from . import configure_logging
@@ -101,10 +157,12 @@ def easy(ctx, url: str, prompt: str, interactive: bool, verbose: bool, report: b
             site_config = config.sites[site]
 
         # Run task
+        jsonl_sink = JsonlSink(jsonl_path) if jsonl_path else None
+        tracer = Tracer() if profile else None
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         try:
-            with create_progress() as progress:
+            with create_progress() as progress, (tracer.activate() if tracer else nullcontext()):
                 task = progress.add_task("Processing...", total=1)
                 output_path = loop.run_until_complete(
                     run_all_tasks(
@@ -114,35 +172,304 @@ def easy(ctx, url: str, prompt: str, interactive: bool, verbose: bool, report: b
                         verbose=verbose,
                         report=report,
                         site_config=site_config,
+                        refresh_template=refresh_template,
+                        network_policy=config.network,
+                        detect_changes=not force,
+                        auth_profile=auth_profile,
+                        http_cache=HttpCache.from_env(config.output_dir, mode=http_cache_mode),
+                        jsonl_sink=jsonl_sink,
+                        sites=config.sites,
                         progress=progress,
                         task_id=task
                     )
                 )
         finally:
+            loop.run_until_complete(close_browser_pool())
             loop.close()
+            if jsonl_sink:
+                jsonl_sink.close()
 
         console.print(f"[green]Success![/green] Output saved to: {output_path}")
 
+        if tracer:
+            trace_path = tracer.save(Path(output_path).with_suffix('.trace.json'))
+            console.print("\n[yellow]⏱️  Time per span:[/yellow]")
+            for name, stats in sorted(tracer.summary().items(), key=lambda item: -item[1]['seconds']):
+                console.print(f"  {name:<24} {stats['seconds']:8.3f}s  ({stats['count']}x)")
+            console.print(f"Trace saved to: {trace_path} (open in chrome://tracing or ui.perfetto.dev)")
+
     except Exception as e:
         console.print(f"[red]Error:[/red] {e}")
         if verbose:
             console.print_exception()
         ctx.exit(1)
 
+def run_in_daemon(client, verbose: bool = False, **job: Any) -> None:
+    """Forward an easy-mode job to the serve daemon and print its progress"""
+    if verbose:
+        console.print(f"[blue]Forwarding to daemon at:[/blue] {client.socket_path}")
+    for event in client.run(**job):
+        kind = event.get('event')
+        if kind == 'accepted' and event.get('queued'):
+            console.print("[yellow]Waiting for a free daemon worker...[/yellow]")
+        elif kind == 'result':
+            console.print(f"[green]Success![/green] Output saved to: {event['output']}")
+            if verbose:
+                console.print(f"[blue]Daemon job took:[/blue] {event['duration']:.2f}s")
+            return
+        elif kind == 'error':
+            raise RuntimeError(event.get('error') or 'Daemon job failed')
+    raise RuntimeError("Daemon closed the connection before the job finished")
+
+@cli.command()
+@click.option('--socket', 'socket_path', type=click.Path(path_type=Path),
+              help='Unix socket to listen on (default: AUTO_BROWSER_SOCKET or ~/.auto-browser/daemon.sock)')
+@click.option('--concurrency', '-c', type=click.IntRange(min=1), default=4, show_default=True,
+              help='Maximum jobs run at once')
+@click.option('--verbose', '-v', is_flag=True, help='Show detailed output')
+@click.pass_context
+def serve(ctx, socket_path: Optional[Path], concurrency: int, verbose: bool):
+    """Keep browsers and models warm and run easy-mode jobs sent by other CLI calls"""
+    from . import configure_logging
+    from .daemon import DaemonServer
+
+    configure_logging(verbose)
+    server = DaemonServer(socket_path=socket_path, config_path=str(ctx.obj['config_path']),
+                          concurrency=concurrency)
+    console.print(f"[green]Serving on:[/green] {server.socket_path} (Ctrl+C to stop)")
+    try:
+        asyncio.run(server.serve_forever())
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {e}")
+        if verbose:
+            console.print_exception()
+        ctx.exit(1)
+    console.print(f"Daemon stopped after {server.jobs_served} job(s)")
+
+@cli.command()
+@click.argument('input_file', type=click.Path(exists=True, path_type=Path))
+@click.option('--prompt', '-p', default='Extract the main content from the page', help='Prompt for URLs listed without one')
+@click.option('--site', help='Site template to apply to every URL')
+@click.option('--concurrency', '-c', type=click.IntRange(min=1), default=4, show_default=True, help='Maximum URLs processed at once')
+@click.option('--max-concurrency', type=click.IntRange(min=1),
+              help='Let concurrency adapt up to this many URLs based on latency, errors and memory')
+@click.option('--report', '-r', is_flag=True, help='Generate a structured report for each URL')
+@click.option('--continue-on-error', is_flag=True, help='Keep processing remaining URLs after a failure')
+@click.option('--summary', 'summary_path', type=click.Path(path_type=Path), help='Path for the JSON run summary')
+@click.option('--refresh-template', is_flag=True, help='Regenerate AI templates even if cached ones exist')
+@click.option('--jsonl', 'jsonl_path', type=click.Path(path_type=Path),
+              help='Append each run as one record to this JSONL file instead of writing markdown files')
+@click.option('--force', is_flag=True, help='Write output even if the extracted content has not changed')
+@click.option('--auth-profile', help='Restore and save the login session under this profile name')
+@click.option('--http-cache', 'http_cache_mode', type=click.Choice([m.value for m in HttpCacheMode]),
+              help='Record or replay page loads (default: HTTP_CACHE_MODE or off)')
+@click.option('--verbose', '-v', is_flag=True, help='Show detailed output')
+@click.option('--llm-cache', type=click.Choice(['off', 'readwrite', 'readonly']),
+              help='Cache LLM responses in SQLite (default: LLM_CACHE_MODE or off)')
+@click.option('--provider', type=click.Choice(['openai', 'google'], case_sensitive=False), help='Override LLM provider')
+@click.option('--model', help='Override LLM model name')
+@click.option('--run-id', help='Name for this run in the job queue (default: batch_<timestamp>)')
+@click.pass_context
+def batch(ctx, input_file: Path, prompt: str, site: str, concurrency: int, max_concurrency: Optional[int], report: bool,
+          continue_on_error: bool, summary_path: Optional[Path], refresh_template: bool,
+          jsonl_path: Optional[Path], force: bool,
+          auth_profile: Optional[str], http_cache_mode: Optional[str], verbose: bool,
+          llm_cache: Optional[str] = None, provider: str = None, model: str = None,
+          run_id: Optional[str] = None):
+    """Process many URLs concurrently in a single run.
+
+    INPUT_FILE lists one URL per line, optionally followed by whitespace and
+    a prompt for that URL. Blank lines and lines starting with '#' are ignored.
+
+    Jobs are tracked in a durable queue; an interrupted run can be continued
+    with the resume command.
+    """
+    try:
+        config = ctx.obj['config']
+        if site and site not in config.sites:
+            console.print(f"[red]Error:[/red] Site template '{site}' not found")
+            ctx.exit(1)
+
+        jobs = load_batch_jobs(input_file, prompt)
+        if not jobs:
+            console.print(f"[yellow]No URLs found in {input_file}[/yellow]")
+            return
+
+        from .job_queue import JobQueue
+        queue = JobQueue.from_env(config.output_dir)
+        run_id = run_id or f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        options = {
+            'site': site, 'report': report, 'continue_on_error': continue_on_error,
+            'refresh_template': refresh_template, 'force': force,
+            'jsonl': str(jsonl_path) if jsonl_path else None, 'auth_profile': auth_profile,
+            'http_cache': http_cache_mode, 'llm_cache': llm_cache, 'provider': provider, 'model': model
+        }
+        added = queue.create_run(run_id, jobs, options)
+        if added < len(jobs):
+            # Reusing a run ID keeps the original options and finished jobs
+            options = queue.get_options(run_id)
+            queue.reclaim(run_id, expired_only=False)
+        console.print(f"[blue]Run ID:[/blue] {run_id} (continue with: auto-browser resume {run_id})")
+
+        execute_batch_run(ctx, queue, run_id, options, concurrency, summary_path, verbose, max_concurrency)
+
+    except click.exceptions.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {e}")
+        if verbose:
+            console.print_exception()
+        ctx.exit(1)
+
+@cli.command()
+@click.argument('run_id', required=False)
+@click.option('--concurrency', '-c', type=click.IntRange(min=1), default=4, show_default=True, help='Maximum URLs processed at once')
+@click.option('--max-concurrency', type=click.IntRange(min=1),
+              help='Let concurrency adapt up to this many URLs based on latency, errors and memory')
+@click.option('--retry-failed', is_flag=True, help='Also retry jobs that used up their attempts')
+@click.option('--summary', 'summary_path', type=click.Path(path_type=Path), help='Path for the JSON run summary')
+@click.option('--verbose', '-v', is_flag=True, help='Show detailed output')
+@click.pass_context
+def resume(ctx, run_id: Optional[str], concurrency: int, max_concurrency: Optional[int], retry_failed: bool,
+           summary_path: Optional[Path], verbose: bool):
+    """Continue an interrupted batch run.
+
+    RUN_ID defaults to the most recent run with unfinished jobs. Finished
+    jobs are not run again.
+    """
+    try:
+        from .job_queue import JobQueue
+        queue = JobQueue.from_env(ctx.obj['config'].output_dir)
+        run_id = run_id or queue.latest_unfinished_run()
+        if run_id is None:
+            console.print("[yellow]No unfinished batch runs found[/yellow]")
+            return
+
+        options = queue.get_options(run_id)
+        if options is None:
+            console.print(f"[red]Error:[/red] Batch run '{run_id}' not found")
+            ctx.exit(1)
+
+        # The workers of any job still marked running are gone
+        queue.reclaim(run_id, expired_only=False)
+        if retry_failed:
+            queue.retry_failed(run_id)
+        counts = queue.counts(run_id)
+        console.print(f"[blue]Resuming {run_id}:[/blue] {counts['done']} done, "
+                      f"{counts['pending']} pending, {counts['failed']} failed")
+
+        execute_batch_run(ctx, queue, run_id, options, concurrency, summary_path, verbose, max_concurrency)
+
+    except click.exceptions.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {e}")
+        if verbose:
+            console.print_exception()
+        ctx.exit(1)
+
+def execute_batch_run(ctx, queue, run_id: str, options: Dict[str, Any], concurrency: int,
+                      summary_path: Optional[Path], verbose: bool,
+                      max_concurrency: Optional[int] = None) -> None:
+    """Work through a queued batch run and write its summary"""
+    if options.get('provider'):
+        os.environ['LLM_PROVIDER'] = options['provider'].lower()
+    if options.get('model'):
+        os.environ['LLM_MODEL'] = options['model']
+    if options.get('llm_cache'):
+        os.environ['LLM_CACHE_MODE'] = options['llm_cache']
+
+    from . import configure_logging
+    configure_logging(verbose)
+
+    config = ctx.obj['config']
+    site_config = None
+    if options.get('site'):
+        if options['site'] not in config.sites:
+            console.print(f"[red]Error:[/red] Site template '{options['site']}' not found")
+            ctx.exit(1)
+        site_config = config.sites[options['site']]
+
+    counts = queue.counts(run_id)
+    total = sum(counts.values())
+    jsonl_sink = JsonlSink(Path(options['jsonl'])) if options.get('jsonl') else None
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        with create_progress() as progress:
+            task = progress.add_task(f"Processing {total} URLs...", total=total,
+                                     completed=counts['done'] + counts['failed'])
+            concurrency_stats = loop.run_until_complete(
+                run_batch(
+                    queue=queue,
+                    run_id=run_id,
+                    concurrency=concurrency,
+                    max_concurrency=max_concurrency,
+                    verbose=verbose,
+                    report=options.get('report', False),
+                    site_config=site_config,
+                    continue_on_error=options.get('continue_on_error', False),
+                    refresh_template=options.get('refresh_template', False),
+                    network_policy=config.network,
+                    detect_changes=not options.get('force'),
+                    auth_profile=options.get('auth_profile'),
+                    http_cache=HttpCache.from_env(config.output_dir, mode=options.get('http_cache')),
+                    jsonl_sink=jsonl_sink,
+                    sites=config.sites,
+                    progress=progress,
+                    task_id=task
+                )
+            )
+    finally:
+        loop.run_until_complete(close_browser_pool())
+        loop.close()
+        if jsonl_sink:
+            jsonl_sink.close()
+
+    results = queue.results(run_id)
+    summary_path = summary_path or Path(config.output_dir) / f"batch_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    summary_path.write_text(json.dumps(results, indent=2), encoding='utf-8')
+
+    for result in results:
+        if result['status'] == 'success':
+            console.print(f"[green]✓[/green] {result['url']} -> {result['output']}")
+        elif result['status'] == 'failed':
+            console.print(f"[red]✗[/red] {result['url']}: {result['error']}")
+        else:
+            console.print(f"[yellow]-[/yellow] {result['url']}: skipped")
+
+    if concurrency_stats['changes']:
+        console.print(f"\n[yellow]Concurrency adjusted {len(concurrency_stats['changes'])} time(s), "
+                      f"ending at {concurrency_stats['limit']}:[/yellow]")
+        for change in concurrency_stats['changes']:
+            console.print(f"  {change['old']} -> {change['new']}: {change['reason']}")
+
+    failed = sum(1 for r in results if r['status'] != 'success')
+    console.print(f"\n[bold]{len(results) - failed}/{len(results)} URLs succeeded.[/bold] Summary saved to: {summary_path}")
+    if failed:
+        console.print(f"Continue with: auto-browser resume {run_id}"
+                      + (" --retry-failed" if any(r['status'] == 'failed' for r in results) else ""))
+        ctx.exit(1)
+
 @cli.command()
 @click.argument('url')
 @click.option('--name', prompt=True, help='Name for the template')
 @click.option('--description', prompt=True, help='Description of what this template extracts')
 @click.option('--config-path', type=str, default='config.yaml', help='Path to save the template')
+@click.option('--http-cache', 'http_cache_mode', type=click.Choice([m.value for m in HttpCacheMode]),
+              help='Record or replay page loads (default: HTTP_CACHE_MODE or off)')
 @click.pass_context
-def create_template(ctx, url: str, name: str, description: str, config_path: Path):
+def create_template(ctx, url: str, name: str, description: str, config_path: Path, http_cache_mode: str = None):
     """Create a new template by analyzing a webpage with AI assistance"""
     try:
-        generator = TemplateGenerator()
+        generator = TemplateGenerator(
+            http_cache=HttpCache.from_env(ctx.obj['config'].output_dir, mode=http_cache_mode)
+        )
 
         with create_progress() as progress:
             task = progress.add_task(f"Analyzing {url}...", total=1)
-            template = asyncio.run(generator.create_template(url, name, description))
+            template = asyncio.run(with_browser_pool(generator.create_template(url, name, description)))
             progress.update(task, advance=1)
 
         # Preview the template
@@ -203,9 +530,19 @@ def list_sites(ctx):
         console.print("")
 
 async def run_all_tasks(url: str, prompt: str, interactive: bool, verbose: bool, report: bool,
-                       site_config: Optional[dict] = None, progress: Optional[Progress] = None,
-                       task_id: Optional[int] = None):
-    """Run all async tasks in sequence."""
+                       site_config: Optional[dict] = None, refresh_template: bool = False,
+                       network_policy: Optional[NetworkPolicy] = None, detect_changes: bool = True,
+                       auth_profile: Optional[str] = None, http_cache: Optional[HttpCache] = None,
+                       jsonl_sink: Optional[JsonlSink] = None, sites: Optional[SiteRegistry] = None,
+                       progress: Optional[Progress] = None, task_id: Optional[int] = None):
+    """Run all async tasks in sequence.
+
+    Without an explicit site_config, the URL is matched against the
+    url_pattern of every template in `sites`; AI template generation only
+    runs when none matches.
+    """
+    started = time.perf_counter()
+    timings = {}
     # Initialize processors
     content_processor = ContentProcessor()
     interactive_processor = InteractiveProcessor()
@@ -214,6 +551,15 @@ async def run_all_tasks(url: str, prompt: str, interactive: bool, verbose: bool,
     if verbose:
         console.print("\n[blue]🔧 Initializing processors and configuration...[/blue]")
 
+    # A configured template for this URL makes template generation unnecessary
+    url_match = None
+    if not site_config and sites is not None:
+        url_match = sites.match(url)
+        if url_match:
+            site_config = sites[url_match.name]
+            params = ", ".join(f"{key}={value}" for key, value in url_match.params.items())
+            console.print(f"[blue]Using site template:[/blue] {url_match.name}" + (f" ({params})" if params else ""))
+
     # Create temporary config
     config = {
         'sites': {
@@ -235,30 +581,47 @@ async def run_all_tasks(url: str, prompt: str, interactive: bool, verbose: bool,
     if site_config:
         config['sites']['temp'].update(site_config)
 
+    # Persist the login session under the requested profile
+    if auth_profile:
+        site_auth = config['sites']['temp'].get('auth')
+        config['sites']['temp']['auth'] = (
+            site_auth.model_copy(update={'profile': auth_profile}) if site_auth
+            else AuthConfig(profile=auth_profile)
+        )
+
     if verbose:
         console.print("\n[blue]🔍 Analyzing webpage structure...[/blue]")
     else:
         console.print("[blue]Analyzing webpage...[/blue]")
 
     # Generate template if not using existing one
-    if not site_config:
-        generator = TemplateGenerator()
-        template = await generator.create_template(url, 'temp', prompt)
+    with span('template', timings=timings):
+        if not site_config:
+            template_cache = TemplateCache.from_env(config['output_dir'])
+            template = None if refresh_template else template_cache.get(url, prompt)
+
+            if template is None:
+                generator = TemplateGenerator(network_policy=network_policy, http_cache=http_cache)
+                template = await generator.create_template(url, 'temp', prompt)
+                if template.selectors:
+                    template_cache.put(url, prompt, template)
+            elif verbose:
+                console.print("\n[blue]♻️  Reusing cached template[/blue]")
 
-        if verbose:
-            console.print("\n[yellow]📋 Template generated:[/yellow]")
-            console.print(json.dumps({
-                'name': template.name,
-                'description': template.description,
-                'url_pattern': template.url_pattern,
-                'selectors': {name: sel.css for name, sel in template.selectors.items()}
-            }, indent=2))
-
-        # Update config with template
-        config['sites']['temp'].update({
-            'selectors': {name: sel.css for name, sel in template.selectors.items()},
-            'actions': interactive_processor.analyze_prompt(prompt) if interactive else []
-        })
+            if verbose:
+                console.print("\n[yellow]📋 Template generated:[/yellow]")
+                console.print(json.dumps({
+                    'name': template.name,
+                    'description': template.description,
+                    'url_pattern': template.url_pattern,
+                    'selectors': {name: sel.css for name, sel in template.selectors.items()}
+                }, indent=2))
+
+            # Update config with template
+            config['sites']['temp'].update({
+                'selectors': {name: sel.css for name, sel in template.selectors.items()},
+                'actions': interactive_processor.analyze_prompt(prompt) if interactive else []
+            })
 
     if verbose:
         console.print("\n[blue]🌐 Processing webpage...[/blue]")
@@ -268,8 +631,13 @@ async def run_all_tasks(url: str, prompt: str, interactive: bool, verbose: bool,
                 console.print(f"  - {action['action_type']}: {action.get('description', '')}")
 
     # Process webpage
-    automation = BrowserAutomation(config['sites']['temp'], config['output_dir'])
-    result = await automation.process_url(url)
+    with span('extract', timings=timings, url=url):
+        from .browser import BrowserAutomation
+        automation = BrowserAutomation(config['sites']['temp'], config['output_dir'],
+                                       network_policy=network_policy, http_cache=http_cache)
+        result = await automation.process_url(url)
+    if url_match:
+        result['metadata']['url_params'] = url_match.params
 
     if progress and task_id is not None:
         progress.update(task_id, advance=0.5)
@@ -278,23 +646,61 @@ async def run_all_tasks(url: str, prompt: str, interactive: bool, verbose: bool,
         console.print("\n[yellow]📄 Raw extraction result:[/yellow]")
         console.print(json.dumps(result, indent=2))
 
+    # Skip analysis, the report and a new output file when nothing changed
+    change = None
+    if not interactive:
+        fingerprints = FingerprintStore(Path(config['output_dir']) / '.cache' / 'fingerprints')
+        site_key = config['sites']['temp']['name'] if site_config else 'prompt'
+        output_kind = 'report' if report else 'jsonl' if jsonl_sink else 'markdown'
+        fingerprint_key = change_key(site_key, prompt, output_kind, interactive,
+                                     config['sites']['temp'].get('actions'))
+        change = fingerprints.check(fingerprint_key, url, result['content'])
+        if detect_changes and not change.changed:
+            console.print(f"[green]No changes since last run:[/green] {change.previous_output}")
+            if progress and task_id is not None:
+                progress.update(task_id, advance=0.5)
+            return Path(change.previous_output)
+
     if verbose:
         console.print("\n[blue]📝 Formatting output...[/blue]")
 
     # Process the content
-    analyzed = content_processor.analyze_page(result)
-
-    if report:
-        if verbose:
-            console.print("\n[blue]📊 Generating structured report...[/blue]")
-        # Generate structured report
-        report_generator = ReportGenerator()
-        markdown = report_generator.generate_report(analyzed, prompt)
-    else:
-        # Use standard formatting
-        markdown = formatter.format_content(analyzed)
+    with span('analyze', timings=timings):
+        analyzed = content_processor.analyze_page(result)
 
-    output_path = formatter.save_markdown(markdown, url)
+    report_text = None
+    with span('report' if report else 'save', timings=timings):
+        if report:
+            if verbose:
+                console.print("\n[blue]📊 Generating structured report...[/blue]")
+            report_generator = ReportGenerator()
+            if jsonl_sink:
+                report_text = await report_generator.agenerate_report(analyzed, prompt)
+            else:
+                # Stream the structured report straight into the output file
+                output_path = formatter.create_output_path(url)
+                await report_generator.agenerate_report(analyzed, prompt, output_path)
+        elif not jsonl_sink:
+            # Write markdown sections as they are formatted
+            output_path = formatter.write_markdown(analyzed, url)
+
+    if jsonl_sink:
+        timings['total'] = time.perf_counter() - started
+        output_path = jsonl_sink.write_run(
+            url, result, timings, report=report_text, prompt=prompt,
+            diff=change.diff if change is not None else None
+        )
+    elif change is not None and change.diff:
+        diff_path = output_path.with_suffix('.diff.json')
+        diff_path.write_text(json.dumps({
+            'url': url,
+            'previous_output': change.previous_output,
+            'diff': change.diff
+        }, indent=2, ensure_ascii=False), encoding='utf-8')
+        console.print(f"[yellow]Content changed since last run,[/yellow] diff saved to: {diff_path}")
+
+    if change is not None:
+        fingerprints.record(fingerprint_key, url, change, output_path)
 
     if progress and task_id is not None:
         progress.update(task_id, advance=0.5)
@@ -302,9 +708,108 @@ async def run_all_tasks(url: str, prompt: str, interactive: bool, verbose: bool,
     if verbose:
         console.print("\n[yellow]📊 Content analysis:[/yellow]")
         console.print(json.dumps(analyzed, indent=2))
+        console.print("\n[yellow]🔌 LLM client reuse and response cache:[/yellow]")
+        console.print(json.dumps(ModelFactory.stats(), indent=2))
 
     return output_path
 
+def load_batch_jobs(input_file: Path, default_prompt: str) -> List[Tuple[str, str]]:
+    """Read (url, prompt) pairs from a batch input file."""
+    jobs = []
+    for line in input_file.read_text(encoding='utf-8').splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        parts = line.split(None, 1)
+        jobs.append((parts[0], parts[1].strip() if len(parts) > 1 else default_prompt))
+    return jobs
+
+async def run_batch(queue, run_id: str, concurrency: int, verbose: bool, report: bool,
+                    site_config: Optional[dict] = None, continue_on_error: bool = False,
+                    refresh_template: bool = False, network_policy: Optional[NetworkPolicy] = None,
+                    detect_changes: bool = True, auth_profile: Optional[str] = None,
+                    http_cache: Optional[HttpCache] = None, jsonl_sink: Optional[JsonlSink] = None,
+                    progress: Optional[Progress] = None, task_id: Optional[int] = None,
+                    max_concurrency: Optional[int] = None,
+                    sites: Optional[SiteRegistry] = None) -> Dict[str, Any]:
+    """Work through the queued jobs of a run with at most `concurrency` in flight.
+
+    When `max_concurrency` is above `concurrency`, the limit adapts between
+    them: it grows while latency and error rates stay healthy and backs off
+    on 429s, timeouts or memory pressure.
+
+    Failed jobs go back to the queue with a backoff delay until they run out
+    of attempts. Unless `continue_on_error` is set, the first job to run out
+    stops workers from taking new jobs; the rest stay pending for resume.
+
+    Returns:
+        Concurrency controller stats, including every limit change
+    """
+    from .concurrency import AdaptiveConcurrency
+    from .job_queue import JobState
+    from .models.callbacks import track_llm_health
+
+    stop = asyncio.Event()
+
+    async def keep_lease(job_id: int, name: str):
+        while True:
+            await asyncio.sleep(queue.lease_seconds / 3)
+            if not queue.heartbeat(job_id, name):
+                return
+
+    async def worker(name: str):
+        while not stop.is_set():
+            async with controller.slot():
+                if stop.is_set():
+                    return
+                job = queue.claim(run_id, name)
+                if job is not None:
+                    started = time.perf_counter()
+                    lease = asyncio.create_task(keep_lease(job['id'], name))
+                    error = None
+                    try:
+                        output_path = await run_all_tasks(
+                            url=job['url'],
+                            prompt=job['prompt'],
+                            interactive=False,
+                            verbose=verbose,
+                            report=report,
+                            site_config=site_config,
+                            refresh_template=refresh_template,
+                            network_policy=network_policy,
+                            detect_changes=detect_changes,
+                            auth_profile=auth_profile,
+                            http_cache=http_cache,
+                            jsonl_sink=jsonl_sink,
+                            sites=sites
+                        )
+                        # A reclaimed job is counted by the worker that now holds it
+                        finished = queue.complete(job['id'], name, str(output_path), time.perf_counter() - started)
+                    except Exception as e:
+                        error = e
+                        state = queue.fail(job['id'], name, str(e), time.perf_counter() - started)
+                        finished = state == JobState.FAILED
+                        if finished and not continue_on_error:
+                            stop.set()
+                    finally:
+                        lease.cancel()
+
+                    await controller.record(time.perf_counter() - started, error)
+                    if finished and progress and task_id is not None:
+                        progress.update(task_id, advance=1)
+                    continue
+
+            due = queue.next_due(run_id)
+            if due is None:
+                return
+            # Wait for the earliest retry, checking back in case another worker stops the run
+            await asyncio.sleep(min(max(due - time.time(), 0.05), 1.0))
+
+    with track_llm_health() as llm_health:
+        controller = AdaptiveConcurrency.from_env(concurrency, max_concurrency, llm_health=llm_health)
+        await asyncio.gather(*(worker(f"{os.getpid()}-{i}") for i in range(controller.maximum)))
+    return controller.stats()
+
 def main():
     """CLI entry point"""
     try:
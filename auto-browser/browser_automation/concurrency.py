@@ -0,0 +1,238 @@
+"""Adaptive concurrency for batch extraction."""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_HTTP_429 = re.compile(r"\b429\b")
+
+
+def available_memory_fraction() -> Optional[float]:
+    """Get the fraction of physical memory still available, or None if unknown."""
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as f:
+            info = {line.split(":")[0]: int(line.split()[1]) for line in f if line.strip()}
+        return info["MemAvailable"] / info["MemTotal"]
+    except (OSError, KeyError, ValueError, IndexError, ZeroDivisionError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") / os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError, ZeroDivisionError):
+        return None
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Check whether an error is a provider or site rate limit (HTTP 429).
+
+    Status attributes and exception class names are checked first. Message
+    text only counts when it names the limit, since a bare "429" also shows
+    up in URLs, IDs and byte counts.
+    """
+    response = getattr(error, "response", None)
+    statuses = (getattr(error, "status_code", None), getattr(error, "status", None),
+                getattr(error, "code", None), getattr(response, "status_code", None))
+    if 429 in statuses:
+        return True
+    name = type(error).__name__
+    if "RateLimit" in name or "ResourceExhausted" in name or "TooManyRequests" in name:
+        return True
+    text = str(error).lower()
+    return bool(_HTTP_429.search(text) and "too many requests" in text) or "rate limit" in text
+
+
+def is_timeout_error(error: BaseException) -> bool:
+    """Check whether an error is a timeout."""
+    return isinstance(error, (asyncio.TimeoutError, TimeoutError)) or "Timeout" in type(error).__name__
+
+
+@dataclass
+class ConcurrencyChange:
+    """One adjustment made by the controller."""
+    at: float
+    old: int
+    new: int
+    reason: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return asdict(self)
+
+
+class AdaptiveConcurrency:
+    """AIMD controller for the number of jobs in flight.
+
+    After each window of completed jobs the controller adds one slot if
+    the window was healthy and fully used, and halves the limit on 429s,
+    timeouts, a high error rate, memory pressure, or p95 latency well above
+    the best window seen so far.
+    """
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: Optional[int] = None,
+                 latency_tolerance: float = 1.5, error_threshold: float = 0.2,
+                 min_free_memory: float = 0.1, decrease_factor: float = 0.5,
+                 llm_health: Optional[Any] = None):
+        """Initialize the controller.
+
+        Args:
+            initial: Starting limit
+            minimum: Lowest limit the controller backs off to
+            maximum: Highest limit it grows to. Defaults to ``initial``.
+            latency_tolerance: Back off once window p95 exceeds the best p95 by this factor
+            error_threshold: Back off once this fraction of jobs or LLM calls fail
+            min_free_memory: Back off once less than this fraction of RAM is available
+            decrease_factor: Multiplier applied to the limit when backing off
+            llm_health: Optional LLMHealthCallback whose counters add LLM errors
+                        and 429s seen inside jobs that still succeeded
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum or initial)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.latency_tolerance = latency_tolerance
+        self.error_threshold = error_threshold
+        self.min_free_memory = min_free_memory
+        self.decrease_factor = decrease_factor
+        self.llm_health = llm_health
+        self.changes: List[ConcurrencyChange] = []
+        self.best_p95: Optional[float] = None
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._condition = asyncio.Condition()
+        self._reset_window()
+
+    @classmethod
+    def from_env(cls, initial: int, maximum: Optional[int] = None,
+                 llm_health: Optional[Any] = None) -> "AdaptiveConcurrency":
+        """Create an AdaptiveConcurrency from environment variables.
+
+        Environment variables:
+            BATCH_MIN_CONCURRENCY: Lowest limit to back off to
+            BATCH_LATENCY_TOLERANCE: Allowed p95 growth over the best window
+            BATCH_ERROR_THRESHOLD: Failure fraction that triggers a backoff
+            BATCH_MIN_FREE_MEMORY: Available RAM fraction that triggers a backoff
+
+        Args:
+            initial: Starting limit
+            maximum: Highest limit. Without one the limit stays fixed at ``initial``.
+            llm_health: Optional LLM call counters
+
+        Returns:
+            AdaptiveConcurrency instance
+        """
+        return cls(
+            initial=initial,
+            maximum=maximum,
+            minimum=int(os.getenv("BATCH_MIN_CONCURRENCY", "1")) if maximum else initial,
+            latency_tolerance=float(os.getenv("BATCH_LATENCY_TOLERANCE", "1.5")),
+            error_threshold=float(os.getenv("BATCH_ERROR_THRESHOLD", "0.2")),
+            min_free_memory=float(os.getenv("BATCH_MIN_FREE_MEMORY", "0.1")),
+            llm_health=llm_health
+        )
+
+    @property
+    def adaptive(self) -> bool:
+        """Whether the limit can change at all."""
+        return self.minimum < self.maximum
+
+    def _reset_window(self) -> None:
+        self._durations: List[float] = []
+        self._errors = 0
+        self._rate_limited = 0
+        self._timeouts = 0
+        self._peak_in_flight = self._in_flight
+        if self.llm_health is not None:
+            self._llm_baseline = self.llm_health.snapshot()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the ``limit`` slots while a job runs."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    async def record(self, duration: float, error: Optional[BaseException] = None) -> None:
+        """Record a finished job and adjust the limit at the end of a window."""
+        self._durations.append(duration)
+        if error is not None:
+            self._errors += 1
+            if is_rate_limit_error(error):
+                self._rate_limited += 1
+            elif is_timeout_error(error):
+                self._timeouts += 1
+
+        if self.adaptive and len(self._durations) >= max(3, self.limit):
+            await self._evaluate()
+
+    def _p95(self) -> float:
+        ordered = sorted(self._durations)
+        return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+    async def _evaluate(self) -> None:
+        """Apply additive increase or multiplicative decrease for the finished window."""
+        jobs = len(self._durations)
+        p95 = self._p95()
+        rate_limited, timeouts, errors, calls = self._rate_limited, self._timeouts, self._errors, jobs
+        if self.llm_health is not None:
+            llm = self.llm_health.delta(self._llm_baseline)
+            rate_limited += llm["rate_limited"]
+            errors += llm["errors"]
+            calls += llm["calls"]
+        error_rate = errors / calls if calls else 0.0
+        free_memory = available_memory_fraction()
+
+        reason = None
+        if rate_limited:
+            reason = f"{rate_limited} rate-limit (429) error(s)"
+        elif timeouts:
+            reason = f"{timeouts} timeout(s)"
+        elif error_rate > self.error_threshold:
+            reason = f"error rate {error_rate:.0%} over {self.error_threshold:.0%}"
+        elif free_memory is not None and free_memory < self.min_free_memory:
+            reason = f"memory pressure, {free_memory:.0%} of RAM available"
+        elif self.best_p95 is not None and p95 > self.best_p95 * self.latency_tolerance:
+            reason = f"p95 latency {p95:.2f}s over {self.latency_tolerance}x best {self.best_p95:.2f}s"
+
+        if reason:
+            new_limit = max(self.minimum, int(self.limit * self.decrease_factor))
+        else:
+            # Let the baseline drift up slowly so one unusually fast window does not pin it
+            self.best_p95 = p95 if self.best_p95 is None else min(self.best_p95 * 1.05, p95)
+            # Only grow when the current limit was actually the bottleneck
+            if self._peak_in_flight >= self.limit:
+                new_limit = min(self.maximum, self.limit + 1)
+                reason = f"healthy window, p95 {p95:.2f}s, error rate {error_rate:.0%}"
+            else:
+                new_limit = self.limit
+
+        if new_limit != self.limit:
+            change = ConcurrencyChange(at=time.time(), old=self.limit, new=new_limit, reason=reason)
+            self.changes.append(change)
+            log = logger.warning if new_limit < self.limit else logger.info
+            log("Concurrency %d -> %d: %s", change.old, change.new, reason)
+            async with self._condition:
+                self.limit = new_limit
+                self._condition.notify_all()
+        self._reset_window()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the current limit and every change made so far."""
+        return {
+            'limit': self.limit,
+            'minimum': self.minimum,
+            'maximum': self.maximum,
+            'best_p95': round(self.best_p95, 3) if self.best_p95 is not None else None,
+            'changes': [change.to_dict() for change in self.changes]
+        }
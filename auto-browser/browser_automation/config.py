@@ -1,6 +1,16 @@
+import hashlib
+import marshal
+import os
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Dict, List, Optional, Union
-from pydantic import BaseModel, Field, validator
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator, model_validator
+
+if TYPE_CHECKING:
+    from .url_index import UrlMatch
+
+# Bump when the cached layout changes so stale caches are ignored
+CONFIG_CACHE_VERSION = 1
 
 class Selector(BaseModel):
     """Configuration for a specific element selector"""
@@ -10,61 +20,242 @@ class Selector(BaseModel):
     required: bool = True
     description: Optional[str] = None
 
+class NetworkPolicy(BaseModel):
+    """Requests to block in the browser context"""
+    enabled: bool = True
+    block_resource_types: List[str] = Field(default_factory=list)
+    block_url_patterns: List[str] = Field(default_factory=list)
+    block_domains: List[str] = Field(default_factory=list)
+
+    @classmethod
+    def default(cls) -> "NetworkPolicy":
+        """Block heavy media and common ad/analytics hosts"""
+        return cls(
+            block_resource_types=["image", "media", "font"],
+            block_domains=[
+                "doubleclick.net",
+                "googlesyndication.com",
+                "googletagmanager.com",
+                "google-analytics.com",
+                "adservice.google.com",
+                "facebook.net",
+                "scorecardresearch.com",
+                "hotjar.com",
+                "segment.io"
+            ]
+        )
+
+class RateLimit(BaseModel):
+    """Token bucket settings: sustained requests per second and burst size"""
+    rate: float = Field(gt=0)
+    burst: float = Field(default=1.0, ge=1)
+
+class RateLimitPolicy(BaseModel):
+    """Rate limits shared by every auto-browser process on this machine
+
+    Domain keys match a host and its subdomains; the "default" entry gives
+    every other host its own bucket. Provider keys are ModelProvider values
+    (e.g. openai, google) or "default".
+    """
+    enabled: bool = True
+    state_path: Optional[Path] = None
+    domains: Dict[str, RateLimit] = Field(default_factory=dict)
+    providers: Dict[str, RateLimit] = Field(default_factory=dict)
+
+    def for_host(self, host: str) -> Optional[Tuple[str, RateLimit]]:
+        """Get the (bucket key, limit) for a host, or None if it is unlimited"""
+        if not self.enabled or not host:
+            return None
+        host = host.lower()
+        matches = [d for d in self.domains
+                   if d != "default" and (host == d.lower() or host.endswith(f".{d.lower().lstrip('.')}"))]
+        if matches:
+            # The most specific rule wins and is shared by all its subdomains
+            domain = max(matches, key=len)
+            return f"domain:{domain.lower()}", self.domains[domain]
+        if "default" in self.domains:
+            return f"domain:{host}", self.domains["default"]
+        return None
+
+    def for_provider(self, provider: str) -> Optional[Tuple[str, RateLimit]]:
+        """Get the (bucket key, limit) for a model provider, or None if it is unlimited"""
+        if not self.enabled:
+            return None
+        limit = self.providers.get(provider) or self.providers.get("default")
+        return (f"provider:{provider}", limit) if limit else None
+
+class AuthConfig(BaseModel):
+    """Persistent login settings for a site"""
+    profile: str
+    logged_out_selector: Optional[str] = None
+    login_url: Optional[str] = None
+    login_task: Optional[str] = None
+
 class SiteConfig(BaseModel):
     """Configuration for a specific site template"""
     name: str
     description: Optional[str] = None
     url_pattern: str
-    selectors: Dict[str, Union[str, Selector]]
+    selectors: Dict[str, Selector]
     wait_for: Optional[str] = None
     output_format: str = "markdown"
     delay: float = 2.0
+    network: Optional[NetworkPolicy] = None
+    auth: Optional[AuthConfig] = None
     
-    @validator('selectors')
-    def validate_selectors(cls, v):
+    @field_validator('selectors', mode='before')
+    @classmethod
+    def validate_selectors(cls, v: Any) -> Any:
         """Convert string selectors to Selector objects"""
-        processed = {}
-        for key, value in v.items():
-            if isinstance(value, str):
-                processed[key] = Selector(css=value)
-            elif isinstance(value, dict):
-                processed[key] = Selector(**value)
-            else:
-                processed[key] = value
-        return processed
+        if not isinstance(v, dict):
+            return v
+        return {
+            key: Selector(css=value) if isinstance(value, str) else value
+            for key, value in v.items()
+        }
+
+class SiteRegistry(Mapping):
+    """Site templates that are validated lazily on first access"""
+
+    def __init__(self, raw_sites: Dict[str, Any]):
+        self._raw = raw_sites
+        self._validated: Dict[str, SiteConfig] = {}
+        self._url_index = None
+
+    def __getitem__(self, name: str) -> SiteConfig:
+        site = self._validated.get(name)
+        if site is None:
+            raw = self._raw[name]
+            try:
+                site = raw if isinstance(raw, SiteConfig) else SiteConfig.model_validate(raw)
+            except ValidationError as e:
+                raise ValueError(f"Invalid site template '{name}': {e}") from e
+            self._validated[name] = site
+        return site
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._raw
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def raw(self, name: str) -> Any:
+        """Get the unvalidated data for a site"""
+        return self._raw[name]
+
+    def match(self, url: str) -> Optional["UrlMatch"]:
+        """Find the site template whose url_pattern best matches a URL
+
+        The pattern index is built on first use from the raw url_pattern
+        values, without validating every template.
+        """
+        if self._url_index is None:
+            from .url_index import UrlPatternIndex
+            self._url_index = UrlPatternIndex(
+                (name, raw.url_pattern if isinstance(raw, SiteConfig) else raw.get('url_pattern'))
+                for name, raw in self._raw.items()
+                if (raw.url_pattern if isinstance(raw, SiteConfig) else isinstance(raw, dict) and raw.get('url_pattern'))
+            )
+        return self._url_index.match(url)
 
 class Config(BaseModel):
     """Main configuration"""
-    sites: Dict[str, SiteConfig]
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    sites: SiteRegistry
     output_dir: Path = Field(default=Path("output"))
     default_site: Optional[str] = None
+    network: NetworkPolicy = Field(default_factory=NetworkPolicy.default)
+    rate_limits: RateLimitPolicy = Field(default_factory=RateLimitPolicy)
     
-    class Config:
-        arbitrary_types_allowed = True
+    @field_validator('sites', mode='before')
+    @classmethod
+    def wrap_sites(cls, v: Any) -> SiteRegistry:
+        """Defer per-site validation until a site is used"""
+        if isinstance(v, SiteRegistry):
+            return v
+        if not isinstance(v, dict):
+            raise ValueError("sites must be a mapping of template names to site configs")
+        return SiteRegistry(v)
     
-    @validator('sites')
-    def validate_default_site(cls, v, values):
+    @model_validator(mode='after')
+    def validate_default_site(self) -> "Config":
         """Ensure default_site is valid if specified"""
-        if 'default_site' in values and values['default_site']:
-            if values['default_site'] not in v:
-                raise ValueError(f"Default site '{values['default_site']}' not found in sites")
-        return v
+        if self.default_site and self.default_site not in self.sites:
+            raise ValueError(f"Default site '{self.default_site}' not found in sites")
+        return self
+
+def _cache_path(config_path: Path) -> Path:
+    """Get the compiled cache file stored next to a config file"""
+    return config_path.with_name(f".{config_path.name}.cache")
 
-def load_config(config_path: Path) -> Config:
-    """Load configuration from YAML file"""
+def _read_config_data(config_path: Path, use_cache: bool = True) -> Any:
+    """Read raw config data, using the compiled cache when it is current"""
     import yaml
+
+    stat = config_path.stat()
+    cache_path = _cache_path(config_path)
+    cached = None
+    if use_cache:
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = marshal.loads(f.read())
+            if cached.get('version') != CONFIG_CACHE_VERSION:
+                cached = None
+        except (OSError, EOFError, ValueError, TypeError, AttributeError):
+            cached = None
+
+    if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+        return cached['data']
+
+    raw = config_path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    if cached and cached['sha256'] == digest:
+        # Touched but unchanged; refresh the stored mtime below
+        data = cached['data']
+    else:
+        try:
+            data = yaml.load(raw, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML format: {e}")
+
+    if use_cache:
+        entry = {
+            'version': CONFIG_CACHE_VERSION,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': digest,
+            'data': data
+        }
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(marshal.dumps(entry))
+            tmp_path.replace(cache_path)
+        except (OSError, ValueError):
+            # Read-only directory or values marshal cannot store (e.g. dates)
+            tmp_path.unlink(missing_ok=True)
+
+    return data
+
+def load_config(config_path: Path, use_cache: bool = True) -> Config:
+    """Load configuration from YAML file
     
+    The parsed YAML is cached in a binary file next to the config and reused
+    until the config's mtime, size or content changes. Site templates are
+    validated on first access.
+    """
+    config_path = Path(config_path)
     if not config_path.exists():
         raise FileNotFoundError(f"Config file not found: {config_path}")
         
-    with open(config_path) as f:
-        try:
-            config_data = yaml.safe_load(f)
-        except yaml.YAMLError as e:
-            raise ValueError(f"Invalid YAML format: {e}")
+    config_data = _read_config_data(config_path, use_cache)
             
     try:
-        return Config(**config_data)
+        return Config.model_validate(config_data)
     except Exception as e:
         raise ValueError(f"Invalid configuration format: {e}")
 
@@ -114,7 +305,16 @@ def create_example_config(path: Path):
             }
         },
         "output_dir": "output",
-        "default_site": "clinical_trials"
+        "default_site": "clinical_trials",
+        "rate_limits": {
+            "domains": {
+                "default": {"rate": 1.0, "burst": 3}
+            },
+            "providers": {
+                "openai": {"rate": 2.0, "burst": 5},
+                "google": {"rate": 1.0, "burst": 3}
+            }
+        }
     }
     
     import yaml
@@ -0,0 +1,269 @@
+"""Long-lived daemon keeping browsers and model clients warm between jobs.
+
+The daemon listens on a Unix socket. A client sends one JSON request per
+connection on a single line and reads newline-delimited JSON events back
+until the connection closes:
+
+    -> {"op": "run", "url": "...", "prompt": "...", "site": null, "report": false}
+    <- {"event": "accepted", "job_id": 1, "queued": false}
+    <- {"event": "started", "job_id": 1}
+    <- {"event": "result", "job_id": 1, "output": "/abs/path.md", "duration": 4.2}
+
+Other operations are ``ping`` and ``shutdown``. Failures are reported as
+``{"event": "error", "error": "..."}``.
+
+Jobs use the daemon's config file and environment, and relative output
+paths resolve against the daemon's working directory. ``ping`` reports the
+config, the directory and a fingerprint of the environment variables that
+affect jobs (see ``env_fingerprint``), so clients only forward jobs that
+would run the same in-process; a run request may also name them in
+``config``, ``cwd`` and ``env`` and is refused when they differ.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import signal
+import socket
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Request fields forwarded to run_all_tasks
+JOB_FIELDS = ('url', 'prompt', 'site', 'report', 'interactive', 'refresh_template',
+              'force', 'auth_profile', 'http_cache')
+
+# Environment variables that change how a job runs or which model it uses
+JOB_ENV_PREFIXES = ('AUTH_', 'BROWSER_', 'DOM_PRUN', 'HTTP_CACHE_', 'LLM_', 'REPORT_', 'TEMPLATE_CACHE_')
+JOB_ENV_VARS = ('OPENAI_API_KEY', 'GOOGLE_API_KEY')
+
+
+def env_fingerprint(environ: Optional[Mapping[str, str]] = None) -> str:
+    """Hash the environment variables that affect a job.
+
+    Only the hash is exchanged with the daemon, since the variables include
+    API keys.
+    """
+    environ = os.environ if environ is None else environ
+    relevant = sorted(
+        (name, value) for name, value in environ.items()
+        if name.startswith(JOB_ENV_PREFIXES) or name in JOB_ENV_VARS
+    )
+    return hashlib.sha256(json.dumps(relevant).encode("utf-8")).hexdigest()
+
+
+def default_socket_path() -> Path:
+    """Get the daemon socket path from AUTO_BROWSER_SOCKET or the default."""
+    return Path(os.getenv("AUTO_BROWSER_SOCKET") or Path.home() / ".auto-browser" / "daemon.sock").expanduser()
+
+
+class DaemonServer:
+    """Serve extraction jobs over a Unix socket from one warm process."""
+
+    def __init__(self, socket_path: Optional[Path] = None, config_path: str = "config.yaml",
+                 concurrency: int = 4):
+        """Initialize the daemon.
+
+        Args:
+            socket_path: Unix socket to listen on
+            config_path: Site template config, re-read for every job
+            concurrency: Maximum jobs run at once; the rest wait in line
+        """
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.config_path = str(Path(config_path).resolve())
+        self.concurrency = concurrency
+        self.jobs_served = 0
+        self._next_job_id = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    def _prepare_socket(self) -> None:
+        """Refuse to start twice and clear a socket left by a crashed daemon."""
+        if DaemonClient(self.socket_path).available():
+            raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+
+    async def warm_up(self) -> None:
+        """Launch pooled browsers and build the model client before taking jobs."""
+        from .browser_pool import get_browser_pool
+        from .models import ModelConfig, ModelFactory
+
+        ModelFactory.create_model(ModelConfig.from_env())
+        await get_browser_pool().warm()
+
+    async def serve_forever(self) -> None:
+        """Listen until SIGINT/SIGTERM or a shutdown request."""
+        from .browser_pool import close_browser_pool
+
+        self._prepare_socket()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._stop = asyncio.Event()
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._stop.set)
+
+        await self.warm_up()
+        server = await asyncio.start_unix_server(self._handle, path=str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        logger.info("Daemon listening on %s", self.socket_path)
+        try:
+            async with server:
+                await self._stop.wait()
+        finally:
+            self.socket_path.unlink(missing_ok=True)
+            await close_browser_pool()
+            logger.info("Daemon stopped after %d jobs", self.jobs_served)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Handle one client connection."""
+        async def send(event: Dict[str, Any]) -> None:
+            try:
+                writer.write((json.dumps(event) + "\n").encode("utf-8"))
+                await writer.drain()
+            except (ConnectionError, OSError):
+                # The client went away; the job still runs to completion
+                pass
+
+        try:
+            request = json.loads(await reader.readline())
+            op = request.get('op', 'run')
+            if op == 'ping':
+                await send({'event': 'pong', 'pid': os.getpid(), 'jobs_served': self.jobs_served,
+                            'config': self.config_path, 'cwd': os.getcwd(), 'env': env_fingerprint()})
+            elif op == 'shutdown':
+                await send({'event': 'stopping'})
+                self._stop.set()
+            elif op == 'run':
+                await self._run_job(request, send)
+            else:
+                await send({'event': 'error', 'error': f"Unknown operation: {op}"})
+        except Exception as e:
+            logger.error("Daemon request failed: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+            await send({'event': 'error', 'error': str(e)})
+        finally:
+            writer.close()
+
+    async def _run_job(self, request: Dict[str, Any], send) -> None:
+        """Run one extraction job and stream its events."""
+        from .cli import run_all_tasks
+        from .config import load_config
+        from .http_cache import HttpCache
+
+        if request.get('config') and request['config'] != self.config_path:
+            raise ValueError(f"Daemon serves config {self.config_path}, not {request['config']}")
+        if request.get('cwd') and request['cwd'] != os.getcwd():
+            raise ValueError(f"Daemon runs in {os.getcwd()}, not {request['cwd']}")
+        if request.get('env') and request['env'] != env_fingerprint():
+            raise ValueError("Daemon environment differs from the client's (LLM_*, BROWSER_*, HTTP_CACHE_* ...)")
+
+        self._next_job_id += 1
+        job_id = self._next_job_id
+        await send({'event': 'accepted', 'job_id': job_id, 'queued': self._semaphore.locked()})
+
+        async with self._semaphore:
+            await send({'event': 'started', 'job_id': job_id})
+            started = time.perf_counter()
+
+            config = load_config(Path(self.config_path))
+            site_config = None
+            if request.get('site'):
+                if request['site'] not in config.sites:
+                    raise ValueError(f"Site template '{request['site']}' not found")
+                site_config = config.sites[request['site']]
+
+            output_path = await run_all_tasks(
+                url=request['url'],
+                prompt=request.get('prompt', 'Extract the main content from the page'),
+                interactive=bool(request.get('interactive')),
+                verbose=False,
+                report=bool(request.get('report')),
+                site_config=site_config,
+                refresh_template=bool(request.get('refresh_template')),
+                network_policy=config.network,
+                detect_changes=not request.get('force'),
+                auth_profile=request.get('auth_profile'),
+                http_cache=HttpCache.from_env(config.output_dir, mode=request.get('http_cache')),
+                sites=config.sites
+            )
+            self.jobs_served += 1
+
+        await send({
+            'event': 'result',
+            'job_id': job_id,
+            'output': str(Path(output_path).resolve()),
+            'duration': round(time.perf_counter() - started, 3)
+        })
+
+
+class DaemonClient:
+    """Send jobs to a running daemon."""
+
+    def __init__(self, socket_path: Optional[Path] = None, timeout: float = 1.0):
+        """Initialize the client.
+
+        Args:
+            socket_path: Daemon socket
+            timeout: Seconds to wait when connecting
+        """
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.timeout = timeout
+
+    def info(self) -> Optional[Dict[str, Any]]:
+        """Get the listening daemon's ping reply, or None if none is listening."""
+        if not self.socket_path.exists():
+            return None
+        try:
+            return next((event for event in self.request({'op': 'ping'}) if event.get('event') == 'pong'), None)
+        except OSError:
+            return None
+
+    def available(self) -> bool:
+        """Check whether a daemon is listening."""
+        return self.info() is not None
+
+    def serves(self, config_path: Path) -> bool:
+        """Check whether a daemon is listening with this config, working directory and environment."""
+        info = self.info()
+        return (info is not None and info.get('config') == str(Path(config_path).resolve())
+                and info.get('cwd') == os.getcwd() and info.get('env') == env_fingerprint())
+
+    def request(self, payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Send a request and yield response events as they arrive."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(str(self.socket_path))
+            # Jobs can take minutes, so only the connect is time-limited
+            sock.settimeout(None)
+            sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+            with sock.makefile('r', encoding='utf-8') as stream:
+                for line in stream:
+                    if line.strip():
+                        yield json.loads(line)
+        finally:
+            sock.close()
+
+    def run(self, config_path: Optional[Path] = None, **job: Any) -> Iterator[Dict[str, Any]]:
+        """Submit an extraction job and yield its events.
+
+        Args:
+            config_path: Config file the job expects; the daemon refuses the
+                         job if it serves another config, working directory
+                         or environment
+            **job: Job fields (see JOB_FIELDS)
+        """
+        payload = {'op': 'run', **{key: job.get(key) for key in JOB_FIELDS}}
+        if config_path is not None:
+            payload.update(config=str(Path(config_path).resolve()), cwd=os.getcwd(), env=env_fingerprint())
+        return self.request(payload)
+
+    def shutdown(self) -> None:
+        """Ask the daemon to stop."""
+        for _ in self.request({'op': 'shutdown'}):
+            pass
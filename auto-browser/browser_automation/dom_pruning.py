@@ -0,0 +1,261 @@
+"""Prune the page representation the agent sends to the LLM."""
+
+import dataclasses
+import logging
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from browser_use.dom.views import DOMBaseNode, DOMElementNode, DOMTextNode
+
+from .tokens import count_tokens
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Attributes browser_use includes for each interactive element by default
+DEFAULT_INCLUDE_ATTRIBUTES = ['title', 'type', 'name', 'role', 'tabindex', 'aria-label',
+                              'placeholder', 'value', 'alt', 'aria-expanded']
+
+# Text with nothing to read, such as separators and icons
+_NO_WORDS = re.compile(r"^\W*$")
+
+# jQuery's :contains(), which planned actions use to target links by their text
+_CONTAINS = re.compile(r"""^(?P<css>.*?):contains\((?P<quote>['"]?)(?P<text>.*)(?P=quote)\)$""")
+
+# XPaths of the elements matching each selector, in the format browser_use's
+# buildDomTree.js uses (same-tag sibling index, relative to the document).
+# Selectors the browser rejects are returned so they can be reported.
+XPATH_SCRIPT = """
+(groups) => {
+    const xpath = (element) => {
+        const segments = [];
+        let current = element;
+        while (current && current.nodeType === Node.ELEMENT_NODE) {
+            let index = 0;
+            for (let sibling = current.previousSibling; sibling; sibling = sibling.previousSibling) {
+                if (sibling.nodeType === Node.ELEMENT_NODE && sibling.nodeName === current.nodeName) index++;
+            }
+            segments.unshift(current.nodeName.toLowerCase() + (index > 0 ? `[${index + 1}]` : ''));
+            current = current.parentNode;
+        }
+        return segments.join('/');
+    };
+    const result = {invalid: []};
+    for (const [group, selectors] of Object.entries(groups)) {
+        result[group] = [];
+        for (const {css, text} of selectors) {
+            let elements;
+            try {
+                elements = Array.from(document.querySelectorAll(css));
+            } catch (e) {
+                result.invalid.push(css);
+                continue;
+            }
+            if (text) {
+                const needle = text.toLowerCase();
+                elements = elements.filter(el => (el.textContent || '').toLowerCase().includes(needle));
+            }
+            elements.forEach(el => result[group].push(xpath(el)));
+        }
+    }
+    return result;
+}
+"""
+
+
+def _selector_css(selector: Any) -> Optional[str]:
+    """Get the CSS from a selector given as a string, dict or Selector."""
+    if isinstance(selector, str):
+        return selector
+    if isinstance(selector, dict):
+        return selector.get('css') or selector.get('selector')
+    return getattr(selector, 'css', None) or getattr(selector, 'selector', None)
+
+
+def _to_query(css: str) -> Dict[str, Optional[str]]:
+    """Translate a selector into CSS plus an optional text filter.
+
+    ``a:contains('Next')`` is not CSS; it becomes ``a`` filtered to elements
+    whose text contains "Next".
+    """
+    found = _CONTAINS.match(css.strip())
+    if found:
+        return {'css': found.group('css') or '*', 'text': found.group('text')}
+    return {'css': css, 'text': None}
+
+
+class DomPruner:
+    """Shrink the element tree an agent sees to the parts the template needs.
+
+    Every interactive element the agent can act on is kept, with its
+    label, and invisible text is always dropped. Other visible text is
+    whitespace-collapsed, and separators and blocks repeated verbatim
+    elsewhere on the page are dropped.
+
+    When the page's template selectors match, they also anchor which text
+    is kept: each matching subtree is kept along with its surroundings up
+    to ``context_levels`` ancestors, as are the subtrees the planned actions
+    target and visible text blocks of at least ``min_text_chars``. Without
+    selectors, or when none match, all other visible text stays. Element
+    indices are unchanged, so actions work as before.
+    """
+
+    def __init__(self, selectors: Optional[Dict[str, Any]] = None,
+                 actions: Optional[Iterable[Dict[str, Any]]] = None,
+                 context_levels: int = 1, min_text_chars: int = 40,
+                 include_attributes: Optional[List[str]] = None):
+        """Initialize the pruner.
+
+        Args:
+            selectors: Template selectors by field name
+            actions: Planned browser actions; the subtrees their selectors match are kept
+            context_levels: Ancestor levels around a match whose subtree is kept
+            min_text_chars: Shortest visible text kept outside matched subtrees
+            include_attributes: Element attributes shown to the LLM, used for token counts
+        """
+        self.anchors = [_to_query(css) for css in map(_selector_css, (selectors or {}).values()) if css]
+        self.targets = [_to_query(css) for css in map(_selector_css, actions or []) if css]
+        self.context_levels = context_levels
+        self.min_text_chars = min_text_chars
+        self.include_attributes = include_attributes or DEFAULT_INCLUDE_ATTRIBUTES
+        self.states = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self._reported: Set[str] = set()
+
+    @classmethod
+    def from_env(cls, selectors: Optional[Dict[str, Any]] = None,
+                 actions: Optional[Iterable[Dict[str, Any]]] = None) -> Optional["DomPruner"]:
+        """Create a DomPruner from environment variables.
+
+        Environment variables:
+            DOM_PRUNING: Whether to prune the agent's page state (true/false)
+            DOM_PRUNE_CONTEXT_LEVELS: Ancestor levels kept around a selector match
+            DOM_PRUNE_MIN_TEXT: Shortest visible text block kept
+
+        Args:
+            selectors: Template selectors by field name
+            actions: Planned browser actions
+
+        Returns:
+            DomPruner instance, or None if pruning is disabled
+        """
+        if os.getenv("DOM_PRUNING", "true").lower() == "false":
+            return None
+        return cls(
+            selectors=selectors,
+            actions=actions,
+            context_levels=int(os.getenv("DOM_PRUNE_CONTEXT_LEVELS", "1")),
+            min_text_chars=int(os.getenv("DOM_PRUNE_MIN_TEXT", "40"))
+        )
+
+    def attach(self, browser_context: Any) -> Any:
+        """Prune every state the context hands to an agent.
+
+        Wraps ``get_state`` on the browser_use context. The context's cached
+        state, and with it the selector map actions use, stays complete.
+        Attaching another pruner to the same context replaces this one;
+        ``detach`` restores the original.
+        """
+        get_state = getattr(browser_context, '_unpruned_get_state', browser_context.get_state)
+        browser_context._unpruned_get_state = get_state
+
+        async def pruned_get_state(*args: Any, **kwargs: Any) -> Any:
+            state = await get_state(*args, **kwargs)
+            with span('dom.prune', category='agent') as info:
+                page = await browser_context.get_current_page()
+                pruned = await self.prune(state, page)
+                info.update(tokens_before=self._last_before, tokens_after=self._last_after)
+            return pruned
+
+        browser_context.get_state = pruned_get_state
+        return browser_context
+
+    @staticmethod
+    def detach(browser_context: Any) -> None:
+        """Stop pruning the states a context hands to agents."""
+        get_state = getattr(browser_context, '_unpruned_get_state', None)
+        if get_state is not None:
+            browser_context.get_state = get_state
+            del browser_context._unpruned_get_state
+
+    async def prune(self, state: Any, page: Any) -> Any:
+        """Get a copy of a browser state with a pruned element tree."""
+        xpaths = {'anchors': [], 'targets': [], 'invalid': []}
+        if self.anchors or self.targets:
+            try:
+                xpaths = await page.evaluate(XPATH_SCRIPT, {'anchors': self.anchors, 'targets': self.targets})
+            except Exception as e:
+                logger.debug("Could not resolve selectors for DOM pruning: %s", e)
+        for css in set(xpaths.get('invalid', [])) - self._reported:
+            logger.warning("Selector %r is not valid CSS; DOM pruning ignores it", css)
+            self._reported.add(css)
+
+        keep = self._keep_roots(xpaths['anchors'])
+        tree = self._prune_node(state.element_tree, None, keep, set(xpaths['targets']),
+                                focused=bool(keep), inside=False, seen=set())
+        tree = tree or dataclasses.replace(state.element_tree, children=[], parent=None)
+
+        before = count_tokens(state.element_tree.clickable_elements_to_string(self.include_attributes))
+        after = count_tokens(tree.clickable_elements_to_string(self.include_attributes))
+        self._last_before, self._last_after = before, after
+        self.states += 1
+        self.tokens_before += before
+        self.tokens_after += after
+        logger.info("DOM pruned from %d to %d tokens (%d selector matches)", before, after, len(xpaths['anchors']))
+
+        return dataclasses.replace(state, element_tree=tree)
+
+    def _keep_roots(self, anchors: List[str]) -> Set[str]:
+        """Get the XPaths of the subtrees kept around the selector matches."""
+        roots = set()
+        for xpath in anchors:
+            segments = xpath.split('/')
+            # Never widen a match to the whole body
+            if len(segments) - self.context_levels >= 3:
+                segments = segments[:len(segments) - self.context_levels]
+            roots.add('/'.join(segments))
+        return roots
+
+    def _prune_node(self, node: DOMBaseNode, parent: Optional[DOMElementNode], keep: Set[str],
+                    targets: Set[str], focused: bool, inside: bool, seen: Set[str]) -> Optional[DOMBaseNode]:
+        """Copy the parts of a subtree worth showing to the agent.
+
+        ``seen`` collects the text blocks already kept outside kept subtrees.
+        """
+        if isinstance(node, DOMTextNode):
+            if not node.is_visible:
+                return None
+            if inside:
+                return DOMTextNode(text=node.text, is_visible=True, parent=parent)
+            text = " ".join(node.text.split())
+            if _NO_WORDS.match(text) or text in seen or (focused and len(text) < self.min_text_chars):
+                return None
+            seen.add(text)
+            return DOMTextNode(text=text, is_visible=True, parent=parent)
+
+        if not isinstance(node, DOMElementNode):
+            return None
+
+        # Interactive elements are always kept, labels included, so the agent can act on them
+        inside = (inside or node.highlight_index is not None
+                  or node.xpath in keep or node.xpath in targets)
+        copy = dataclasses.replace(node, children=[], parent=parent)
+        for child in node.children:
+            pruned = self._prune_node(child, copy, keep, targets, focused, inside, seen)
+            if pruned is not None:
+                copy.children.append(pruned)
+
+        if inside or copy.children:
+            return copy
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get token counts before and after pruning across all states."""
+        return {
+            'states': self.states,
+            'tokens_before': self.tokens_before,
+            'tokens_after': self.tokens_after,
+            'reduction': round(1 - self.tokens_after / self.tokens_before, 3) if self.tokens_before else 0.0
+        }
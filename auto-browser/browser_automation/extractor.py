@@ -0,0 +1,115 @@
+"""Deterministic selector-based extraction for auto-browser."""
+
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Evaluates every selector in a single round trip to the page
+EXTRACT_SCRIPT = """
+(selectors) => {
+    const results = {};
+    for (const [name, spec] of Object.entries(selectors)) {
+        let nodes;
+        try {
+            nodes = Array.from(document.querySelectorAll(spec.css));
+        } catch (e) {
+            results[name] = null;
+            continue;
+        }
+        const read = (el) => {
+            const value = spec.attribute ? el.getAttribute(spec.attribute) : (el.innerText || el.textContent);
+            return value === null ? null : value.trim();
+        };
+        if (spec.multiple) {
+            results[name] = nodes.map(read).filter((value) => value);
+        } else {
+            results[name] = nodes.length ? (read(nodes[0]) || null) : null;
+        }
+    }
+    return results;
+}
+"""
+
+
+@dataclass
+class ExtractionResult:
+    """Result of a selector extraction pass."""
+    data: Dict[str, Any]
+    missing_required: List[str] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every required selector produced a value."""
+        return not self.missing_required
+
+
+def normalize_selectors(selectors: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Convert string, dict, dataclass or model selectors to plain dicts."""
+    normalized = {}
+    for name, selector in selectors.items():
+        if isinstance(selector, str):
+            spec = {'css': selector}
+        elif isinstance(selector, dict):
+            spec = dict(selector)
+        else:
+            spec = {
+                'css': selector.css,
+                'attribute': getattr(selector, 'attribute', None),
+                'multiple': getattr(selector, 'multiple', False),
+                'required': getattr(selector, 'required', True)
+            }
+        normalized[name] = {
+            'css': spec['css'],
+            'attribute': spec.get('attribute'),
+            'multiple': bool(spec.get('multiple', False)),
+            'required': bool(spec.get('required', True))
+        }
+    return normalized
+
+
+class SelectorExtractor:
+    """Extract page content by evaluating CSS selectors without an LLM."""
+
+    def __init__(self, selectors: Dict[str, Any], wait_for: Optional[str] = None,
+                 timeout: Optional[float] = None):
+        """Initialize the extractor.
+
+        Args:
+            selectors: Mapping of field names to selectors
+            wait_for: Optional CSS selector to wait for before extracting
+            timeout: Navigation and wait timeout in milliseconds. Defaults to
+                     the BROWSER_TIMEOUT environment variable.
+        """
+        self.selectors = normalize_selectors(selectors)
+        self.wait_for = wait_for
+        self.timeout = timeout or float(os.getenv('BROWSER_TIMEOUT', '30000'))
+
+    async def extract(self, page: Page, url: Optional[str] = None) -> ExtractionResult:
+        """Load a page and evaluate all selectors in one pass.
+
+        Args:
+            page: Playwright page to use
+            url: Optional URL to navigate to first
+
+        Returns:
+            Extracted values and the names of required selectors that came back empty
+        """
+        if url:
+            await page.goto(url, wait_until='domcontentloaded', timeout=self.timeout)
+
+        if self.wait_for:
+            try:
+                await page.wait_for_selector(self.wait_for, timeout=self.timeout)
+            except PlaywrightTimeoutError:
+                logger.info("Timed out waiting for '%s'", self.wait_for)
+
+        data = await page.evaluate(EXTRACT_SCRIPT, self.selectors)
+        missing = [
+            name for name, spec in self.selectors.items()
+            if spec['required'] and not data.get(name)
+        ]
+        return ExtractionResult(data=data, missing_required=missing)
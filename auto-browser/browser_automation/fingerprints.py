@@ -0,0 +1,185 @@
+"""Change detection for repeated extractions of the same page."""
+
+import difflib
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_content(content: Any) -> Any:
+    """Reduce extracted content to a canonical form for comparison.
+
+    JSON strings are parsed so key order and formatting do not matter;
+    other text has its whitespace collapsed.
+    """
+    if isinstance(content, str):
+        try:
+            content = json.loads(content)
+        except ValueError:
+            return re.sub(r"\s+", " ", content).strip()
+
+    if isinstance(content, dict):
+        return {str(key): normalize_content(value) for key, value in content.items()}
+    if isinstance(content, (list, tuple)):
+        return [normalize_content(value) for value in content]
+    if isinstance(content, str):
+        return re.sub(r"\s+", " ", content).strip()
+    return content
+
+
+def fingerprint(normalized: Any) -> str:
+    """Hash normalized content."""
+    payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def change_key(site: str, prompt: str, output_kind: str, interactive: bool = False,
+               actions: Optional[List[Dict[str, Any]]] = None) -> str:
+    """Build the FingerprintStore key for a run's extraction and output settings.
+
+    The prompt and action settings are hashed into the key, since the same
+    content turns into a different report or output under another prompt.
+
+    Args:
+        site: Site template name, or another key for the extraction settings
+        prompt: Prompt the run was given
+        output_kind: Output produced, e.g. "report", "markdown" or "jsonl"
+        interactive: Whether interactive actions ran
+        actions: Planned browser actions
+
+    Returns:
+        Key for FingerprintStore.check and record
+    """
+    settings = json.dumps({"prompt": prompt, "interactive": interactive, "actions": actions or []},
+                          sort_keys=True, ensure_ascii=False, default=str)
+    return f"{site}|{output_kind}|{hashlib.sha256(settings.encode('utf-8')).hexdigest()[:16]}"
+
+
+def diff_content(old: Any, new: Any) -> Dict[str, Any]:
+    """Describe what changed between two normalized extractions.
+
+    Returns:
+        Field-level ``added``/``removed``/``changed`` entries when both sides
+        are objects, otherwise a unified ``text`` diff
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        return {
+            "added": {key: new[key] for key in new.keys() - old.keys()},
+            "removed": {key: old[key] for key in old.keys() - new.keys()},
+            "changed": {
+                key: {"old": old[key], "new": new[key]}
+                for key in old.keys() & new.keys() if old[key] != new[key]
+            }
+        }
+
+    def lines(value: Any) -> list:
+        text = value if isinstance(value, str) else json.dumps(value, indent=2, sort_keys=True, ensure_ascii=False)
+        return text.splitlines()
+
+    return {"text": list(difflib.unified_diff(lines(old), lines(new), "previous", "current", lineterm=""))}
+
+
+@dataclass
+class ChangeResult:
+    """Outcome of comparing an extraction with the previous run.
+
+    Attributes:
+        changed: Whether the content differs from the last recorded run
+        fingerprint: Hash of the normalized content
+        previous_output: Output file written for the last recorded run
+        diff: Structured diff against the last recorded run, if there was one
+    """
+    changed: bool
+    fingerprint: str
+    previous_output: Optional[str] = None
+    diff: Optional[Dict[str, Any]] = None
+    normalized: Any = field(default=None, repr=False)
+
+
+class FingerprintStore:
+    """Remember the last extracted content per (site, URL).
+
+    Each entry is a JSON file in ``store_dir`` holding the fingerprint, the
+    normalized content (for diffs) and the output file that run produced.
+    """
+
+    def __init__(self, store_dir: Path = Path("output") / ".cache" / "fingerprints"):
+        """Initialize the fingerprint store.
+
+        Args:
+            store_dir: Directory holding fingerprint entries
+        """
+        self.store_dir = Path(store_dir)
+
+    def _path(self, site: str, url: str) -> Path:
+        """Get the entry file for a site and URL."""
+        digest = hashlib.sha256(f"{site}\n{url.strip()}".encode("utf-8")).hexdigest()[:32]
+        return self.store_dir / f"{digest}.json"
+
+    def _load(self, site: str, url: str) -> Optional[Dict[str, Any]]:
+        """Load an entry, treating unreadable files as missing."""
+        try:
+            return json.loads(self._path(site, url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def check(self, site: str, url: str, content: Any) -> ChangeResult:
+        """Compare extracted content against the last recorded run.
+
+        Content only counts as unchanged if the previous output file still
+        exists, so deleting an output forces it to be regenerated.
+
+        Args:
+            site: Site template name or other key for the extraction settings
+            url: Page URL
+            content: Extracted content
+
+        Returns:
+            ChangeResult for the extraction
+        """
+        normalized = normalize_content(content)
+        current = fingerprint(normalized)
+        entry = self._load(site, url)
+        if entry is None:
+            return ChangeResult(changed=True, fingerprint=current, normalized=normalized)
+
+        previous_output = entry.get("output")
+        if entry.get("fingerprint") == current and previous_output and Path(previous_output).exists():
+            return ChangeResult(changed=False, fingerprint=current,
+                                previous_output=previous_output, normalized=normalized)
+
+        diff = None if entry.get("fingerprint") == current else diff_content(entry.get("content"), normalized)
+        return ChangeResult(changed=True, fingerprint=current, previous_output=previous_output,
+                            diff=diff, normalized=normalized)
+
+    def record(self, site: str, url: str, change: ChangeResult, output_path: Path) -> None:
+        """Record a run once its output has been written."""
+        path = self._path(site, url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "site": site,
+            "url": url,
+            "fingerprint": change.fingerprint,
+            "content": change.normalized,
+            "output": str(output_path),
+            "updated_at": time.time()
+        }
+        # A temp file per writer, so concurrent tasks in one process never share one
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.stem}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+                tmp.write(json.dumps(entry, ensure_ascii=False))
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        logger.debug("Recorded fingerprint %s for %s", change.fingerprint[:12], url)
@@ -1,5 +1,6 @@
 """Formatters package for auto-browser."""
 
 from .markdown import MarkdownFormatter
+from .jsonl import JsonlSink
 
-__all__ = ['MarkdownFormatter']
+__all__ = ['MarkdownFormatter', 'JsonlSink']
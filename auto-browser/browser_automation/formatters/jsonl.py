@@ -0,0 +1,86 @@
+"""Append-only JSONL output for auto-browser runs."""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+
+class JsonlSink:
+    """Append one JSON record per run to a single file.
+
+    Each line is a complete record, so large batch runs produce one
+    streamable file that can be read back while it is still being written.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize the sink.
+
+        Args:
+            path: JSONL file to append to
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = None
+
+    def write(self, record: Dict[str, Any]) -> Path:
+        """Append a record as one line and flush it."""
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(line)
+            self._file.flush()
+        return self.path
+
+    def write_run(self, url: str, result: Dict[str, Any], timings: Dict[str, float],
+                  report: Optional[str] = None, **extra: Any) -> Path:
+        """Append the record for one extraction run.
+
+        Args:
+            url: Processed URL
+            result: Extraction result from BrowserAutomation.process_url
+            timings: Seconds spent per phase
+            report: Optional generated report
+            **extra: Additional fields to store
+
+        Returns:
+            Path of the JSONL file
+        """
+        record = {
+            'url': url,
+            'recorded_at': datetime.now().isoformat(),
+            'metadata': result.get('metadata', {}),
+            'content': result.get('content'),
+            'timings': {phase: round(seconds, 3) for phase, seconds in timings.items()}
+        }
+        if 'interactive_results' in result:
+            record['interactive_results'] = result['interactive_results']
+        if report is not None:
+            record['report'] = report
+        record.update(extra)
+        return self.write(record)
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Read records back one at a time."""
+        if not self.path.exists():
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "JsonlSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
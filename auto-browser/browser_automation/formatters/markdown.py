@@ -1,7 +1,7 @@
 """Markdown formatting for auto-browser output."""
 
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List
 from datetime import datetime
 import re
 from urllib.parse import urlparse
@@ -9,17 +9,15 @@ from urllib.parse import urlparse
 class MarkdownFormatter:
     """Format analyzed content as markdown."""
     
-    def format_content(self, analyzed_data: Dict[str, Any]) -> str:
-        """Format analyzed data into markdown."""
-        sections = []
-        
+    def iter_sections(self, analyzed_data: Dict[str, Any]) -> Iterator[str]:
+        """Yield markdown sections one at a time."""
         # Add title
-        sections.append(f"# {analyzed_data.get('title', 'Analysis Result')}")
+        yield f"# {analyzed_data.get('title', 'Analysis Result')}"
         
         # Add metadata if present
         metadata = analyzed_data.get('metadata', {})
         if metadata:
-            sections.append("## Metadata")
+            yield "## Metadata"
             for key, value in metadata.items():
                 if key == 'timestamp':
                     try:
@@ -27,20 +25,32 @@ class MarkdownFormatter:
                         value = dt.strftime("%Y-%m-%d %H:%M:%S")
                     except (ValueError, TypeError):
                         pass
-                sections.append(f"- **{key.title()}**: {value}")
+                yield f"- **{key.title()}**: {value}"
         
         # Add main content
         content = analyzed_data.get('content')
         if content:
-            sections.append("## Content")
+            yield "## Content"
             if isinstance(content, dict):
                 for key, value in content.items():
-                    sections.append(f"### {key}")
-                    sections.append(str(value))
+                    yield f"### {key}"
+                    yield str(value)
             else:
-                sections.append(str(content))
-        
-        return "\n\n".join(sections)
+                yield str(content)
+    
+    def format_content(self, analyzed_data: Dict[str, Any]) -> str:
+        """Format analyzed data into markdown."""
+        return "\n\n".join(self.iter_sections(analyzed_data))
+    
+    def write_markdown(self, analyzed_data: Dict[str, Any], url: str, output_dir: str = "output") -> Path:
+        """Format analyzed data and write each section to a new file as it is produced."""
+        file_path = self.create_output_path(url, output_dir)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            for i, section in enumerate(self.iter_sections(analyzed_data)):
+                if i:
+                    f.write("\n\n")
+                f.write(section)
+        return file_path
     
     def _create_filename(self, url: str) -> str:
         """Create a safe filename from URL with timestamp."""
@@ -62,16 +72,18 @@ class MarkdownFormatter:
         # Create final filename
         return f"{base}_{timestamp}.md"
     
-    def save_markdown(self, content: str, url: str, output_dir: str = "output") -> Path:
-        """Save markdown content to file with unique name."""
+    def create_output_path(self, url: str, output_dir: str = "output") -> Path:
+        """Get a unique output file path for a URL, creating the directory."""
         # Create unique filename
         filename = self._create_filename(url)
             
         # Ensure output directory exists
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
-        
-        # Save content
-        file_path = output_path / filename
+        return output_path / filename
+    
+    def save_markdown(self, content: str, url: str, output_dir: str = "output") -> Path:
+        """Save markdown content to file with unique name."""
+        file_path = self.create_output_path(url, output_dir)
         file_path.write_text(content, encoding='utf-8')
         return file_path
@@ -0,0 +1,154 @@
+"""Record-and-replay HTTP cache for browser page loads."""
+
+import hashlib
+import logging
+import os
+import time
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext
+
+logger = logging.getLogger(__name__)
+
+
+class HttpCacheMode(str, Enum):
+    """How page loads use the HTTP cache."""
+    OFF = "off"
+    RECORD = "record"      # Always load from the network and re-record
+    REPLAY = "replay"      # Serve only from recordings, never touch the network
+    REFRESH = "refresh"    # Replay fresh recordings, re-record stale or missing ones
+
+
+@dataclass
+class HarPlan:
+    """What a single browser context does with the cache.
+
+    Attributes:
+        path: HAR archive for the page
+        action: "record" or "replay"
+        not_found: What replay does with requests missing from the archive
+    """
+    path: Path
+    action: str
+    not_found: str = "abort"
+
+    async def attach(self, context: "BrowserContext") -> None:
+        """Install HAR recording or routing on a Playwright context.
+
+        Can be passed directly as a browser pool context hook. Recordings
+        are written when the context closes.
+        """
+        if self.action == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            await context.route_from_har(self.path, update=True, update_mode="minimal")
+        else:
+            await context.route_from_har(self.path, not_found=self.not_found)
+
+
+class HttpCache:
+    """Per-URL HAR recordings of everything a page load fetched.
+
+    Each page URL maps to one zipped HAR archive in ``cache_dir``, so reruns
+    of the same URL can be served without the network. In refresh mode,
+    recordings older than ``max_age`` seconds are re-recorded.
+    """
+
+    def __init__(self, mode: HttpCacheMode = HttpCacheMode.OFF,
+                 cache_dir: Path = Path("output") / ".cache" / "http",
+                 max_age: float = 24 * 3600):
+        """Initialize the HTTP cache.
+
+        Args:
+            mode: Cache mode
+            cache_dir: Directory holding HAR archives
+            max_age: Seconds before a recording is stale in refresh mode
+        """
+        self.mode = HttpCacheMode(mode)
+        self.cache_dir = Path(cache_dir)
+        self.max_age = max_age
+
+    @classmethod
+    def from_env(cls, output_dir: str = "output", mode: Optional[str] = None) -> "HttpCache":
+        """Create an HttpCache from environment variables.
+
+        Environment variables:
+            HTTP_CACHE_MODE: off, record, replay or refresh
+            HTTP_CACHE_MAX_AGE: Recording lifetime in seconds for refresh mode
+
+        Args:
+            output_dir: Output directory the cache lives under
+            mode: Optional mode overriding HTTP_CACHE_MODE
+
+        Returns:
+            HttpCache instance
+        """
+        return cls(
+            mode=(mode or os.getenv("HTTP_CACHE_MODE", "off")).lower(),
+            cache_dir=Path(output_dir) / ".cache" / "http",
+            max_age=float(os.getenv("HTTP_CACHE_MAX_AGE", 24 * 3600))
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether page loads go through the cache."""
+        return self.mode != HttpCacheMode.OFF
+
+    @staticmethod
+    def batch_key(urls: Iterable[str]) -> str:
+        """Get the cache key of a set of URLs loaded in one browser context.
+
+        A context records one HAR archive however many tabs it opens, so a
+        batch is keyed on its whole set of URLs, independent of their order.
+        """
+        return "\n".join(sorted({url.strip() for url in urls}))
+
+    def path(self, url: str) -> Path:
+        """Get the HAR archive for a page URL."""
+        digest = hashlib.sha256(url.strip().encode("utf-8")).hexdigest()[:32]
+        return self.cache_dir / f"{digest}.har.zip"
+
+    def plan(self, url: str) -> Optional[HarPlan]:
+        """Decide whether a page load records or replays.
+
+        ``url`` is the page URL, or a ``batch_key`` for URLs loaded as tabs
+        of one context. A batch's recording only replays for the same set
+        of URLs; it is not shared with single-URL runs of its pages.
+
+        Returns:
+            HarPlan to attach to the browser context, or None when the cache is off
+
+        Raises:
+            FileNotFoundError: In replay mode when the URL was never recorded
+        """
+        if not self.enabled:
+            return None
+
+        path = self.path(url)
+        if self.mode == HttpCacheMode.RECORD:
+            return HarPlan(path=path, action="record")
+
+        if self.mode == HttpCacheMode.REPLAY:
+            if not path.exists():
+                raise FileNotFoundError(f"No HTTP recording for {url}; run with --http-cache record first")
+            return HarPlan(path=path, action="replay", not_found="abort")
+
+        try:
+            age = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            age = None
+        if age is None or age > self.max_age:
+            logger.info("Recording HTTP cache for %s", url)
+            return HarPlan(path=path, action="record")
+        # Requests the recording does not cover still go to the network
+        return HarPlan(path=path, action="replay", not_found="fallback")
+
+    def clear(self) -> None:
+        """Remove all recordings."""
+        if not self.cache_dir.exists():
+            return
+        for path in self.cache_dir.glob("*.har.zip"):
+            path.unlink(missing_ok=True)
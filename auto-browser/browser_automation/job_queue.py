@@ -0,0 +1,323 @@
+"""Durable SQLite job queue for batch extraction runs."""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class JobState(str, Enum):
+    """Lifecycle of a queued job."""
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class JobQueue:
+    """Persist batch jobs so an interrupted run can be resumed.
+
+    Every state change is committed immediately, so a crash loses at most
+    the jobs that were in flight. Those keep a lease; once it expires (or
+    the run is resumed) they return to pending. Failed attempts are retried
+    with exponential backoff until ``max_attempts`` is reached. Jobs that
+    are done are never handed out again.
+    """
+
+    def __init__(self, path: Path = Path("output") / ".cache" / "jobs.sqlite",
+                 max_attempts: int = 3, retry_base: float = 5.0, retry_max: float = 300.0,
+                 lease_seconds: float = 900.0):
+        """Initialize the queue.
+
+        Args:
+            path: SQLite database file
+            max_attempts: Attempts per job before it is marked failed
+            retry_base: Seconds to wait before the first retry; doubles per attempt
+            retry_max: Upper bound on the wait between retries
+            lease_seconds: Seconds a running job may go without a heartbeat
+                           before another worker may reclaim it
+        """
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    @classmethod
+    def from_env(cls, output_dir: str = "output") -> "JobQueue":
+        """Create a JobQueue from environment variables.
+
+        Environment variables:
+            JOB_QUEUE_PATH: SQLite file (default <output_dir>/.cache/jobs.sqlite)
+            JOB_MAX_ATTEMPTS: Attempts per job before it is marked failed
+            JOB_RETRY_BASE: Seconds before the first retry
+            JOB_RETRY_MAX: Maximum seconds between retries
+            JOB_LEASE_SECONDS: Seconds before a silent running job is reclaimed
+
+        Args:
+            output_dir: Output directory the queue lives under by default
+
+        Returns:
+            JobQueue instance
+        """
+        return cls(
+            path=Path(os.getenv("JOB_QUEUE_PATH") or Path(output_dir) / ".cache" / "jobs.sqlite"),
+            max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3")),
+            retry_base=float(os.getenv("JOB_RETRY_BASE", "5")),
+            retry_max=float(os.getenv("JOB_RETRY_MAX", "300")),
+            lease_seconds=float(os.getenv("JOB_LEASE_SECONDS", "900"))
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the tables."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit; multi-statement updates use explicit transactions
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        conn.row_factory = sqlite3.Row
+        # WAL lets a resumed run and other readers share the file
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                options TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL REFERENCES runs (run_id),
+                url TEXT NOT NULL,
+                prompt TEXT NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                lease_expires_at REAL,
+                worker TEXT,
+                output TEXT,
+                error TEXT,
+                duration REAL,
+                updated_at REAL NOT NULL,
+                UNIQUE (run_id, url, prompt)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (run_id, state, next_attempt_at)")
+        return conn
+
+    def create_run(self, run_id: str, jobs: Sequence[Tuple[str, str]], options: Dict[str, Any]) -> int:
+        """Register a run and enqueue its jobs.
+
+        Jobs already in the run are left untouched, so calling this again
+        with the same run ID only adds new URLs.
+
+        Returns:
+            Number of newly enqueued jobs
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO runs (run_id, options, created_at) VALUES (?, ?, ?)",
+                    (run_id, json.dumps(options), now)
+                )
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO jobs (run_id, url, prompt, state, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    [(run_id, url, prompt, JobState.PENDING.value, now) for url, prompt in jobs]
+                )
+                added = self._conn.total_changes - before
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def get_options(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Get the options a run was started with, or None if it does not exist."""
+        with self._lock:
+            row = self._conn.execute("SELECT options FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return json.loads(row['options']) if row else None
+
+    def latest_unfinished_run(self) -> Optional[str]:
+        """Get the most recent run that still has pending or running jobs."""
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT runs.run_id FROM runs
+                WHERE EXISTS (SELECT 1 FROM jobs WHERE jobs.run_id = runs.run_id AND state IN (?, ?))
+                ORDER BY created_at DESC LIMIT 1
+            """, (JobState.PENDING.value, JobState.RUNNING.value)).fetchone()
+        return row['run_id'] if row else None
+
+    def reclaim(self, run_id: str, expired_only: bool = True) -> int:
+        """Return running jobs to pending.
+
+        Args:
+            run_id: Run to reclaim jobs in
+            expired_only: Only reclaim jobs whose lease has run out. Resuming
+                          a run reclaims all of them, since their workers are gone.
+
+        Returns:
+            Number of reclaimed jobs
+        """
+        query = "UPDATE jobs SET state = ?, worker = NULL, lease_expires_at = NULL WHERE run_id = ? AND state = ?"
+        params: List[Any] = [JobState.PENDING.value, run_id, JobState.RUNNING.value]
+        if expired_only:
+            query += " AND lease_expires_at < ?"
+            params.append(time.time())
+        with self._lock:
+            reclaimed = self._conn.execute(query, params).rowcount
+        if reclaimed:
+            logger.info("Reclaimed %d interrupted job(s) in run %s", reclaimed, run_id)
+        return reclaimed
+
+    def retry_failed(self, run_id: str) -> int:
+        """Give failed jobs a fresh set of attempts."""
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET state = ?, attempts = 0, next_attempt_at = 0, error = NULL "
+                "WHERE run_id = ? AND state = ?",
+                (JobState.PENDING.value, run_id, JobState.FAILED.value)
+            ).rowcount
+
+    def claim(self, run_id: str, worker: str) -> Optional[sqlite3.Row]:
+        """Lease the next job that is due, or return None if none is."""
+        self.reclaim(run_id)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT * FROM jobs WHERE run_id = ? AND state = ? AND next_attempt_at <= ? "
+                    "ORDER BY next_attempt_at, id LIMIT 1",
+                    (run_id, JobState.PENDING.value, now)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET state = ?, attempts = attempts + 1, worker = ?, "
+                        "lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                        (JobState.RUNNING.value, worker, now + self.lease_seconds, now, row['id'])
+                    )
+                    row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (row['id'],)).fetchone()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return row
+
+    def heartbeat(self, job_id: int, worker: str) -> bool:
+        """Extend the lease of a running job.
+
+        Returns:
+            Whether the worker still held the lease
+        """
+        now = time.time()
+        with self._lock:
+            extended = self._conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND state = ? "
+                "AND worker = ? AND lease_expires_at > ?",
+                (now + self.lease_seconds, job_id, JobState.RUNNING.value, worker, now)
+            ).rowcount
+        if not extended:
+            self._log_lost_lease(job_id, worker)
+        return bool(extended)
+
+    def complete(self, job_id: int, worker: str, output: str, duration: float) -> bool:
+        """Mark a job done if the worker still holds its lease.
+
+        Returns:
+            Whether the job was marked done. False means the lease expired
+            and the job was reclaimed, so another worker may be running it.
+        """
+        now = time.time()
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE jobs SET state = ?, output = ?, error = NULL, duration = ?, "
+                "lease_expires_at = NULL, updated_at = ? WHERE id = ? AND state = ? "
+                "AND worker = ? AND lease_expires_at > ?",
+                (JobState.DONE.value, output, duration, now, job_id, JobState.RUNNING.value, worker, now)
+            ).rowcount
+        if not updated:
+            self._log_lost_lease(job_id, worker)
+        return bool(updated)
+
+    def fail(self, job_id: int, worker: str, error: str, duration: float) -> Optional[JobState]:
+        """Record a failed attempt and schedule a retry if attempts remain.
+
+        Returns:
+            The job's new state: pending if it will be retried, failed
+            otherwise. None if the worker no longer held the lease, in which
+            case nothing is recorded.
+        """
+        now = time.time()
+        with self._lock:
+            attempts = self._conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+            if attempts >= self.max_attempts:
+                state, next_attempt_at = JobState.FAILED, 0.0
+            else:
+                state = JobState.PENDING
+                next_attempt_at = now + min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+            updated = self._conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, duration = ?, next_attempt_at = ?, "
+                "lease_expires_at = NULL, worker = NULL, updated_at = ? WHERE id = ? AND state = ? "
+                "AND worker = ? AND lease_expires_at > ?",
+                (state.value, error, duration, next_attempt_at, now, job_id, JobState.RUNNING.value, worker, now)
+            ).rowcount
+        if not updated:
+            self._log_lost_lease(job_id, worker)
+            return None
+        if state == JobState.PENDING:
+            logger.warning("Attempt %d failed, retrying in %.0fs: %s", attempts, next_attempt_at - now, error)
+        return state
+
+    def _log_lost_lease(self, job_id: int, worker: str) -> None:
+        """Report a worker updating a job whose lease it no longer holds."""
+        logger.warning("Worker %s no longer holds the lease on job %d; its update was dropped", worker, job_id)
+
+    def next_due(self, run_id: str) -> Optional[float]:
+        """Get when the next pending job becomes due, or None if nothing is pending."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM jobs WHERE run_id = ? AND state = ?",
+                (run_id, JobState.PENDING.value)
+            ).fetchone()
+        return row[0]
+
+    def counts(self, run_id: str) -> Dict[str, int]:
+        """Count jobs in each state."""
+        counts = {state.value: 0 for state in JobState}
+        with self._lock:
+            for row in self._conn.execute(
+                "SELECT state, COUNT(*) FROM jobs WHERE run_id = ? GROUP BY state", (run_id,)
+            ):
+                counts[row[0]] = row[1]
+        return counts
+
+    def results(self, run_id: str) -> List[Dict[str, Any]]:
+        """Get one batch summary entry per job, in input order."""
+        status = {JobState.DONE.value: 'success', JobState.FAILED.value: 'failed'}
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM jobs WHERE run_id = ? ORDER BY id", (run_id,)).fetchall()
+        return [{
+            'url': row['url'],
+            'prompt': row['prompt'],
+            'status': status.get(row['state'], 'skipped'),
+            'output': row['output'],
+            'error': row['error'],
+            'attempts': row['attempts'],
+            'duration': round(row['duration'] or 0.0, 3)
+        } for row in rows]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
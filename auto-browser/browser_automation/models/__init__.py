@@ -3,4 +3,18 @@
 from .config import ModelConfig, ModelProvider
 from .factory import ModelFactory
 
-__all__ = ['ModelConfig', 'ModelProvider', 'ModelFactory']
\ No newline at end of file
+__all__ = ['ModelConfig', 'ModelProvider', 'ModelFactory', 'SharedTransport', 'ConnectionStats',
+           'SQLiteLLMCache', 'LLMCacheMode', 'ProviderRateLimiter']
+
+def __getattr__(name):
+    """Import the HTTP transport (and httpx), response cache and rate limiter only when they are used."""
+    if name in ('SharedTransport', 'ConnectionStats'):
+        from . import transport
+        return getattr(transport, name)
+    if name in ('SQLiteLLMCache', 'LLMCacheMode'):
+        from . import cache
+        return getattr(cache, name)
+    if name == 'ProviderRateLimiter':
+        from . import rate_limiter
+        return rate_limiter.ProviderRateLimiter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
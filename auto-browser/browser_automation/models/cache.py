@@ -0,0 +1,226 @@
+"""SQLite-backed response cache for language models."""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCacheMode(str, Enum):
+    """How model responses use the cache."""
+    OFF = "off"
+    READWRITE = "readwrite"
+    READONLY = "readonly"
+
+
+class SQLiteLLMCache(BaseCache):
+    """Cache chat model responses in a local SQLite file.
+
+    Entries are keyed by a hash of the serialized messages and the model's
+    identifying parameters (provider class, model name, temperature, bound
+    tools, ...). Entries expire after ``ttl`` seconds and the least recently
+    used ones are evicted once the stored responses exceed ``max_bytes``.
+    """
+
+    def __init__(self, path: Path = Path("output") / ".cache" / "llm.sqlite",
+                 ttl: float = 7 * 24 * 3600, max_bytes: int = 256 * 1024 * 1024,
+                 read_only: bool = False):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database file
+            ttl: Seconds before an entry expires
+            max_bytes: Maximum total size of stored responses
+            read_only: Serve hits but never write new entries
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.read_only = read_only
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._size = self._total_size()
+
+    @classmethod
+    def from_env(cls, output_dir: str = "output") -> Optional["SQLiteLLMCache"]:
+        """Create an SQLiteLLMCache from environment variables.
+
+        Environment variables:
+            LLM_CACHE_MODE: off, readwrite or readonly
+            LLM_CACHE_PATH: SQLite file (default <output_dir>/.cache/llm.sqlite)
+            LLM_CACHE_TTL: Entry lifetime in seconds
+            LLM_CACHE_MAX_MB: Maximum size of stored responses in megabytes
+
+        Args:
+            output_dir: Output directory the cache lives under by default
+
+        Returns:
+            SQLiteLLMCache instance, or None if caching is off
+        """
+        mode = LLMCacheMode(os.getenv("LLM_CACHE_MODE", "off").lower())
+        if mode == LLMCacheMode.OFF:
+            return None
+        return cls(
+            path=Path(os.getenv("LLM_CACHE_PATH") or Path(output_dir) / ".cache" / "llm.sqlite"),
+            ttl=float(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600)),
+            max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024),
+            read_only=mode == LLMCacheMode.READONLY
+        )
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the database, creating it unless the cache is read-only."""
+        if self.read_only:
+            if not self.path.exists():
+                logger.warning("LLM cache %s does not exist; every lookup will miss", self.path)
+                return None
+            return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        # WAL lets concurrent processes read while one writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache (last_used)")
+        conn.commit()
+        return conn
+
+    def _total_size(self) -> int:
+        """Get the total size of stored responses."""
+        if self._conn is None:
+            return 0
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    @staticmethod
+    def _dumps(generations: RETURN_VAL_TYPE) -> str:
+        """Serialize generations, keeping chat messages with their tool calls and usage."""
+        return json.dumps([
+            {'message': message_to_dict(g.message)} if isinstance(g, ChatGeneration) else {'text': g.text}
+            for g in generations
+        ])
+
+    @staticmethod
+    def _loads(value: str) -> RETURN_VAL_TYPE:
+        """Deserialize generations stored by _dumps."""
+        return [
+            ChatGeneration(message=messages_from_dict([item['message']])[0]) if 'message' in item
+            else Generation(text=item['text'])
+            for item in json.loads(value)
+        ]
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        """Hash the serialized messages and model parameters."""
+        return hashlib.sha256(f"{llm_string}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Look up a cached response."""
+        if self._conn is None:
+            self.misses += 1
+            return None
+
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            if not self.read_only:
+                self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+            self.hits += 1
+
+        try:
+            return self._loads(row[0])
+        except Exception as e:
+            logger.warning("Ignoring unreadable LLM cache entry: %s", e)
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store a response."""
+        if self.read_only or self._conn is None:
+            return
+
+        value = self._dumps(return_val)
+        size = len(value.encode("utf-8"))
+        now = time.time()
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            # A replaced entry's size no longer counts towards the total
+            replaced = self._conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._conn.commit()
+            self._size += size - (replaced[0] if replaced else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones down to 90% of the limit."""
+        self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl,))
+        self._size = self._total_size()
+        target = int(self.max_bytes * 0.9)
+        if self._size > target:
+            rows = self._conn.execute("SELECT key, size FROM llm_cache ORDER BY last_used").fetchall()
+            evicted = []
+            for key, size in rows:
+                if self._size <= target:
+                    break
+                evicted.append((key,))
+                self._size -= size
+            self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", evicted)
+            logger.info("Evicted %d LLM cache entries", len(evicted))
+        self._conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove every entry."""
+        if self.read_only or self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counts and size."""
+        return {
+            'mode': LLMCacheMode.READONLY.value if self.read_only else LLMCacheMode.READWRITE.value,
+            'hits': self.hits,
+            'misses': self.misses,
+            'size_bytes': self._size
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,124 @@
+"""LangChain callbacks recording LLM calls as trace spans and health counters."""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+
+if TYPE_CHECKING:
+    from ..tracing import Tracer
+
+_handler: ContextVar[Optional["LLMTraceCallback"]] = ContextVar("auto_browser_llm_trace", default=None)
+_health: ContextVar[Optional["LLMHealthCallback"]] = ContextVar("auto_browser_llm_health", default=None)
+# Adds the handlers to every LangChain run started while the variables are set
+register_configure_hook(_handler, inheritable=True)
+register_configure_hook(_health, inheritable=True)
+
+
+class LLMTraceCallback(BaseCallbackHandler):
+    """Record latency and token usage of every chat model call."""
+
+    run_inline = True
+
+    def __init__(self, tracer: "Tracer"):
+        self.tracer = tracer
+        self._runs: Dict[UUID, Tuple[float, str]] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *,
+                            run_id: UUID, **kwargs: Any) -> None:
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or (serialized or {}).get("name", "llm")
+        self._runs[run_id] = (time.perf_counter(), str(model))
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *,
+                     run_id: UUID, **kwargs: Any) -> None:
+        self.on_chat_model_start(serialized, [], run_id=run_id, **kwargs)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        started, model = self._runs.pop(run_id, (None, "llm"))
+        if started is None:
+            return
+        self.tracer.add("llm.call", started, time.perf_counter(), "llm",
+                        {"model": model, **self._token_usage(response)})
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        started, model = self._runs.pop(run_id, (None, "llm"))
+        if started is None:
+            return
+        self.tracer.add("llm.call", started, time.perf_counter(), "llm",
+                        {"model": model, "error": repr(error)})
+
+    @staticmethod
+    def _token_usage(response: LLMResult) -> Dict[str, int]:
+        """Get input/output token counts reported by the provider."""
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    return {"input_tokens": usage.get("input_tokens", 0),
+                            "output_tokens": usage.get("output_tokens", 0)}
+
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        if usage:
+            return {"input_tokens": usage.get("prompt_tokens", 0),
+                    "output_tokens": usage.get("completion_tokens", 0)}
+        return {}
+
+
+@contextmanager
+def trace_llm_calls(tracer: "Tracer") -> Iterator[LLMTraceCallback]:
+    """Record every LLM call made in the current context on ``tracer``."""
+    token = _handler.set(LLMTraceCallback(tracer))
+    try:
+        yield _handler.get()
+    finally:
+        _handler.reset(token)
+
+
+class LLMHealthCallback(BaseCallbackHandler):
+    """Count chat model calls, errors and rate-limit (429) errors.
+
+    Agents retry failed model calls internally, so these counters see
+    provider trouble even when the job itself still succeeds.
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rate_limited = 0
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        self.calls += 1
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        from ..concurrency import is_rate_limit_error
+
+        self.calls += 1
+        self.errors += 1
+        if is_rate_limit_error(error):
+            self.rate_limited += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """Get the current counters."""
+        return {"calls": self.calls, "errors": self.errors, "rate_limited": self.rate_limited}
+
+    def delta(self, since: Dict[str, int]) -> Dict[str, int]:
+        """Get the counts added since an earlier snapshot."""
+        return {key: value - since.get(key, 0) for key, value in self.snapshot().items()}
+
+
+@contextmanager
+def track_llm_health() -> Iterator[LLMHealthCallback]:
+    """Count every LLM call made in the current context."""
+    token = _health.set(LLMHealthCallback())
+    try:
+        yield _health.get()
+    finally:
+        _health.reset(token)
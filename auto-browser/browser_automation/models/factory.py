@@ -1,47 +1,171 @@
 """Factory for creating language model instances."""
 
-from typing import Any
-from langchain_core.language_models import BaseLLM
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
 from .config import ModelConfig, ModelProvider
 
+if TYPE_CHECKING:
+    from langchain_core.language_models import BaseLLM
+    from .cache import SQLiteLLMCache
+    from .rate_limiter import ProviderRateLimiter
+    from .transport import SharedTransport
+
 class ModelFactory:
-    """Factory class for creating language model instances."""
-    
+    """Factory class for creating language model instances.
+
+    Models are kept in a process-wide registry keyed by provider, model,
+    API key and extra parameters, so repeated calls with an equivalent
+    configuration return the same client and its open connections.
+    """
+
+    _models: Dict[Tuple[str, ...], "BaseLLM"] = {}
+    _transport: Optional["SharedTransport"] = None
+    _override: Optional[Callable[[ModelConfig], "BaseLLM"]] = None
+    _cache: Optional["SQLiteLLMCache"] = None
+    _cache_loaded = False
+    _hits = 0
+    _misses = 0
+
+    @staticmethod
+    def _registry_key(config: ModelConfig) -> Tuple[str, ...]:
+        """Build the registry key for a model configuration."""
+        api_key_hash = hashlib.sha256(config.api_key.get_secret_value().encode('utf-8')).hexdigest()
+        extra_params = json.dumps(config.extra_params or {}, sort_keys=True, default=str)
+        return (config.provider.value, config.model_name, api_key_hash, extra_params)
+
+    @classmethod
+    def get_transport(cls) -> "SharedTransport":
+        """Get the shared keep-alive HTTP transport."""
+        if cls._transport is None:
+            from .transport import SharedTransport
+            cls._transport = SharedTransport.from_env()
+        return cls._transport
+
+    @classmethod
+    def get_cache(cls) -> Optional["SQLiteLLMCache"]:
+        """Get the shared response cache, or None if LLM_CACHE_MODE is off."""
+        if not cls._cache_loaded:
+            if os.getenv("LLM_CACHE_MODE", "off").lower() != "off":
+                from .cache import SQLiteLLMCache
+                cls._cache = SQLiteLLMCache.from_env()
+            cls._cache_loaded = True
+        return cls._cache
+
     @staticmethod
-    def create_model(config: ModelConfig) -> BaseLLM:
-        """Create a language model instance based on configuration.
-        
+    def get_rate_limiter(provider: ModelProvider) -> Optional["ProviderRateLimiter"]:
+        """Get a limiter for a provider from the config's rate_limits, if it has one."""
+        from ..rate_limits import get_rate_limiter
+
+        limiter = get_rate_limiter()
+        if limiter is None or limiter.policy.for_provider(provider.value) is None:
+            return None
+        from .rate_limiter import ProviderRateLimiter
+        return ProviderRateLimiter(limiter, provider.value)
+
+    @classmethod
+    def set_override(cls, factory: Optional[Callable[[ModelConfig], "BaseLLM"]]) -> None:
+        """Route every create_model call to ``factory`` instead of a provider.
+
+        Used by benchmarks and offline runs to plug in a fake chat model.
+
+        Args:
+            factory: Callable building a model for a configuration, or None
+                     to restore normal model creation
+        """
+        cls._override = factory
+
+    @classmethod
+    def create_model(cls, config: ModelConfig) -> "BaseLLM":
+        """Get a language model instance for a configuration.
+
         Args:
             config: Model configuration
-            
+
         Returns:
-            Language model instance
-            
+            Language model instance, reused if one was already created
+
         Raises:
             ValueError: If provider is not supported
             ImportError: If provider-specific dependencies are not installed
         """
+        if cls._override is not None:
+            return cls._override(config)
+
+        key = cls._registry_key(config)
+        model = cls._models.get(key)
+        if model is not None:
+            cls._hits += 1
+            return model
+
+        cls._misses += 1
+        model = cls._build_model(config)
+        cls._models[key] = model
+        return model
+
+    @classmethod
+    def _build_model(cls, config: ModelConfig) -> "BaseLLM":
+        """Create a new language model instance."""
+        params = dict(config.extra_params or {})
+        cache = cls.get_cache()
+        if cache is not None:
+            params.setdefault('cache', cache)
+        rate_limiter = cls.get_rate_limiter(config.provider)
+        if rate_limiter is not None:
+            params.setdefault('rate_limiter', rate_limiter)
+
         try:
             if config.provider == ModelProvider.OPENAI:
                 from langchain_openai import ChatOpenAI
+                transport = cls.get_transport()
                 return ChatOpenAI(
                     api_key=config.api_key.get_secret_value(),
                     model=config.model_name,
-                    **(config.extra_params or {})
+                    http_client=transport.client,
+                    http_async_client=transport.async_client,
+                    **params
                 )
-                
+
             elif config.provider == ModelProvider.GOOGLE:
+                # The Google SDK manages its own gRPC/REST channel, which
+                # stays open for as long as the registered client lives
                 from langchain_google_genai import ChatGoogleGenerativeAI
                 return ChatGoogleGenerativeAI(
                     model=config.model_name,
                     google_api_key=config.api_key.get_secret_value(),
-                    **(config.extra_params or {})
+                    **params
                 )
-                
+
             raise ValueError(f"Unsupported model provider: {config.provider}")
-            
+
         except ImportError as e:
             raise ImportError(
                 f"Failed to import dependencies for {config.provider.value} provider. "
                 f"Please install the required package: {str(e)}"
-            ) from e
\ No newline at end of file
+            ) from e
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """Get client reuse, connection reuse and response cache statistics."""
+        return {
+            'clients': len(cls._models),
+            'client_hits': cls._hits,
+            'client_misses': cls._misses,
+            'connections': cls._transport.stats.to_dict() if cls._transport else None,
+            'llm_cache': cls._cache.stats() if cls._cache else None
+        }
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop all registered clients and close the shared transport and cache."""
+        cls._models.clear()
+        if cls._transport is not None:
+            cls._transport.close()
+            cls._transport = None
+        if cls._cache is not None:
+            cls._cache.close()
+            cls._cache = None
+        cls._cache_loaded = False
+        cls._hits = 0
+        cls._misses = 0
@@ -0,0 +1,35 @@
+"""LangChain rate limiter backed by the shared token buckets."""
+
+from typing import TYPE_CHECKING
+
+from langchain_core.rate_limiters import BaseRateLimiter
+
+if TYPE_CHECKING:
+    from ..rate_limits import RateLimiter
+
+
+class ProviderRateLimiter(BaseRateLimiter):
+    """Hold chat model calls to a provider's configured rate.
+
+    Passed to chat models as ``rate_limiter``, so LangChain waits here before
+    every request that is not served from the response cache. Calls are
+    never rejected: non-blocking acquires also wait for their token.
+    """
+
+    def __init__(self, limiter: "RateLimiter", provider: str):
+        """Initialize the limiter.
+
+        Args:
+            limiter: Process-wide rate limiter
+            provider: ModelProvider value whose bucket to draw from
+        """
+        self.limiter = limiter
+        self.provider = provider
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        self.limiter.block_for_provider(self.provider)
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        await self.limiter.wait_for_provider(self.provider)
+        return True
@@ -0,0 +1,122 @@
+"""Shared keep-alive HTTP transport for language model clients."""
+
+import os
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional
+import httpx
+
+
+@dataclass
+class ConnectionStats:
+    """Counters describing how well connections are being reused."""
+    requests: int = 0
+    connections_opened: int = 0
+
+    @property
+    def connections_reused(self) -> int:
+        """Number of requests served over an already open connection."""
+        return max(0, self.requests - self.connections_opened)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {**asdict(self), 'connections_reused': self.connections_reused}
+
+
+class SharedTransport:
+    """Process-wide httpx clients with a keep-alive connection pool.
+
+    Provider SDKs that accept an httpx client are handed the same sync and
+    async clients, so TLS sessions are set up once and then reused.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 60.0, timeout: float = 120.0):
+        """Initialize the shared transport.
+
+        Args:
+            max_connections: Maximum concurrent connections
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection stays open
+            timeout: Request timeout in seconds
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = httpx.Timeout(timeout)
+        self.stats = ConnectionStats()
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def from_env(cls) -> "SharedTransport":
+        """Create a SharedTransport from environment variables.
+
+        Environment variables:
+            LLM_MAX_CONNECTIONS: Maximum concurrent connections
+            LLM_KEEPALIVE_CONNECTIONS: Idle connections kept open for reuse
+            LLM_KEEPALIVE_EXPIRY: Seconds an idle connection stays open
+
+        Returns:
+            SharedTransport instance
+        """
+        return cls(
+            max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("LLM_KEEPALIVE_CONNECTIONS", "20")),
+            keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+        )
+
+    def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """Count new connections reported by httpcore."""
+        if event_name == "connection.connect_tcp.complete":
+            self.stats.connections_opened += 1
+
+    async def _async_trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """Async variant of the httpcore trace callback."""
+        self._trace(event_name, info)
+
+    def _on_request(self, request: httpx.Request) -> None:
+        """Count a request and attach the connection tracer."""
+        self.stats.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _on_async_request(self, request: httpx.Request) -> None:
+        """Count an async request and attach the connection tracer."""
+        self.stats.requests += 1
+        request.extensions["trace"] = self._async_trace
+
+    @property
+    def client(self) -> httpx.Client:
+        """Shared synchronous client."""
+        if self._client is None:
+            self._client = httpx.Client(
+                limits=self.limits,
+                timeout=self.timeout,
+                event_hooks={"request": [self._on_request]}
+            )
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Shared asynchronous client."""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=self.timeout,
+                event_hooks={"request": [self._on_async_request]}
+            )
+        return self._async_client
+
+    def close(self) -> None:
+        """Close the synchronous client and drop the async one."""
+        if self._client is not None:
+            self._client.close()
+        self._client = None
+        self._async_client = None
+
+    async def aclose(self) -> None:
+        """Close both clients."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+        self.close()
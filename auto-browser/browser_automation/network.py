@@ -0,0 +1,127 @@
+"""Request interception for the browser context."""
+
+import logging
+from dataclasses import dataclass, field, asdict
+from fnmatch import fnmatch
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+from playwright.async_api import BrowserContext, Request, Response, Route
+from .config import NetworkPolicy
+from .rate_limits import get_rate_limiter
+
+if TYPE_CHECKING:
+    from .browser_pool import ContextHook
+    from .http_cache import HarPlan, HttpCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NetworkStats:
+    """Request counters for a single run.
+
+    ``allowed_content_length`` sums the Content-Length headers of allowed
+    responses; responses without the header are not counted. Blocked
+    requests never load, so the bytes blocking saves are not measured.
+    """
+    allowed_requests: int = 0
+    blocked_requests: int = 0
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+    allowed_content_length: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return asdict(self)
+
+
+class ResourceBlocker:
+    """Abort requests matching a network policy.
+
+    Blocked requests are aborted before any bytes are transferred, so their
+    size is unknown; stats report how many were blocked (by resource type)
+    and the declared size of allowed responses.
+    """
+
+    def __init__(self, policy: NetworkPolicy):
+        """Initialize the blocker.
+
+        Args:
+            policy: Network policy to enforce
+        """
+        self.policy = policy
+        self.stats = NetworkStats()
+        self._resource_types = set(policy.block_resource_types)
+        self._domains = [domain.lower().lstrip(".") for domain in policy.block_domains]
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """Check whether a request is blocked by the policy."""
+        if not self.policy.enabled:
+            return False
+        if resource_type in self._resource_types:
+            return True
+
+        host = (urlparse(url).hostname or "").lower()
+        if any(host == domain or host.endswith(f".{domain}") for domain in self._domains):
+            return True
+        return any(fnmatch(url, pattern) for pattern in self.policy.block_url_patterns)
+
+    async def attach(self, context: BrowserContext) -> None:
+        """Install request routing on a Playwright context.
+
+        Can be passed directly as a browser pool context hook.
+        """
+        if not self.policy.enabled:
+            return
+        await context.route("**/*", self._handle_route)
+        context.on("response", self._on_response)
+
+    async def _handle_route(self, route: Route) -> None:
+        """Abort blocked requests and pass the rest on."""
+        request: Request = route.request
+        # Never block the page itself
+        if request.resource_type != "document" and self.should_block(request.url, request.resource_type):
+            self.stats.blocked_requests += 1
+            self.stats.blocked_by_type[request.resource_type] = (
+                self.stats.blocked_by_type.get(request.resource_type, 0) + 1
+            )
+            await route.abort("blockedbyclient")
+            return
+
+        self.stats.allowed_requests += 1
+        await route.fallback()
+
+    def _on_response(self, response: Response) -> None:
+        """Add the response's declared size to the allowed byte count."""
+        try:
+            self.stats.allowed_content_length += int(response.headers.get("content-length", 0))
+        except ValueError:
+            pass
+
+
+def build_context_hooks(policy: NetworkPolicy, http_cache: "HttpCache", cache_key: str,
+                        extra_hooks: Sequence["ContextHook"] = ()) -> Tuple[List["ContextHook"], ResourceBlocker, Optional["HarPlan"]]:
+    """Build the request handling hooks for a pooled browser context.
+
+    Routes run last-registered first, so the blocker sees requests before
+    the HAR, and the shared rate limiter only delays page loads the HAR did
+    not replay. ``extra_hooks``, such as restoring a login, run after them.
+
+    Args:
+        policy: Network policy to enforce
+        http_cache: Record/replay cache for page loads
+        cache_key: Key of the HAR recording for the context
+        extra_hooks: Further hooks to run on the context
+
+    Returns:
+        Hooks for ``BrowserPool.context``, the resource blocker and the HAR plan
+    """
+    blocker = ResourceBlocker(policy)
+    har_plan = http_cache.plan(cache_key)
+
+    limiter = get_rate_limiter()
+    hooks = [limiter.attach] if limiter else []
+    if har_plan:
+        hooks.append(har_plan.attach)
+    hooks.append(blocker.attach)
+    hooks.extend(extra_hooks)
+    return hooks, blocker, har_plan
@@ -1,38 +1,161 @@
 """Report generation module for auto-browser."""
 
+import asyncio
+import json
+import logging
 import os
-from typing import Dict, Any
-from langchain_core.language_models import BaseLLM
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Dict, Any, Iterator, List, Optional, Tuple, Union
+from ..models import ModelConfig, ModelFactory
+from ..tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Rounds of summarizing summaries before the reduce step gives up shrinking
+MAX_REDUCE_ROUNDS = 3
+
+MAP_SYSTEM_PROMPT = """
+You are summarizing one part of a webpage that is too large to analyze at once.
+Extract every fact, figure, name and data row relevant to the task.
+Keep numbers, dates and identifiers exactly as written.
+Use concise markdown bullet points or tables. Do not add commentary.
+"""
+
 
 class ReportGenerator:
     """Generate structured reports from extracted content."""
 
-    def __init__(self):
-        """Initialize the report generator."""
-        self.llm_provider = os.getenv('LLM_PROVIDER')
-        self.llm_model = os.getenv('LLM_MODEL', 'gpt-4o-mini')
-        self.api_key = os.getenv('OPENAI_API_KEY')
-        self.google_api_key = os.getenv('GOOGLE_API_KEY')
-
-        if self.llm_provider == 'openai':
-            self.llm = ChatOpenAI(api_key=self.api_key, model=self.llm_model)
-        elif self.llm_provider == 'google':
-            self.llm = ChatGoogleGenerativeAI(model=self.llm_model, google_api_key=self.google_api_key)
-        else:
-            raise ValueError(f"Unsupported LLM provider: {self.llm_provider}")
-
-    def generate_report(self, content: Dict[str, Any], prompt: str) -> str:
-        """Generate a structured markdown report.
+    def __init__(self, model_config: Optional[ModelConfig] = None,
+                 max_input_tokens: Optional[int] = None, chunk_tokens: Optional[int] = None,
+                 map_concurrency: Optional[int] = None):
+        """Initialize the report generator.
 
         Args:
-            content: Extracted content from webpage
-            prompt: Original user prompt describing the task
+            model_config: Optional model configuration. If not provided,
+                        will be loaded from environment variables.
+            max_input_tokens: Content size above which it is summarized in
+                              chunks first (REPORT_MAX_INPUT_TOKENS)
+            chunk_tokens: Target size of each chunk (REPORT_CHUNK_TOKENS)
+            map_concurrency: Chunks summarized at once (REPORT_MAP_CONCURRENCY)
+        """
+        self.model_config = model_config or ModelConfig.from_env()
+        self.llm = ModelFactory.create_model(self.model_config)
+        self.max_input_tokens = max_input_tokens or int(os.getenv("REPORT_MAX_INPUT_TOKENS", "12000"))
+        self.chunk_tokens = chunk_tokens or int(os.getenv("REPORT_CHUNK_TOKENS", "4000"))
+        self.map_concurrency = map_concurrency or int(os.getenv("REPORT_MAP_CONCURRENCY", "4"))
 
-        Returns:
-            Structured markdown report
+    def split_text(self, text: str) -> List[str]:
+        """Split text into chunks of about ``chunk_tokens`` tokens on line boundaries."""
+        chunks, current, current_tokens = [], [], 0
+        for line in text.splitlines():
+            line_tokens = count_tokens(line) + 1
+            if line_tokens > self.chunk_tokens:
+                # Hard-split lines that do not fit in a chunk on their own
+                step = max(1, len(line) * self.chunk_tokens // line_tokens)
+                pieces = [line[i:i + step] for i in range(0, len(line), step)]
+            else:
+                pieces = [line]
+
+            for piece in pieces:
+                piece_tokens = line_tokens if len(pieces) == 1 else count_tokens(piece) + 1
+                if current and current_tokens + piece_tokens > self.chunk_tokens:
+                    chunks.append("\n".join(current))
+                    current, current_tokens = [], 0
+                current.append(piece)
+                current_tokens += piece_tokens
+
+        if current:
+            chunks.append("\n".join(current))
+        return chunks
+
+    @staticmethod
+    def _serialize_content(content: Union[Dict[str, Any], str]) -> str:
+        """Serialize content one field per line so it can be split."""
+        if isinstance(content, str):
+            return content
+        return json.dumps(content, indent=2, ensure_ascii=False, default=str)
+
+    def _build_map_messages(self, chunk: str, prompt: str, index: int, total: int) -> List[Dict[str, str]]:
+        """Build the chat messages summarizing one chunk."""
+        user_prompt = f"""
+        Original Task: {prompt}
+
+        Part {index + 1} of {total}:
+        {chunk}
         """
+        return [
+            {"role": "system", "content": MAP_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    @staticmethod
+    def _join_summaries(summaries: List[str]) -> str:
+        """Combine chunk summaries into the content for the next step."""
+        return "\n\n".join(f"### Part {i + 1}\n{summary}" for i, summary in enumerate(summaries))
+
+    def _log_chunk(self, index: int, total: int, input_tokens: int, response: Any, started: float) -> None:
+        """Log token usage and latency for one summarized chunk."""
+        usage = getattr(response, 'usage_metadata', None) or {}
+        output_tokens = usage.get('output_tokens', count_tokens(self._chunk_text(response)))
+        logger.info(
+            "Report chunk %d/%d: %d input tokens, %d output tokens, %.2fs",
+            index + 1, total, usage.get('input_tokens', input_tokens), output_tokens,
+            time.perf_counter() - started
+        )
+
+    async def _asummarize_chunk(self, chunk: str, prompt: str, index: int, total: int,
+                                semaphore: asyncio.Semaphore) -> str:
+        """Summarize one chunk of oversized content."""
+        async with semaphore:
+            started = time.perf_counter()
+            response = await self.llm.ainvoke(self._build_map_messages(chunk, prompt, index, total))
+        self._log_chunk(index, total, count_tokens(chunk), response, started)
+        return self._chunk_text(response)
+
+    def _fits(self, content: Union[Dict[str, Any], str]) -> bool:
+        """Check whether content fits into a single report request."""
+        tokens = count_tokens(f"{content}")
+        logger.debug("Report content is %d tokens (limit %d)", tokens, self.max_input_tokens)
+        return tokens <= self.max_input_tokens
+
+    def _truncate(self, text: str) -> str:
+        """Cut text down to about ``max_input_tokens`` tokens on line boundaries."""
+        kept, tokens = [], 0
+        for line in text.splitlines():
+            line_tokens = count_tokens(line) + 1
+            if tokens + line_tokens > self.max_input_tokens:
+                break
+            kept.append(line)
+            tokens += line_tokens
+        return "\n".join(kept)
+
+    async def _aprepare_messages(self, content: Dict[str, Any], prompt: str) -> List[Dict[str, str]]:
+        """Build report messages, map-reducing content that is too large."""
+        reduced: Union[Dict[str, Any], str] = content
+        for _ in range(MAX_REDUCE_ROUNDS):
+            if self._fits(reduced):
+                break
+            chunks = self.split_text(self._serialize_content(reduced))
+            semaphore = asyncio.Semaphore(self.map_concurrency)
+            summaries = await asyncio.gather(*(
+                self._asummarize_chunk(chunk, prompt, i, len(chunks), semaphore)
+                for i, chunk in enumerate(chunks)
+            ))
+            reduced = self._join_summaries(summaries)
+        else:
+            if not self._fits(reduced):
+                logger.warning(
+                    "Report content still exceeds %d tokens after %d reduce rounds; truncating it",
+                    self.max_input_tokens, MAX_REDUCE_ROUNDS
+                )
+                reduced = self._truncate(self._serialize_content(reduced))
+        return self._build_messages(reduced, prompt)
+
+    def _build_messages(self, content: Union[Dict[str, Any], str], prompt: str) -> List[Dict[str, str]]:
+        """Build the chat messages for a report request."""
         system_prompt = """
         You are a report generator that creates well-structured markdown reports.
         Create a comprehensive report based on the provided content and original task prompt.
@@ -75,14 +198,115 @@ class ReportGenerator:
         Generate a structured report focusing on the task objectives.
         """
 
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ]
 
+    def generate_report(self, content: Dict[str, Any], prompt: str) -> str:
+        """Generate a structured markdown report.
+
+        Args:
+            content: Extracted content from webpage
+            prompt: Original user prompt describing the task
+
+        Returns:
+            Structured markdown report
+        """
+        # Chunk summaries run concurrently on a private event loop
+        messages = asyncio.run(self._aprepare_messages(content, prompt))
         response = self.llm.invoke(messages)
         return response.content
 
+    async def agenerate_report(self, content: Dict[str, Any], prompt: str,
+                               output_path: Optional[Path] = None) -> str:
+        """Generate a report without blocking the event loop.
+
+        Tokens are streamed into a temporary file next to ``output_path`` as
+        they arrive, unless the model has a response cache, which streaming
+        would bypass. The file replaces ``output_path`` once the report is
+        complete, so a failed run never leaves a partial report. Content
+        larger than ``max_input_tokens`` is first summarized in chunks
+        concurrently and the report is written from the summaries.
+
+        Args:
+            content: Extracted content from webpage
+            prompt: Original user prompt describing the task
+            output_path: Optional file to stream the report into
+
+        Returns:
+            Structured markdown report
+        """
+        messages = await self._aprepare_messages(content, prompt)
+        parts = []
+
+        if getattr(self.llm, 'cache', None) is not None:
+            # Streaming bypasses the response cache, so cached models are invoked whole
+            report = self._chunk_text(await self.llm.ainvoke(messages))
+            if output_path is not None:
+                with self._open_output(output_path) as f:
+                    f.write(report)
+            return report
+
+        if output_path is None:
+            async for chunk in self.llm.astream(messages):
+                parts.append(self._chunk_text(chunk))
+            return "".join(parts)
+
+        with self._open_output(output_path) as f:
+            async for chunk in self.llm.astream(messages):
+                text = self._chunk_text(chunk)
+                parts.append(text)
+                f.write(text)
+                f.flush()
+        return "".join(parts)
+
+    @staticmethod
+    @contextmanager
+    def _open_output(output_path: Path) -> Iterator[IO[str]]:
+        """Open a temporary file that replaces ``output_path`` only if writing succeeds."""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=output_path.parent, prefix=f".{output_path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                yield f
+            os.replace(tmp_name, output_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    async def agenerate_reports(self, jobs: List[Tuple[Dict[str, Any], str, Optional[Path]]],
+                                concurrency: int = 4) -> List[str]:
+        """Generate reports for many extraction results concurrently.
+
+        Args:
+            jobs: (content, prompt, output_path) tuples
+            concurrency: Maximum number of reports generated at once
+
+        Returns:
+            Reports in the same order as ``jobs``
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(content: Dict[str, Any], prompt: str, output_path: Optional[Path]) -> str:
+            async with semaphore:
+                return await self.agenerate_report(content, prompt, output_path)
+
+        return await asyncio.gather(*(run(*job) for job in jobs))
+
+    @staticmethod
+    def _chunk_text(chunk: Any) -> str:
+        """Get the text of a streamed message chunk."""
+        content = chunk.content
+        if isinstance(content, str):
+            return content
+        # Some providers stream a list of content parts
+        return "".join(
+            part if isinstance(part, str) else part.get('text', '')
+            for part in content
+        )
+
     def format_data_table(self, data: Dict[str, Any]) -> str:
         """Format data as a markdown table.
 
@@ -0,0 +1,194 @@
+"""Token bucket rate limits shared across auto-browser processes."""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import urlparse
+
+from .config import RateLimit, RateLimitPolicy
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Route
+
+logger = logging.getLogger(__name__)
+
+# Waits shorter than this are not worth logging
+LOG_WAIT_THRESHOLD = 1.0
+
+
+class TokenBucketStore:
+    """Token buckets kept in an SQLite file so every process draws from the same ones.
+
+    Each call reserves a token, letting the bucket go negative. The caller
+    then waits until its token would have been refilled, so waiters are
+    served in arrival order at the sustained rate instead of racing.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize the store.
+
+        Args:
+            path: SQLite file shared by all processes
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS buckets (
+                key TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+
+    def reserve(self, key: str, limit: RateLimit) -> float:
+        """Take one token from a bucket.
+
+        Returns:
+            Seconds the caller must wait before using its token
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute("SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)).fetchone()
+                tokens = limit.burst if row is None else min(limit.burst, row[0] + (now - row[1]) * limit.rate)
+                tokens -= 1
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                    (key, tokens, now)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return max(0.0, -tokens / limit.rate)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class RateLimiter:
+    """Apply a RateLimitPolicy to page loads and model calls.
+
+    Callers wait in the event loop (or thread, for sync model calls) until
+    their request fits the limit; nothing is rejected.
+    """
+
+    def __init__(self, policy: RateLimitPolicy, output_dir: str = "output"):
+        """Initialize the limiter.
+
+        Args:
+            policy: Limits per domain and per model provider
+            output_dir: Output directory the shared state lives under by default
+        """
+        self.policy = policy
+        self.state_path = Path(policy.state_path or Path(output_dir) / ".cache" / "rate_limits.sqlite")
+        self.waited = 0.0
+        self._store: Optional[TokenBucketStore] = None
+
+    @property
+    def store(self) -> TokenBucketStore:
+        """Open the shared state file on first use."""
+        if self._store is None:
+            self._store = TokenBucketStore(self.state_path)
+        return self._store
+
+    def _reserve(self, key: str, limit: RateLimit) -> float:
+        return self._record_wait(key, self.store.reserve(key, limit))
+
+    async def _areserve(self, key: str, limit: RateLimit) -> float:
+        """Reserve a token in a worker thread.
+
+        The SQLite write can wait on other processes' locks for seconds, so it
+        must never run on the event loop.
+        """
+        store = self.store
+        return self._record_wait(key, await asyncio.to_thread(store.reserve, key, limit))
+
+    def _record_wait(self, key: str, wait: float) -> float:
+        self.waited += wait
+        if wait >= LOG_WAIT_THRESHOLD:
+            logger.info("Rate limit %s: waiting %.1fs", key, wait)
+        return wait
+
+    async def wait_for_host(self, host: str) -> None:
+        """Wait until a request to ``host`` is within its domain limit."""
+        rule = self.policy.for_host(host)
+        if rule:
+            wait = await self._areserve(*rule)
+            if wait:
+                await asyncio.sleep(wait)
+
+    async def wait_for_url(self, url: str) -> None:
+        """Wait until a request to ``url`` is within its domain limit."""
+        await self.wait_for_host(urlparse(url).hostname or "")
+
+    async def wait_for_provider(self, provider: str) -> None:
+        """Wait until a call to a model provider is within its limit."""
+        rule = self.policy.for_provider(provider)
+        if rule:
+            wait = await self._areserve(*rule)
+            if wait:
+                await asyncio.sleep(wait)
+
+    def block_for_provider(self, provider: str) -> None:
+        """Blocking variant of wait_for_provider for synchronous model calls."""
+        rule = self.policy.for_provider(provider)
+        if rule:
+            wait = self._reserve(*rule)
+            if wait:
+                time.sleep(wait)
+
+    async def attach(self, context: "BrowserContext") -> None:
+        """Throttle page and frame loads on a Playwright context.
+
+        Can be passed directly as a browser pool context hook. Only document
+        requests count against a domain's limit; subresources follow the
+        page they belong to.
+        """
+        if self.policy.enabled and self.policy.domains:
+            await context.route("**/*", self._handle_route)
+
+    async def _handle_route(self, route: "Route") -> None:
+        """Delay document requests until their domain has capacity."""
+        if route.request.resource_type == "document":
+            await self.wait_for_url(route.request.url)
+        await route.fallback()
+
+    def close(self) -> None:
+        """Close the shared state file."""
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+
+_limiter: Optional[RateLimiter] = None
+
+
+def configure_rate_limits(policy: Optional[RateLimitPolicy], output_dir: str = "output") -> Optional[RateLimiter]:
+    """Set the process-wide rate limiter from a config's rate_limits section.
+
+    Returns:
+        The limiter, or None if the policy has no limits
+    """
+    global _limiter
+    if _limiter is not None:
+        _limiter.close()
+        _limiter = None
+    if policy and policy.enabled and (policy.domains or policy.providers):
+        _limiter = RateLimiter(policy, output_dir)
+    return _limiter
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Get the process-wide rate limiter, if one is configured."""
+    return _limiter
@@ -0,0 +1,158 @@
+"""On-disk cache for AI-generated site templates."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse, parse_qsl
+from .template_generator import Template
+
+logger = logging.getLogger(__name__)
+
+# Path segments that look like identifiers rather than fixed routes
+_VARIABLE_SEGMENT = re.compile(r"\d|^[0-9a-f]{16,}$|^[0-9a-f-]{32,36}$", re.IGNORECASE)
+
+
+class TemplateCache:
+    """Cache generated templates keyed by URL pattern and prompt.
+
+    Each entry is a JSON file in ``cache_dir``. Entries expire after
+    ``ttl`` seconds and the least recently used entries are evicted once
+    more than ``max_entries`` are stored.
+    """
+
+    def __init__(self, cache_dir: Path = Path("output") / ".cache" / "templates",
+                 ttl: float = 7 * 24 * 3600, max_entries: int = 500):
+        """Initialize the template cache.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            ttl: Seconds before an entry expires
+            max_entries: Maximum number of entries kept on disk
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    @classmethod
+    def from_env(cls, output_dir: str = "output") -> "TemplateCache":
+        """Create a TemplateCache from environment variables.
+
+        Environment variables:
+            TEMPLATE_CACHE_TTL: Entry lifetime in seconds
+            TEMPLATE_CACHE_MAX_ENTRIES: Maximum number of cached templates
+
+        Args:
+            output_dir: Output directory the cache lives under
+
+        Returns:
+            TemplateCache instance
+        """
+        return cls(
+            cache_dir=Path(output_dir) / ".cache" / "templates",
+            ttl=float(os.getenv("TEMPLATE_CACHE_TTL", 7 * 24 * 3600)),
+            max_entries=int(os.getenv("TEMPLATE_CACHE_MAX_ENTRIES", 500))
+        )
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """Reduce a URL to the pattern shared by pages with the same layout.
+
+        Identifier-like path segments and query values are replaced with
+        placeholders so that e.g. two article pages map to the same key.
+        """
+        parsed = urlparse(url.strip())
+        host = parsed.netloc.lower()
+        if host.startswith("www."):
+            host = host[4:]
+
+        segments = [
+            "{}" if _VARIABLE_SEGMENT.search(segment) else segment.lower()
+            for segment in parsed.path.split("/") if segment
+        ]
+        pattern = f"{parsed.scheme.lower() or 'https'}://{host}/" + "/".join(segments)
+
+        query_keys = sorted({key for key, _ in parse_qsl(parsed.query, keep_blank_values=True)})
+        if query_keys:
+            pattern += "?" + "&".join(f"{key}={{}}" for key in query_keys)
+        return pattern
+
+    def _entry_path(self, url: str, prompt: str) -> Path:
+        """Get the cache file for a URL and prompt."""
+        key = f"{self.normalize_url(url)}\n{' '.join(prompt.split()).lower()}"
+        return self.cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, url: str, prompt: str) -> Optional[Template]:
+        """Look up a cached template.
+
+        Args:
+            url: URL the template is for
+            prompt: Prompt the template was generated with
+
+        Returns:
+            Cached template, or None on a miss or expired entry
+        """
+        path = self._entry_path(url, prompt)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("created_at", 0) > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+
+        # Bump the access time used for LRU eviction
+        os.utime(path)
+        logger.info("Using cached template for %s", entry.get("url_pattern"))
+        return Template.from_dict(entry["template"])
+
+    def put(self, url: str, prompt: str, template: Template) -> None:
+        """Store a template and evict old entries if needed.
+
+        Args:
+            url: URL the template is for
+            prompt: Prompt the template was generated with
+            template: Template to cache
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(url, prompt)
+        entry = {
+            "url_pattern": self.normalize_url(url),
+            "prompt": prompt,
+            "created_at": time.time(),
+            "template": template.to_dict()
+        }
+        # A temp file per writer, so concurrent jobs caching the same template never share one
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=f"{path.stem}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+                tmp.write(json.dumps(entry, indent=2))
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries beyond ``max_entries``."""
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                # Evicted or expired by a concurrent job since the listing
+                continue
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove all cached templates."""
+        for path in self.cache_dir.glob("*.json"):
+            path.unlink(missing_ok=True)
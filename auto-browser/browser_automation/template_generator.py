@@ -1,14 +1,20 @@
 """Template generator for auto-browser."""
 
 import asyncio
+import json
 import os
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional
 import yaml
-from browser_use import Agent
-from browser_use.browser.browser import Browser, BrowserConfig
 from .models import ModelConfig, ModelFactory
+from .tracing import span, trace_agent
+
+if TYPE_CHECKING:
+    from .browser_pool import BrowserPool
+    from .config import NetworkPolicy
+    from .http_cache import HttpCache
 
 @dataclass
 class Selector:
@@ -25,17 +31,50 @@ class Template:
     url_pattern: str
     selectors: Dict[str, Selector]
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert template to dictionary for JSON serialization."""
+        return {
+            'name': self.name,
+            'description': self.description,
+            'url_pattern': self.url_pattern,
+            'selectors': {name: asdict(sel) for name, sel in self.selectors.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Template":
+        """Create a template from its dictionary form."""
+        return cls(
+            name=data['name'],
+            description=data['description'],
+            url_pattern=data['url_pattern'],
+            selectors={name: Selector(**sel) for name, sel in data.get('selectors', {}).items()}
+        )
+
 class TemplateGenerator:
     """Generate site templates by analyzing webpages."""
     
-    def __init__(self, model_config: Optional[ModelConfig] = None):
+    def __init__(self, model_config: Optional[ModelConfig] = None,
+                 browser_pool: Optional["BrowserPool"] = None,
+                 network_policy: Optional["NetworkPolicy"] = None,
+                 http_cache: Optional["HttpCache"] = None):
         """Initialize template generator.
         
         Args:
             model_config: Optional model configuration. If not provided,
                         will be loaded from environment variables.
+            browser_pool: Optional browser pool. Defaults to the shared pool.
+            network_policy: Optional request blocking policy. Defaults to
+                          the built-in policy.
+            http_cache: Optional record/replay cache for page loads
         """
+        from .browser_pool import get_browser_pool
+        from .config import NetworkPolicy
+        from .http_cache import HttpCache
+
         self.model_config = model_config or ModelConfig.from_env()
+        self.browser_pool = browser_pool or get_browser_pool()
+        self.network_policy = network_policy or NetworkPolicy.default()
+        self.http_cache = http_cache or HttpCache()
     
     async def create_template(self, url: str, name: str, description: str) -> Template:
         """Create a template by analyzing a webpage.
@@ -48,9 +87,12 @@ class TemplateGenerator:
         Returns:
             Generated template
         """
-        browser = Browser(config=BrowserConfig(headless=True))
-        
-        try:
+        from browser_use import Agent
+        from .network import build_context_hooks
+
+        hooks, _, _ = build_context_hooks(self.network_policy, self.http_cache, url)
+
+        async with self.browser_pool.context(hooks=hooks) as browser_context:
             # Create task for analyzing the page
             task = f"""
             1. Navigate to '{url}'
@@ -58,23 +100,24 @@ class TemplateGenerator:
                - Main content sections
                - Interactive elements (forms, buttons)
                - Important data elements
-            3. Return a list of CSS selectors for extracting content
+            3. Return a JSON object mapping descriptive field names to selectors, e.g.
+               {{"title": {{"css": "h1", "description": "Page title", "multiple": false}}}}
             """
             
             # Create and run agent with configured model
             agent = Agent(
                 task=task,
                 llm=ModelFactory.create_model(self.model_config),
-                browser=browser,
+                browser_context=browser_context,
                 use_vision=True
             )
             
             # Get analysis result
-            result = await agent.run()
+            with span('agent.template', category='agent'):
+                result = await trace_agent(agent, 'agent.template').run()
             
             # Create selectors from analysis
-            # selectors = self._create_selectors(result)
-            selectors = result
+            selectors = self._parse_selectors(result.final_result() or "")
 
             return Template(
                 name=name,
@@ -82,55 +125,29 @@ class TemplateGenerator:
                 url_pattern=url,
                 selectors=selectors
             )
-            
-        finally:
-            await browser.close()
     
-    def _create_selectors(self, analysis: str) -> Dict[str, Selector]:
-        """Create selectors from analysis result."""
+    def _parse_selectors(self, analysis: str) -> Dict[str, Selector]:
+        """Parse the agent's JSON selector mapping into Selector objects."""
+        match = re.search(r"\{.*\}", analysis, re.DOTALL)
+        if not match:
+            return {}
+        try:
+            data = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return {}
+
         selectors = {}
-        
-        # Common selectors for finance data
-        selectors.update({
-            'stock_price': Selector(
-                css='.YMlKec.fxKbKc',
-                description='Current stock price',
-                multiple=False
-            ),
-            'price_change': Selector(
-                css='.P2Luy.Ez2Ioe',
-                description='Price change',
-                multiple=False
-            ),
-            'company_name': Selector(
-                css='.zzDege',
-                description='Company name',
-                multiple=False
-            ),
-            'market_cap': Selector(
-                css='[data-metric="MARKET_CAP"] .P6K39c',
-                description='Market capitalization',
-                multiple=False
-            ),
-            'volume': Selector(
-                css='[data-metric="VOLUME"] .P6K39c',
-                description='Trading volume',
-                multiple=False
-            ),
-            'news_items': Selector(
-                css='.yY3Lee',
-                description='News articles',
-                multiple=True
-            ),
-            'search_input': Selector(
-                css='.Ax4B8.ZAGvjd',
-                description='Search input field',
-                multiple=False
-            )
-        })
-        
+        for name, value in data.items():
+            if isinstance(value, str):
+                selectors[name] = Selector(css=value)
+            elif isinstance(value, dict) and value.get('css'):
+                selectors[name] = Selector(
+                    css=value['css'],
+                    description=value.get('description'),
+                    multiple=bool(value.get('multiple', False))
+                )
         return selectors
-    
+
     def save_template(self, template: Template, output_path: str = 'config.yaml') -> None:
         """Save template to a file.
         
@@ -0,0 +1,30 @@
+"""Token counting shared by the report and DOM pruning stages."""
+
+import logging
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Get the tiktoken encoding, or None if it is unavailable offline."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.debug("tiktoken unavailable, estimating tokens from length: %s", e)
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens in text.
+
+    Uses the cl100k encoding when tiktoken is available and otherwise
+    estimates four characters per token. Exact counts differ per model, but
+    this is only used for budgeting and reporting.
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
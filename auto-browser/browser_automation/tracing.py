@@ -0,0 +1,167 @@
+"""Lightweight timing spans with Chrome trace output."""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_tracer: ContextVar[Optional["Tracer"]] = ContextVar("auto_browser_tracer", default=None)
+# (tracer, track id, owning task) for the innermost span's track
+_track: ContextVar[Optional[Tuple["Tracer", int, int]]] = ContextVar("auto_browser_trace_track", default=None)
+
+
+def _current_task_key() -> int:
+    """Identify the running asyncio task, or the thread outside of one."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else threading.get_ident()
+
+
+class Tracer:
+    """Collect spans for one run and export them as a Chrome trace.
+
+    Spans from different asyncio tasks are placed on separate tracks, so
+    concurrent batch jobs show up side by side in chrome://tracing or
+    Perfetto.
+    """
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._tracks = 0
+        self._lock = threading.Lock()
+
+    def enter_track(self) -> int:
+        """Get the track for a span starting in the current asyncio task.
+
+        Tasks inherit their parent's track, but the first span a new task
+        opens claims a fresh track so concurrent jobs do not overlap.
+        """
+        owner = _current_task_key()
+        current = _track.get()
+        if current is None or current[0] is not self or current[2] != owner:
+            with self._lock:
+                self._tracks += 1
+                current = (self, self._tracks, owner)
+            _track.set(current)
+        return current[1]
+
+    def _inherited_track(self) -> int:
+        """Get the track of the enclosing span without claiming a new one."""
+        current = _track.get()
+        if current is not None and current[0] is self:
+            return current[1]
+        return self.enter_track()
+
+    def add(self, name: str, start: float, end: float, category: str = "phase",
+            args: Optional[Dict[str, Any]] = None, track: Optional[int] = None) -> None:
+        """Record a finished span.
+
+        Args:
+            name: Span name
+            start: Start time from time.perf_counter()
+            end: End time from time.perf_counter()
+            category: Span category, e.g. phase, agent or llm
+            args: Extra values shown with the span
+            track: Track to place the span on. Defaults to the enclosing span's.
+        """
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round((start - self._origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": self._pid,
+            "tid": track if track is not None else self._inherited_track(),
+            "args": args or {}
+        }
+        with self._lock:
+            self.events.append(event)
+
+    @contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        """Make this the tracer for spans and LLM calls in the current context."""
+        from .models.callbacks import trace_llm_calls
+
+        token = _tracer.set(self)
+        try:
+            with trace_llm_calls(self):
+                yield self
+        finally:
+            _tracer.reset(token)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Total seconds and count per span name."""
+        totals: Dict[str, Dict[str, float]] = {}
+        for event in self.events:
+            entry = totals.setdefault(event["name"], {"count": 0, "seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += event["dur"] / 1e6
+        return {name: {"count": v["count"], "seconds": round(v["seconds"], 3)} for name, v in totals.items()}
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Build a Chrome trace event document."""
+        return {"traceEvents": sorted(self.events, key=lambda e: e["ts"]), "displayTimeUnit": "ms"}
+
+    def save(self, path: Path) -> Path:
+        """Write the Chrome trace JSON to ``path``."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+        logger.info("Wrote trace with %d spans to %s", len(self.events), path)
+        return path
+
+
+def current_tracer() -> Optional[Tracer]:
+    """Get the active tracer, if profiling is enabled."""
+    return _tracer.get()
+
+
+@contextmanager
+def span(name: str, category: str = "phase", timings: Optional[Dict[str, float]] = None,
+         **args: Any) -> Iterator[Dict[str, Any]]:
+    """Time a block of code.
+
+    The duration is stored in ``timings[name]`` when a dict is given, and
+    recorded as a span when a tracer is active. Values added to the yielded
+    dict are attached to the span.
+    """
+    tracer = _tracer.get()
+    track = tracer.enter_track() if tracer is not None else None
+    started = time.perf_counter()
+    try:
+        yield args
+    finally:
+        ended = time.perf_counter()
+        if timings is not None:
+            timings[name] = ended - started
+        if tracer is not None:
+            tracer.add(name, started, ended, category, args, track=track)
+
+
+def trace_agent(agent: Any, name: str) -> Any:
+    """Record a span for every step a browser_use agent takes."""
+    if _tracer.get() is None:
+        return agent
+
+    # Re-wrapping a reused agent replaces its previous span name
+    step = getattr(agent, '_untraced_step', agent.step)
+    agent._untraced_step = step
+
+    async def traced_step(*args: Any, **kwargs: Any) -> Any:
+        with span(f"{name}.step", category="agent", step=agent.n_steps):
+            return await step(*args, **kwargs)
+
+    agent.step = traced_step
+    return agent
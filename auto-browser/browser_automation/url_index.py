@@ -0,0 +1,198 @@
+"""Resolve URLs to site templates by their url_pattern."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+_PLACEHOLDER = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+@dataclass(frozen=True)
+class UrlMatch:
+    """A site template matched to a URL.
+
+    Attributes:
+        name: Site template name
+        pattern: The template's url_pattern
+        params: Placeholder values taken from the URL
+    """
+    name: str
+    pattern: str
+    params: Dict[str, str]
+
+
+@dataclass
+class _Entry:
+    """A pattern ending at a trie node."""
+    name: str
+    pattern: str
+    # Placeholder names for the values captured along the path, in order
+    path_params: List[str]
+    # (key, compiled value matcher, placeholder names) per query parameter
+    query: List[Tuple[str, "_Segment", List[str]]]
+    # Higher is more specific: literal segments, then literal characters
+    score: Tuple[int, int]
+
+
+@dataclass
+class _Segment:
+    """Matcher for one URL segment: a literal, a single placeholder, or a regex."""
+    literal: Optional[str] = None
+    regex: Optional[re.Pattern] = None
+    names: List[str] = field(default_factory=list)
+
+    @classmethod
+    def compile(cls, text: str) -> "_Segment":
+        names = _PLACEHOLDER.findall(text)
+        if not names:
+            return cls(literal=text)
+        if _PLACEHOLDER.fullmatch(text):
+            return cls(names=names)
+        parts = _PLACEHOLDER.split(text)
+        # split() alternates literal text and placeholder names
+        source = "".join(re.escape(part) if i % 2 == 0 else "(.+?)" for i, part in enumerate(parts))
+        return cls(regex=re.compile(source), names=names)
+
+    @property
+    def key(self) -> str:
+        """Edge key shared by segments with the same shape."""
+        return self.regex.pattern if self.regex is not None else ""
+
+    def match(self, value: str) -> Optional[List[str]]:
+        """Get the captured placeholder values, or None if the segment does not match."""
+        if self.literal is not None:
+            return [] if value == self.literal else None
+        if self.regex is None:
+            return [value] if value else None
+        found = self.regex.fullmatch(value)
+        return list(found.groups()) if found else None
+
+
+class _Node:
+    __slots__ = ("literal", "regex", "wildcard", "entries")
+
+    def __init__(self):
+        self.literal: Dict[str, "_Node"] = {}
+        self.regex: Dict[str, Tuple[_Segment, "_Node"]] = {}
+        self.wildcard: Optional["_Node"] = None
+        self.entries: List[_Entry] = []
+
+
+def _split_url(url: str) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Split a URL into host and path segments, plus its query parameters.
+
+    The scheme, a leading "www." and empty segments are ignored, so
+    http/https and trailing-slash variants resolve alike.
+    """
+    parts = urlsplit(url if "://" in url else f"//{url}")
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    segments = [host] + [unquote(segment) for segment in parts.path.split("/") if segment]
+    return segments, parse_qs(parts.query, keep_blank_values=True)
+
+
+class UrlPatternIndex:
+    """Trie of ``{placeholder}`` URL patterns.
+
+    Each host or path segment is one trie level. Literal segments are dict
+    lookups, a segment that is a single placeholder matches any value, and
+    mixed segments like ``item-{id}.html`` are matched by a small regex. A
+    lookup walks the URL once, preferring literal over regex over wildcard
+    edges, so its cost depends on the URL's length rather than on how many
+    templates are indexed (only mixed segments under the same parent are
+    tried one by one).
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, str]] = ()):
+        """Build the index.
+
+        Args:
+            patterns: (site name, url_pattern) pairs
+        """
+        self._root = _Node()
+        self.size = 0
+        for name, pattern in patterns:
+            self.add(name, pattern)
+
+    def add(self, name: str, pattern: str) -> None:
+        """Index a site template's url_pattern."""
+        segments, query = _split_url(pattern.strip())
+        node = self._root
+        path_params: List[str] = []
+        literal_segments = literal_chars = 0
+
+        for text in segments:
+            segment = _Segment.compile(text)
+            path_params.extend(segment.names)
+            if segment.literal is not None:
+                literal_segments += 1
+                literal_chars += len(segment.literal)
+                node = node.literal.setdefault(segment.literal, _Node())
+            elif segment.regex is not None:
+                literal_chars += len(_PLACEHOLDER.sub("", text))
+                node = node.regex.setdefault(segment.key, (segment, _Node()))[1]
+            else:
+                if node.wildcard is None:
+                    node.wildcard = _Node()
+                node = node.wildcard
+
+        query_spec = []
+        for key, values in query.items():
+            matcher = _Segment.compile(values[0])
+            if matcher.literal is not None:
+                literal_segments += 1
+            query_spec.append((key, matcher, matcher.names))
+
+        node.entries.append(_Entry(name, pattern, path_params, query_spec, (literal_segments, literal_chars)))
+        node.entries.sort(key=lambda entry: entry.score, reverse=True)
+        self.size += 1
+
+    def match(self, url: str) -> Optional[UrlMatch]:
+        """Find the most specific template whose pattern matches a URL.
+
+        Returns:
+            The matching template and its placeholder values, or None
+        """
+        segments, query = _split_url(url.strip())
+        return self._walk(self._root, segments, 0, [], query)
+
+    def _walk(self, node: _Node, segments: List[str], index: int, captured: List[str],
+              query: Dict[str, List[str]]) -> Optional[UrlMatch]:
+        if index == len(segments):
+            for entry in node.entries:
+                params = self._match_query(entry, query)
+                if params is not None:
+                    params.update(zip(entry.path_params, captured))
+                    return UrlMatch(name=entry.name, pattern=entry.pattern, params=params)
+            return None
+
+        value = segments[index]
+        child = node.literal.get(value)
+        if child is not None:
+            found = self._walk(child, segments, index + 1, captured, query)
+            if found:
+                return found
+        for segment, child in node.regex.values():
+            groups = segment.match(value)
+            if groups is not None:
+                found = self._walk(child, segments, index + 1, captured + groups, query)
+                if found:
+                    return found
+        if node.wildcard is not None:
+            return self._walk(node.wildcard, segments, index + 1, captured + [value], query)
+        return None
+
+    @staticmethod
+    def _match_query(entry: _Entry, query: Dict[str, List[str]]) -> Optional[Dict[str, str]]:
+        """Check an entry's query parameters, returning their placeholder values."""
+        params: Dict[str, str] = {}
+        for key, matcher, names in entry.query:
+            if key not in query:
+                return None
+            groups = matcher.match(query[key][0])
+            if groups is None:
+                return None
+            params.update(zip(names, groups))
+        return params
@@ -0,0 +1,185 @@
+"""Shared fakes for tests that drive BrowserAutomation without Chromium."""
+
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+import pytest
+from browser_use.browser.views import BrowserState
+from browser_use.dom.views import DOMElementNode, DOMTextNode
+
+from browser_automation import browser as browser_module
+from browser_automation.dom_pruning import XPATH_SCRIPT
+from browser_automation.extractor import EXTRACT_SCRIPT
+from browser_automation.http_cache import HttpCache
+
+
+def element(tag, xpath, children=(), highlight_index=None):
+    """Build a DOM element node with its children linked."""
+    node = DOMElementNode(
+        is_visible=True, parent=None, tag_name=tag, xpath=xpath, attributes={}, children=[],
+        is_interactive=highlight_index is not None, is_top_element=True, shadow_root=False,
+        highlight_index=highlight_index
+    )
+    for child in children:
+        child.parent = node
+        node.children.append(child)
+    return node
+
+
+def text(value, visible=True):
+    """Build a DOM text node."""
+    return DOMTextNode(is_visible=visible, parent=None, text=value)
+
+
+class FakeSite:
+    """Pages served to fake tabs, keyed by URL.
+
+    Each page has ``fields`` (CSS selector -> text, as the extractor reads
+    them), ``xpaths`` (CSS selector -> XPaths of its matches) and ``tree``
+    (the element tree the agent is shown).
+    """
+
+    def __init__(self, pages: Dict[str, Dict[str, Any]]):
+        self.pages = pages
+        self.open_tabs = 0
+        self.peak_tabs = 0
+        self.visits: List[str] = []
+
+    def page(self, url: str) -> Dict[str, Any]:
+        page = self.pages.get(url)
+        if page is None or page.get('fails'):
+            raise RuntimeError(f"net::ERR_CONNECTION_REFUSED at {url}")
+        return page
+
+
+class FakePage:
+    """Playwright page stand-in that serves FakeSite pages."""
+
+    def __init__(self, site: FakeSite, url: str = "about:blank"):
+        self.site = site
+        self.url = url
+
+    async def goto(self, url, **kwargs):
+        self.site.visits.append(url)
+        # Yield to other tabs, as a real page load would
+        await asyncio.sleep(0)
+        self.site.page(url)
+        self.url = url
+
+    async def wait_for_load_state(self, *args, **kwargs):
+        pass
+
+    async def wait_for_selector(self, *args, **kwargs):
+        pass
+
+    async def evaluate(self, script, arg):
+        page = self.site.page(self.url)
+        if script == EXTRACT_SCRIPT:
+            return {name: page['fields'].get(spec['css']) for name, spec in arg.items()}
+        if script == XPATH_SCRIPT:
+            return {group: [xpath for query in queries for xpath in page['xpaths'].get(query['css'], [])]
+                    for group, queries in arg.items()} | {'invalid': []}
+        raise AssertionError("Unexpected script")
+
+    async def close(self):
+        self.site.open_tabs -= 1
+
+
+class FakePlaywrightContext:
+    def __init__(self, site: FakeSite):
+        self.site = site
+
+    async def new_page(self):
+        self.site.open_tabs += 1
+        self.site.peak_tabs = max(self.site.peak_tabs, self.site.open_tabs)
+        return FakePage(self.site)
+
+
+class FakeSession:
+    def __init__(self, site: FakeSite):
+        self.context = FakePlaywrightContext(site)
+        self.current_page = FakePage(site)
+
+
+class FakeBrowserContext:
+    """browser_use BrowserContext stand-in with one agent-driven page."""
+
+    def __init__(self, site: FakeSite):
+        self.site = site
+        self.session = FakeSession(site)
+
+    async def get_session(self):
+        return self.session
+
+    async def get_current_page(self):
+        return self.session.current_page
+
+    async def get_state(self, use_vision: bool = True):
+        page = self.site.page(self.session.current_page.url)
+        return BrowserState(element_tree=page['tree'](), selector_map={}, url=self.session.current_page.url,
+                            title='', tabs=[])
+
+
+class FakePool:
+    """BrowserPool stand-in handing out one FakeBrowserContext per job."""
+
+    def __init__(self, site: FakeSite):
+        self.site = site
+        self.contexts: List[FakeBrowserContext] = []
+
+    @asynccontextmanager
+    async def context(self, config=None, hooks=()):
+        browser_context = FakeBrowserContext(self.site)
+        self.contexts.append(browser_context)
+        yield browser_context
+
+
+class FakeAgent:
+    """Agent stand-in that looks at the page state once and reports what it saw."""
+
+    runs: List[Dict[str, Any]] = []
+
+    def __init__(self, task, llm=None, browser_context=None, use_vision=True):
+        self.task = task
+        self.browser_context = browser_context
+        self.message_manager = self
+
+    def _add_message_with_tokens(self, message):
+        pass
+
+    async def run(self):
+        page = await self.browser_context.get_current_page()
+        # Follow the task's navigation instruction, as the real agent would
+        found = re.search(r"(?:Navigate to|First navigate to) '([^']+)'", self.task)
+        if found:
+            try:
+                await page.goto(found.group(1))
+            except Exception as e:
+                # The real agent records failed steps instead of raising
+                FakeAgent.runs.append({'url': found.group(1), 'task': self.task, 'error': str(e)})
+                return f"agent failed on {found.group(1)}: {e}"
+        state = await self.browser_context.get_state(use_vision=False)
+        seen = state.element_tree.clickable_elements_to_string([])
+        FakeAgent.runs.append({'url': page.url, 'task': self.task, 'seen': seen})
+        return f"agent result for {page.url}"
+
+
+@pytest.fixture
+def fake_agents(monkeypatch):
+    """Replace the LLM agent and model with fakes."""
+    FakeAgent.runs = []
+    monkeypatch.setenv("GOOGLE_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(browser_module, "Agent", FakeAgent)
+    monkeypatch.setattr(browser_module.ModelFactory, "create_model", staticmethod(lambda config: None))
+    return FakeAgent
+
+
+def make_automation(site: FakeSite, config: Dict[str, Any], tmp_path, max_tabs: Optional[int] = None):
+    """Build a BrowserAutomation that drives a FakeSite."""
+    return browser_module.BrowserAutomation(
+        config, output_dir=str(tmp_path), browser_pool=FakePool(site),
+        http_cache=HttpCache(cache_dir=tmp_path / "http"), max_tabs=max_tabs
+    )
@@ -0,0 +1,110 @@
+"""Tests for extracting lists of URLs as tabs of one browser context."""
+
+import asyncio
+import json
+
+from conftest import FakeSite, element, make_automation, text
+
+CONFIG = {
+    'name': 'Trials',
+    'description': 'Extract the trial',
+    'selectors': {'title': 'h1', 'phase': '.phase'},
+}
+
+
+def trial_page(title, phase="Phase 3"):
+    return {
+        'fields': {'h1': title, '.phase': phase},
+        'xpaths': {},
+        'tree': lambda: element('body', 'html/body', [element('h1', 'html/body/h1', [text(title)])]),
+    }
+
+
+def trial_site(count, **extra_pages):
+    pages = {f"https://example.com/trials/{i}": trial_page(f"Trial {i}") for i in range(count)}
+    pages.update(extra_pages)
+    return FakeSite(pages)
+
+
+def test_tabs_are_limited_to_max_tabs(fake_agents, tmp_path):
+    site = trial_site(6)
+    automation = make_automation(site, CONFIG, tmp_path, max_tabs=2)
+
+    asyncio.run(automation.process_url(list(site.pages)))
+
+    assert site.peak_tabs == 2
+    assert site.open_tabs == 0
+
+
+def test_max_tabs_argument_overrides_the_instance_default(fake_agents, tmp_path):
+    site = trial_site(6)
+    automation = make_automation(site, CONFIG, tmp_path, max_tabs=2)
+
+    asyncio.run(automation.process_url(list(site.pages), max_tabs=4))
+
+    assert site.peak_tabs == 4
+
+
+def test_one_result_per_url_in_input_order(fake_agents, tmp_path):
+    site = trial_site(3)
+    urls = ["https://example.com/trials/2", "https://example.com/trials/0",
+            "https://example.com/trials/2", "https://example.com/trials/1"]
+    automation = make_automation(site, CONFIG, tmp_path)
+
+    results = asyncio.run(automation.process_url(urls))
+
+    assert list(results) == ["https://example.com/trials/2", "https://example.com/trials/0",
+                             "https://example.com/trials/1"]
+    for url, result in results.items():
+        assert result['metadata']['url'] == url
+        assert result['metadata']['extraction_method'] == 'selectors'
+        assert json.loads(result['content'])['title'] == f"Trial {url[-1]}"
+    # Every page came from the selectors; the agent never ran
+    assert fake_agents.runs == []
+
+
+def test_a_failing_url_does_not_affect_the_others(fake_agents, tmp_path):
+    broken = {**trial_page("Broken"), 'fails': True}
+    site = trial_site(2, **{"https://example.com/trials/broken": broken})
+    urls = ["https://example.com/trials/0", "https://example.com/trials/broken", "https://example.com/trials/1"]
+    automation = make_automation(site, CONFIG, tmp_path)
+
+    results = asyncio.run(automation.process_url(urls))
+
+    assert list(results) == urls
+    assert results[urls[0]]['metadata']['extraction_method'] == 'selectors'
+    assert results[urls[2]]['metadata']['extraction_method'] == 'selectors'
+    # Only the broken page falls back to the agent, which reports the failure
+    assert results[urls[1]]['metadata']['extraction_method'] == 'agent'
+    assert "ERR_CONNECTION_REFUSED" in results[urls[1]]['content']
+    assert [run['url'] for run in fake_agents.runs] == [urls[1]]
+    assert site.open_tabs == 0
+
+
+def test_incomplete_pages_fall_back_to_the_agent_one_at_a_time(fake_agents, tmp_path):
+    site = trial_site(2, **{"https://example.com/trials/draft": trial_page("Draft", phase=None)})
+    urls = list(site.pages)
+    automation = make_automation(site, CONFIG, tmp_path)
+
+    results = asyncio.run(automation.process_url(urls))
+
+    assert results["https://example.com/trials/draft"]['metadata']['extraction_method'] == 'agent'
+    assert results["https://example.com/trials/draft"]['content'] == "agent result for https://example.com/trials/draft"
+    assert [run['url'] for run in fake_agents.runs] == ["https://example.com/trials/draft"]
+
+
+def test_single_url_returns_one_result(fake_agents, tmp_path):
+    site = trial_site(1)
+    automation = make_automation(site, CONFIG, tmp_path)
+
+    result = asyncio.run(automation.process_url("https://example.com/trials/0"))
+
+    assert result['metadata']['url'] == "https://example.com/trials/0"
+    assert json.loads(result['content']) == {'title': "Trial 0", 'phase': "Phase 3"}
+    assert site.peak_tabs == 0
+
+
+def test_empty_list_returns_no_results(fake_agents, tmp_path):
+    automation = make_automation(trial_site(0), CONFIG, tmp_path)
+
+    assert asyncio.run(automation.process_url([])) == {}
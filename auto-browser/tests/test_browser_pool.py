@@ -0,0 +1,84 @@
+"""Tests for the browser pool."""
+
+import asyncio
+
+import pytest
+
+from browser_automation import browser_pool
+from browser_automation.browser_pool import BrowserPool, BrowserPoolConfig
+
+
+class FakeBrowser:
+    """Stand-in for browser_use's Browser that counts launches."""
+
+    launches = 0
+
+    def __init__(self, config=None):
+        self.config = config
+        self.playwright_browser = None
+        self.closed = False
+
+    async def get_playwright_browser(self):
+        if self.playwright_browser is None:
+            await asyncio.sleep(0.01)
+            FakeBrowser.launches += 1
+            self.playwright_browser = object()
+        return self.playwright_browser
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_browser(monkeypatch):
+    FakeBrowser.launches = 0
+    monkeypatch.setattr(browser_pool, "Browser", FakeBrowser)
+
+
+def test_concurrent_jobs_share_one_launch():
+    pool = BrowserPool(BrowserPoolConfig(size=1, recycle_after=100))
+
+    async def run():
+        slots = await asyncio.gather(*(pool._acquire() for _ in range(4)))
+        assert all(slot is slots[0] for slot in slots)
+        assert slots[0].browser.playwright_browser is not None
+
+    asyncio.run(run())
+    assert FakeBrowser.launches == 1
+
+
+def test_recycled_browser_is_launched_once():
+    pool = BrowserPool(BrowserPoolConfig(size=1, recycle_after=2))
+
+    async def run():
+        first = await asyncio.gather(*(pool._acquire() for _ in range(2)))
+        for slot in first:
+            await pool._release(slot)
+        assert first[0].browser.closed
+        second = await asyncio.gather(*(pool._acquire() for _ in range(2)))
+        assert second[0] is second[1] is not first[0]
+
+    asyncio.run(run())
+    assert FakeBrowser.launches == 2
+
+
+def test_failed_launch_is_retried(monkeypatch):
+    pool = BrowserPool(BrowserPoolConfig(size=1))
+    attempts = []
+
+    async def flaky_launch(self):
+        attempts.append(self)
+        if len(attempts) == 1:
+            raise RuntimeError("chromium crashed")
+        self.playwright_browser = object()
+        return self.playwright_browser
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await pool._acquire()
+        slot = await pool._acquire()
+        assert slot.active == 1
+
+    monkeypatch.setattr(FakeBrowser, "get_playwright_browser", flaky_launch)
+    asyncio.run(run())
+    assert len(attempts) == 2
@@ -0,0 +1,131 @@
+"""Tests for the adaptive batch concurrency controller."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from browser_automation import concurrency
+from browser_automation.concurrency import AdaptiveConcurrency, is_rate_limit_error, is_timeout_error
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+@pytest.fixture(autouse=True)
+def plenty_of_memory(monkeypatch):
+    monkeypatch.setattr(concurrency, "available_memory_fraction", lambda: 0.9)
+
+
+def run_window(controller, durations, error=None, in_flight=None):
+    """Record one window of finished jobs with the limit fully used."""
+    async def record():
+        controller._peak_in_flight = controller.limit if in_flight is None else in_flight
+        for index, duration in enumerate(durations):
+            await controller.record(duration, error if index == 0 else None)
+
+    asyncio.run(record())
+
+
+def test_grows_by_one_after_a_healthy_full_window():
+    controller = AdaptiveConcurrency(initial=2, maximum=8)
+    run_window(controller, [1.0, 1.0, 1.0])
+
+    assert controller.limit == 3
+    assert controller.changes[-1].old == 2 and controller.changes[-1].new == 3
+
+
+def test_does_not_grow_when_the_limit_was_not_the_bottleneck():
+    controller = AdaptiveConcurrency(initial=4, maximum=8)
+    run_window(controller, [1.0] * 4, in_flight=2)
+
+    assert controller.limit == 4
+    assert controller.changes == []
+
+
+def test_halves_on_rate_limit_errors():
+    controller = AdaptiveConcurrency(initial=8, maximum=8)
+    run_window(controller, [1.0] * 8, error=RateLimited("Too many requests"))
+
+    assert controller.limit == 4
+    assert "429" in controller.changes[-1].reason
+
+
+def test_halves_when_latency_degrades():
+    controller = AdaptiveConcurrency(initial=4, maximum=8, latency_tolerance=1.5)
+    run_window(controller, [1.0] * 4)
+    run_window(controller, [5.0] * 5)
+
+    assert controller.limit == 2
+    assert "p95 latency" in controller.changes[-1].reason
+
+
+def test_backs_off_under_memory_pressure(monkeypatch):
+    monkeypatch.setattr(concurrency, "available_memory_fraction", lambda: 0.02)
+    controller = AdaptiveConcurrency(initial=4, maximum=8, min_free_memory=0.1)
+    run_window(controller, [1.0] * 4)
+
+    assert controller.limit == 2
+    assert "memory" in controller.changes[-1].reason
+
+
+def test_never_leaves_its_bounds():
+    controller = AdaptiveConcurrency(initial=2, minimum=2, maximum=3)
+    run_window(controller, [1.0] * 3, error=RateLimited())
+    assert controller.limit == 2
+    for _ in range(3):
+        run_window(controller, [1.0] * 3)
+    assert controller.limit == 3
+
+
+def test_fixed_limit_without_a_maximum(monkeypatch):
+    monkeypatch.setenv("BATCH_MIN_CONCURRENCY", "1")
+    controller = AdaptiveConcurrency.from_env(initial=4)
+
+    assert not controller.adaptive
+    run_window(controller, [1.0] * 4, error=RateLimited())
+    assert controller.limit == 4
+
+
+def test_slots_cap_jobs_in_flight():
+    controller = AdaptiveConcurrency(initial=2)
+    peak = 0
+    running = 0
+
+    async def job():
+        nonlocal peak, running
+        async with controller.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    async def run():
+        await asyncio.gather(*(job() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+
+
+class HTTPStatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"Server error '{status_code}'")
+        self.response = SimpleNamespace(status_code=status_code)
+
+
+def test_rate_limit_detection_ignores_stray_429s():
+    assert is_rate_limit_error(HTTPStatusError(429))
+    assert not is_rate_limit_error(HTTPStatusError(500))
+    assert is_rate_limit_error(Exception("HTTP 429: Too Many Requests"))
+    assert not is_rate_limit_error(Exception("Navigation to https://example.com/item/4291 failed"))
+    assert not is_rate_limit_error(Exception("Timeout after 429ms waiting for selector"))
+    assert not is_rate_limit_error(Exception("Trial 2023-509429-38-00 not found"))
+
+
+def test_error_classification():
+    assert is_rate_limit_error(RateLimited())
+    assert is_rate_limit_error(Exception("Rate limit reached for gpt-4"))
+    assert not is_rate_limit_error(ValueError("bad selector"))
+    assert is_timeout_error(asyncio.TimeoutError())
+    assert not is_timeout_error(ValueError("bad selector"))
@@ -0,0 +1,104 @@
+"""Tests for the serve daemon."""
+
+import asyncio
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from browser_automation import cli
+from browser_automation.daemon import DaemonClient, DaemonServer, env_fingerprint
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to about 100 characters, so keep it short
+    with tempfile.TemporaryDirectory(prefix="ab-") as directory:
+        yield Path(directory) / "d.sock"
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "config.yaml"
+    path.write_text("sites: {}\noutput_dir: output\n")
+    return path
+
+
+def test_env_fingerprint_covers_job_settings_only():
+    base = {'LLM_MODEL': 'gpt-4o', 'OPENAI_API_KEY': 'sk-1', 'HOME': '/root'}
+
+    assert env_fingerprint(base) == env_fingerprint({**base, 'HOME': '/home/other', 'TERM': 'xterm'})
+    assert env_fingerprint(base) != env_fingerprint({**base, 'LLM_MODEL': 'gpt-4o-mini'})
+    assert env_fingerprint(base) != env_fingerprint({**base, 'HTTP_CACHE_MODE': 'replay'})
+    assert env_fingerprint(base) != env_fingerprint({**base, 'OPENAI_API_KEY': 'sk-2'})
+    assert 'sk-1' not in env_fingerprint(base)
+
+
+def run_with_daemon(socket_path, config_path, client_calls):
+    """Serve on ``socket_path`` while ``client_calls`` runs in a thread, then shut down."""
+    server = DaemonServer(socket_path, config_path=str(config_path), concurrency=1)
+
+    async def warm_up():
+        pass
+
+    server.warm_up = warm_up
+
+    async def main():
+        serving = asyncio.create_task(server.serve_forever())
+        client = DaemonClient(socket_path)
+        for _ in range(200):
+            if await asyncio.to_thread(client.available):
+                break
+            await asyncio.sleep(0.01)
+        try:
+            return await asyncio.to_thread(client_calls, client)
+        finally:
+            await asyncio.to_thread(client.shutdown)
+            await serving
+
+    return server, asyncio.run(main())
+
+
+def test_forwards_a_job_and_streams_its_events(socket_path, config_path, monkeypatch):
+    jobs = []
+
+    async def fake_run_all_tasks(**kwargs):
+        jobs.append(kwargs)
+        output = Path("output") / "example.md"
+        output.parent.mkdir(exist_ok=True)
+        output.write_text("# Example")
+        return output
+
+    monkeypatch.setattr(cli, 'run_all_tasks', fake_run_all_tasks)
+
+    def submit(client):
+        assert client.serves(config_path)
+        return list(client.run(config_path=config_path, url="https://example.com", prompt="Extract", report=True))
+
+    server, events = run_with_daemon(socket_path, config_path, submit)
+
+    assert [event['event'] for event in events] == ['accepted', 'started', 'result']
+    assert events[-1]['output'] == str((config_path.parent / "output" / "example.md").resolve())
+    assert jobs[0]['url'] == "https://example.com"
+    assert jobs[0]['report'] is True
+    assert server.jobs_served == 1
+    assert not socket_path.exists()
+
+
+def test_refuses_jobs_from_a_different_environment(socket_path, config_path, monkeypatch):
+    async def fake_run_all_tasks(**kwargs):
+        raise AssertionError("job should not run")
+
+    monkeypatch.setattr(cli, 'run_all_tasks', fake_run_all_tasks)
+
+    def submit(client):
+        # As sent by a client whose LLM_* or other job settings differ
+        other_env = env_fingerprint({'LLM_MODEL': 'another-model'})
+        return list(client.request({'op': 'run', 'url': "https://example.com", 'env': other_env}))
+
+    server, events = run_with_daemon(socket_path, config_path, submit)
+
+    assert [event['event'] for event in events] == ['error']
+    assert 'environment' in events[0]['error']
+    assert server.jobs_served == 0
@@ -0,0 +1,177 @@
+"""Tests for DOM pruning."""
+
+import asyncio
+
+from browser_use.browser.views import BrowserState
+from browser_use.dom.views import DOMElementNode, DOMTextNode
+
+from browser_automation.dom_pruning import DomPruner, _to_query
+
+from conftest import FakeSite, element, make_automation, text
+
+
+def page_state():
+    tree = element('body', 'html/body', [
+        element('nav', 'html/body/nav', [
+            element('input', 'html/body/nav/input', highlight_index=0),
+            element('button', 'html/body/nav/button', [text('Search')], highlight_index=1),
+        ]),
+        element('main', 'html/body/main', [
+            element('div', 'html/body/main/div', [
+                element('h1', 'html/body/main/div/h1', [text('Trial title')]),
+                element('span', 'html/body/main/div/span', [text('Phase 3')]),
+            ]),
+            element('div', 'html/body/main/div[2]', [text('Cookie banner'), text('hidden', visible=False)]),
+        ]),
+        element('footer', 'html/body/footer', [text('Copyright')]),
+    ])
+    return BrowserState(element_tree=tree, selector_map={}, url='https://example.com', title='t', tabs=[])
+
+
+class FakePage:
+    """Resolves selectors to fixed XPaths instead of running the script."""
+
+    def __init__(self, anchors=(), targets=(), invalid=()):
+        self.result = {'anchors': list(anchors), 'targets': list(targets), 'invalid': list(invalid)}
+        self.groups = None
+
+    async def evaluate(self, script, groups):
+        self.groups = groups
+        return self.result
+
+
+def prune(pruner, page):
+    state = page_state()
+    pruned = asyncio.run(pruner.prune(state, page))
+    return state, pruned.element_tree.clickable_elements_to_string(pruner.include_attributes)
+
+
+def test_keeps_interactive_elements_outside_matched_subtrees():
+    pruner = DomPruner({'title': 'h1'})
+    _, output = prune(pruner, FakePage(anchors=['html/body/main/div/h1']))
+
+    assert '0[:]<input' in output
+    assert '1[:]<button >Search</button>' in output
+    assert 'Trial title' in output and 'Phase 3' in output
+    assert 'Cookie banner' not in output and 'Copyright' not in output
+    assert 'hidden' not in output
+
+
+def test_does_not_modify_the_original_state():
+    pruner = DomPruner({'title': 'h1'})
+    state, _ = prune(pruner, FakePage(anchors=['html/body/main/div/h1']))
+
+    assert 'Copyright' in state.element_tree.clickable_elements_to_string(pruner.include_attributes)
+
+
+def test_without_matches_only_hidden_text_is_dropped():
+    pruner = DomPruner({'title': 'h1'})
+    _, output = prune(pruner, FakePage())
+
+    assert 'Cookie banner' in output and 'Copyright' in output
+    assert 'hidden' not in output
+
+
+def test_action_targets_keep_their_subtree():
+    pruner = DomPruner({'title': 'h1'}, [{'action_type': 'click', 'selector': 'footer'}])
+    _, output = prune(pruner, FakePage(anchors=['html/body/main/div/h1'], targets=['html/body/footer']))
+
+    assert 'Copyright' in output
+
+
+def test_reports_token_counts():
+    pruner = DomPruner({'title': 'h1'})
+    prune(pruner, FakePage(anchors=['html/body/main/div/h1']))
+    stats = pruner.stats()
+
+    assert stats['states'] == 1
+    assert 0 < stats['tokens_after'] < stats['tokens_before']
+    assert 0 < stats['reduction'] < 1
+
+
+def test_contains_selectors_become_text_filters():
+    assert _to_query("a:contains('next page')") == {'css': 'a', 'text': 'next page'}
+    assert _to_query(":contains(Next)") == {'css': '*', 'text': 'Next'}
+    assert _to_query("input[type='search']") == {'css': "input[type='search']", 'text': None}
+
+    pruner = DomPruner({}, [{'action_type': 'click', 'selector': "a:contains('next')"}])
+    page = FakePage()
+    prune(pruner, page)
+    assert page.groups['targets'] == [{'css': 'a', 'text': 'next'}]
+
+
+def test_invalid_selectors_are_reported_once(caplog):
+    pruner = DomPruner({'title': 'h1:bogus('})
+    page = FakePage(invalid=['h1:bogus('])
+    prune(pruner, page)
+    prune(pruner, page)
+
+    assert sum('not valid CSS' in record.message for record in caplog.records) == 1
+
+
+def trial_page(price=None):
+    """A trial page; without a price the template's required selectors miss."""
+    def tree():
+        return element('body', 'html/body', [
+            element('main', 'html/body/main', [
+                element('div', 'html/body/main/div', [
+                    element('h1', 'html/body/main/div/h1', [text('Trial title')]),
+                ]),
+            ]),
+            element('aside', 'html/body/aside', [text('Sponsor: Example Pharma')]),
+            element('button', 'html/body/button', [text('Download')], highlight_index=0),
+            element('div', 'html/body/div', [text('hidden tracking pixel', visible=False)]),
+        ])
+
+    fields = {'h1': 'Trial title'}
+    if price:
+        fields['.price'] = price
+    return {'fields': fields, 'xpaths': {'h1': ['html/body/main/div/h1'], 'button': ['html/body/button']},
+            'tree': tree}
+
+
+def test_pruning_does_not_leak_between_urls_of_one_context(fake_agents, tmp_path):
+    site = FakeSite({
+        'https://trials.test/1': trial_page(price='10'),
+        'https://trials.test/2': trial_page(),
+    })
+    config = {
+        'description': 'Extract the trial',
+        'selectors': {'title': 'h1', 'price': '.price'},
+        'actions': [{'action_type': 'click', 'selector': 'button', 'description': 'Download'}],
+    }
+    automation = make_automation(site, config, tmp_path)
+
+    results = asyncio.run(automation.process_url(['https://trials.test/1', 'https://trials.test/2']))
+
+    first, second = fake_agents.runs[0], fake_agents.runs[1]
+    # The interactive agent on the extracted page is focused on the template's content
+    assert first['url'] == 'https://trials.test/1'
+    assert 'Trial title' in first['seen'] and 'Download' in first['seen']
+    assert 'Sponsor' not in first['seen']
+    # The next URL's fallback agent only gets the text rules, not the first page's anchors
+    assert second['url'] == 'https://trials.test/2' and second['task'].startswith('1. Navigate')
+    assert 'Sponsor: Example Pharma' in second['seen'] and 'Trial title' in second['seen']
+    assert 'hidden tracking pixel' not in second['seen']
+
+    browser_context = automation.browser_pool.contexts[0]
+    assert not hasattr(browser_context, '_unpruned_get_state')
+    assert results['https://trials.test/1']['metadata']['extraction_method'] == 'selectors'
+    assert results['https://trials.test/2']['metadata']['extraction_method'] == 'agent'
+    # Each URL's stats cover only its own agent steps (extraction, then the continued interactive run)
+    assert results['https://trials.test/1']['metadata']['dom_pruning']['states'] == 1
+    assert results['https://trials.test/2']['metadata']['dom_pruning']['states'] == 2
+
+
+def test_text_rules_apply_without_selectors():
+    pruner = DomPruner()
+    state = BrowserState(element_tree=element('body', 'html/body', [
+        element('p', 'html/body/p', [text('  Read   more  ')]),
+        element('p', 'html/body/p[2]', [text('Read more')]),
+        element('span', 'html/body/span', [text(' | ')]),
+        element('a', 'html/body/a', [text('Read more')], highlight_index=0),
+    ]), selector_map={}, url='u', title='t', tabs=[])
+
+    output = asyncio.run(pruner.prune(state, FakePage())).element_tree.clickable_elements_to_string([])
+
+    assert output.splitlines() == ['_[:]Read more', '0[:]<a>Read more</a>']
@@ -0,0 +1,126 @@
+"""Tests for selector-based extraction."""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from browser_automation.extractor import EXTRACT_SCRIPT, SelectorExtractor, normalize_selectors
+
+
+class StubPage:
+    """Page whose ``evaluate`` reads selectors from a fixed set of elements.
+
+    ``elements`` maps CSS selectors to the elements they match, each a dict
+    of ``text`` and attributes, and is read the way EXTRACT_SCRIPT does.
+    """
+
+    def __init__(self, elements, wait_times_out=False):
+        self.elements = elements
+        self.wait_times_out = wait_times_out
+        self.calls = []
+
+    async def goto(self, url, **kwargs):
+        self.calls.append(('goto', url, kwargs))
+
+    async def wait_for_selector(self, css, **kwargs):
+        self.calls.append(('wait_for_selector', css, kwargs))
+        if self.wait_times_out:
+            raise PlaywrightTimeoutError("Timeout exceeded")
+
+    async def evaluate(self, script, selectors):
+        assert script == EXTRACT_SCRIPT
+        self.calls.append(('evaluate', selectors))
+        results = {}
+        for name, spec in selectors.items():
+            nodes = self.elements.get(spec['css'], [])
+            read = [node.get(spec['attribute']) if spec['attribute'] else node.get('text') for node in nodes]
+            read = [value.strip() if value is not None else None for value in read]
+            if spec['multiple']:
+                results[name] = [value for value in read if value]
+            else:
+                results[name] = (read[0] or None) if read else None
+        return results
+
+
+@dataclass
+class ModelSelector:
+    css: str
+    attribute: Optional[str] = None
+    multiple: bool = False
+    required: bool = True
+
+
+PAGE = {
+    'h1': [{'text': '  Trial title '}],
+    '.phase': [{'text': ''}],
+    'li.site': [{'text': 'Berlin'}, {'text': ' '}, {'text': 'Paris'}],
+    'a.protocol': [{'text': 'Protocol', 'href': '/files/protocol.pdf'}],
+}
+
+
+def extract(selectors, elements=PAGE, url=None, **kwargs):
+    page = StubPage(elements)
+    result = asyncio.run(SelectorExtractor(selectors, **kwargs).extract(page, url))
+    return result, page
+
+
+def test_reads_text_lists_and_attributes_in_one_pass():
+    result, page = extract({
+        'title': 'h1',
+        'sites': {'css': 'li.site', 'multiple': True},
+        'protocol': ModelSelector(css='a.protocol', attribute='href'),
+    })
+
+    assert result.data == {'title': 'Trial title', 'sites': ['Berlin', 'Paris'], 'protocol': '/files/protocol.pdf'}
+    assert result.complete
+    assert [call[0] for call in page.calls] == ['evaluate']
+
+
+def test_empty_required_selectors_are_reported():
+    result, _ = extract({
+        'title': 'h1',
+        'phase': '.phase',
+        'sponsor': {'css': '.sponsor'},
+        'sites': {'css': 'li.missing', 'multiple': True},
+    })
+
+    assert not result.complete
+    assert result.missing_required == ['phase', 'sponsor', 'sites']
+    assert result.data['title'] == 'Trial title'
+
+
+def test_optional_selectors_may_be_empty():
+    result, _ = extract({
+        'title': 'h1',
+        'phase': {'css': '.phase', 'required': False},
+        'tags': ModelSelector(css='.tag', multiple=True, required=False),
+    })
+
+    assert result.complete
+    assert result.data == {'title': 'Trial title', 'phase': None, 'tags': []}
+
+
+def test_navigates_and_waits_before_extracting():
+    result, page = extract({'title': 'h1'}, url="https://example.com/trial", wait_for="h1", timeout=5000)
+
+    assert result.complete
+    assert page.calls[0] == ('goto', "https://example.com/trial", {'wait_until': 'domcontentloaded', 'timeout': 5000})
+    assert page.calls[1] == ('wait_for_selector', 'h1', {'timeout': 5000})
+    assert page.calls[2][0] == 'evaluate'
+
+
+def test_wait_timeout_still_extracts():
+    page = StubPage(PAGE, wait_times_out=True)
+
+    result = asyncio.run(SelectorExtractor({'title': 'h1'}, wait_for='.never').extract(page))
+
+    assert result.data == {'title': 'Trial title'}
+
+
+def test_selectors_are_normalized_to_plain_dicts():
+    assert normalize_selectors({'title': 'h1', 'link': ModelSelector(css='a', attribute='href')}) == {
+        'title': {'css': 'h1', 'attribute': None, 'multiple': False, 'required': True},
+        'link': {'css': 'a', 'attribute': 'href', 'multiple': False, 'required': True},
+    }
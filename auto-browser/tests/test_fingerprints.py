@@ -0,0 +1,69 @@
+"""Tests for change detection."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from browser_automation.fingerprints import FingerprintStore, change_key
+
+
+def test_unchanged_content_is_detected(tmp_path):
+    store = FingerprintStore(tmp_path / "fingerprints")
+    output = tmp_path / "page.md"
+    output.write_text("report")
+    key = change_key("clinical_trials", "Summarize the trial", "report")
+
+    first = store.check(key, "https://example.com", '{"title": "A",  "phase": 3}')
+    assert first.changed
+    store.record(key, "https://example.com", first, output)
+
+    again = store.check(key, "https://example.com", '{"phase": 3, "title": "A"}')
+    assert not again.changed
+    assert again.previous_output == str(output)
+
+
+def test_changed_content_has_a_diff(tmp_path):
+    store = FingerprintStore(tmp_path / "fingerprints")
+    output = tmp_path / "page.md"
+    output.write_text("report")
+    key = change_key("clinical_trials", "Summarize the trial", "markdown")
+    store.record(key, "https://example.com", store.check(key, "https://example.com", {"phase": 2}), output)
+
+    change = store.check(key, "https://example.com", {"phase": 3})
+    assert change.changed
+    assert change.diff
+
+
+def test_another_prompt_is_not_reported_unchanged(tmp_path):
+    store = FingerprintStore(tmp_path / "fingerprints")
+    output = tmp_path / "page.md"
+    output.write_text("report")
+    first_key = change_key("clinical_trials", "Summarize the trial", "report")
+    store.record(first_key, "https://example.com", store.check(first_key, "https://example.com", "same"), output)
+
+    second_key = change_key("clinical_trials", "List the sponsors", "report")
+    assert store.check(second_key, "https://example.com", "same").changed
+
+
+def test_key_covers_output_and_action_settings():
+    base = change_key("site", "prompt", "report")
+
+    assert base == change_key("site", "prompt", "report")
+    assert base != change_key("site", "prompt", "markdown")
+    assert base != change_key("other", "prompt", "report")
+    assert base != change_key("site", "prompt", "report", interactive=True)
+    assert change_key("site", "prompt", "report", True, [{"action_type": "click", "selector": "a"}]) != \
+        change_key("site", "prompt", "report", True, [{"action_type": "click", "selector": "button"}])
+
+
+def test_concurrent_records_leave_one_complete_entry(tmp_path):
+    store = FingerprintStore(tmp_path / "fingerprints")
+    output = tmp_path / "page.md"
+    output.write_text("report")
+    changes = [store.check("site", "https://example.com", {"run": i}) for i in range(20)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda change: store.record("site", "https://example.com", change, output), changes))
+
+    assert [p.suffix for p in store.store_dir.iterdir()] == [".json"]
+    fingerprints = {change.fingerprint for change in changes}
+    assert store.check("site", "https://example.com", {"run": 0}).fingerprint in fingerprints
+    assert store._load("site", "https://example.com")["fingerprint"] in fingerprints
@@ -0,0 +1,25 @@
+"""Tests for the record-and-replay HTTP cache."""
+
+import pytest
+
+from browser_automation.http_cache import HttpCache, HttpCacheMode
+
+
+def test_batch_key_ignores_order_and_duplicates():
+    urls = ['https://example.com/b', 'https://example.com/a ', 'https://example.com/b']
+
+    assert HttpCache.batch_key(urls) == HttpCache.batch_key(['https://example.com/a', 'https://example.com/b'])
+    assert HttpCache.batch_key(['https://example.com/a']) == 'https://example.com/a'
+
+
+def test_batch_recording_replays_for_the_same_set_only(tmp_path):
+    urls = ['https://example.com/a', 'https://example.com/b']
+    recorder = HttpCache(mode=HttpCacheMode.RECORD, cache_dir=tmp_path)
+    plan = recorder.plan(HttpCache.batch_key(urls))
+    plan.path.parent.mkdir(parents=True, exist_ok=True)
+    plan.path.write_bytes(b'')
+
+    replayer = HttpCache(mode=HttpCacheMode.REPLAY, cache_dir=tmp_path)
+    assert replayer.plan(HttpCache.batch_key(reversed(urls))).path == plan.path
+    with pytest.raises(FileNotFoundError):
+        replayer.plan('https://example.com/a')
@@ -0,0 +1,119 @@
+"""Tests for the persistent batch job queue."""
+
+import pytest
+
+from browser_automation.job_queue import JobQueue, JobState
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite", max_attempts=2, retry_base=0, retry_max=0)
+    yield queue
+    queue.close()
+
+
+def test_jobs_are_claimed_in_order_and_completed(queue):
+    assert queue.create_run("run", [("https://a.test", "p"), ("https://b.test", "p")], {"report": True}) == 2
+
+    first = queue.claim("run", "worker")
+    second = queue.claim("run", "worker")
+    assert (first["url"], second["url"]) == ("https://a.test", "https://b.test")
+    assert queue.claim("run", "worker") is None
+
+    queue.complete(first["id"], "worker", "a.md", 1.0)
+    queue.complete(second["id"], "worker", "b.md", 2.0)
+    assert queue.counts("run")[JobState.DONE.value] == 2
+    assert [result["status"] for result in queue.results("run")] == ["success", "success"]
+    assert queue.get_options("run") == {"report": True}
+
+
+def test_creating_a_run_again_only_adds_new_urls(queue):
+    queue.create_run("run", [("https://a.test", "p")], {})
+    job = queue.claim("run", "worker")
+    queue.complete(job["id"], "worker", "a.md", 1.0)
+
+    assert queue.create_run("run", [("https://a.test", "p"), ("https://b.test", "p")], {}) == 1
+    assert queue.claim("run", "worker")["url"] == "https://b.test"
+
+
+def test_failures_are_retried_until_attempts_run_out(queue):
+    queue.create_run("run", [("https://a.test", "p")], {})
+
+    job = queue.claim("run", "worker")
+    assert queue.fail(job["id"], "worker", "timeout", 1.0) == JobState.PENDING
+    job = queue.claim("run", "worker")
+    assert job["attempts"] == 2
+    assert queue.fail(job["id"], "worker", "timeout", 1.0) == JobState.FAILED
+    assert queue.claim("run", "worker") is None
+
+    assert queue.retry_failed("run") == 1
+    assert queue.claim("run", "worker")["attempts"] == 1
+
+
+def test_retries_back_off(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite", max_attempts=3, retry_base=60, retry_max=300)
+    queue.create_run("run", [("https://a.test", "p")], {})
+    job = queue.claim("run", "worker")
+    queue.fail(job["id"], "worker", "timeout", 1.0)
+
+    assert queue.claim("run", "worker") is None
+    assert queue.next_due("run") is not None
+    queue.close()
+
+
+def test_resuming_reclaims_jobs_of_dead_workers(tmp_path):
+    path = tmp_path / "jobs.sqlite"
+    crashed = JobQueue(path)
+    crashed.create_run("run", [("https://a.test", "p"), ("https://b.test", "p")], {})
+    done = crashed.claim("run", "worker-1")
+    crashed.complete(done["id"], "worker-1", "a.md", 1.0)
+    crashed.claim("run", "worker-1")
+    crashed.close()
+
+    resumed = JobQueue(path)
+    assert resumed.latest_unfinished_run() == "run"
+    assert resumed.claim("run", "worker-2") is None
+    assert resumed.reclaim("run", expired_only=False) == 1
+    assert resumed.claim("run", "worker-2")["url"] == "https://b.test"
+    resumed.close()
+
+
+def test_expired_leases_are_reclaimed(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite", lease_seconds=-1)
+    queue.create_run("run", [("https://a.test", "p")], {})
+    queue.claim("run", "worker-1")
+
+    assert queue.claim("run", "worker-2")["url"] == "https://a.test"
+    queue.close()
+
+
+def test_updates_require_the_lease(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite", lease_seconds=-1)
+    queue.create_run("run", [("https://a.test", "p")], {})
+    stale = queue.claim("run", "worker-1")
+
+    # The lease ran out and another worker took the job over
+    queue.lease_seconds = 900
+    current = queue.claim("run", "worker-2")
+    assert current["id"] == stale["id"]
+
+    assert not queue.heartbeat(stale["id"], "worker-1")
+    assert queue.complete(stale["id"], "worker-1", "stale.md", 1.0) is False
+    assert queue.fail(stale["id"], "worker-1", "timeout", 1.0) is None
+    assert queue.counts("run")[JobState.RUNNING.value] == 1
+
+    assert queue.heartbeat(current["id"], "worker-2")
+    assert queue.complete(current["id"], "worker-2", "a.md", 1.0) is True
+    assert queue.results("run")[0]["output"] == "a.md"
+    assert queue.complete(current["id"], "worker-2", "again.md", 1.0) is False
+    queue.close()
+
+
+def test_expired_lease_cannot_complete(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite", lease_seconds=-1)
+    queue.create_run("run", [("https://a.test", "p")], {})
+    job = queue.claim("run", "worker")
+
+    assert queue.complete(job["id"], "worker", "a.md", 1.0) is False
+    assert queue.counts("run")[JobState.DONE.value] == 0
+    queue.close()
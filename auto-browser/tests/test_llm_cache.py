@@ -0,0 +1,94 @@
+"""Tests for the SQLite LLM response cache."""
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from browser_automation.models import cache as llm_cache
+from browser_automation.models.cache import SQLiteLLMCache
+
+
+def reply(text):
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+def stored_keys(cache):
+    return {row[0] for row in cache._conn.execute("SELECT key FROM llm_cache")}
+
+
+def test_hits_return_the_stored_message(tmp_path):
+    cache = SQLiteLLMCache(tmp_path / "llm.sqlite")
+    cache.update("prompt", "model", reply("hello"))
+
+    assert cache.lookup("prompt", "model")[0].message.content == "hello"
+    assert cache.lookup("prompt", "other model") is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+    cache.close()
+
+
+def test_replacing_an_entry_counts_only_the_new_size(tmp_path):
+    cache = SQLiteLLMCache(tmp_path / "llm.sqlite")
+    for text in ("first answer", "second answer", "a much longer third answer"):
+        cache.update("prompt", "model", reply(text))
+
+    assert cache.stats()['size_bytes'] == cache._total_size()
+    assert cache.lookup("prompt", "model")[0].message.content == "a much longer third answer"
+    cache.close()
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, 'time', lambda: now[0])
+    cache = SQLiteLLMCache(tmp_path / "llm.sqlite", ttl=60)
+    cache.update("prompt", "model", reply("hello"))
+
+    now[0] += 59
+    assert cache.lookup("prompt", "model") is not None
+    now[0] += 2
+    assert cache.lookup("prompt", "model") is None
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, 'time', lambda: now[0])
+    entry_size = len(SQLiteLLMCache._dumps(reply("answer 0")).encode("utf-8"))
+    # Room for three entries, so the fourth evicts one
+    cache = SQLiteLLMCache(tmp_path / "llm.sqlite", max_bytes=entry_size * 4 - 1)
+
+    for i in range(3):
+        now[0] += 1
+        cache.update(f"prompt {i}", "model", reply(f"answer {i}"))
+    # Reading the oldest entry makes the second one the least recently used
+    now[0] += 1
+    cache.lookup("prompt 0", "model")
+    now[0] += 1
+    cache.update("prompt 3", "model", reply("answer 3"))
+
+    assert stored_keys(cache) == {cache._key(f"prompt {i}", "model") for i in (0, 2, 3)}
+    assert cache.stats()['size_bytes'] == cache._total_size() == entry_size * 3
+    cache.close()
+
+
+def test_read_only_cache_serves_hits_but_never_writes(tmp_path):
+    path = tmp_path / "llm.sqlite"
+    writer = SQLiteLLMCache(path)
+    writer.update("prompt", "model", reply("hello"))
+    writer.close()
+
+    reader = SQLiteLLMCache(path, read_only=True)
+    reader.update("new prompt", "model", reply("ignored"))
+    reader.clear()
+
+    assert reader.lookup("prompt", "model")[0].message.content == "hello"
+    assert reader.lookup("new prompt", "model") is None
+    assert reader.stats()['mode'] == 'readonly'
+    reader.close()
+
+
+def test_read_only_cache_without_a_database_misses(tmp_path):
+    cache = SQLiteLLMCache(tmp_path / "missing.sqlite", read_only=True)
+
+    assert cache.lookup("prompt", "model") is None
+    assert not (tmp_path / "missing.sqlite").exists()
+    cache.close()
@@ -0,0 +1,119 @@
+"""Tests for request blocking."""
+
+import asyncio
+from types import SimpleNamespace
+
+from browser_automation import network
+from browser_automation.config import NetworkPolicy
+from browser_automation.http_cache import HttpCache, HttpCacheMode
+from browser_automation.network import ResourceBlocker
+
+
+class FakeRoute:
+    """Route for a single request that records what the blocker did with it."""
+
+    def __init__(self, url, resource_type):
+        self.request = SimpleNamespace(url=url, resource_type=resource_type)
+        self.outcome = None
+
+    async def abort(self, reason):
+        self.outcome = reason
+
+    async def fallback(self):
+        self.outcome = 'continued'
+
+
+def test_blocks_resource_types():
+    blocker = ResourceBlocker(NetworkPolicy(block_resource_types=['image', 'font']))
+
+    assert blocker.should_block('https://example.com/logo.png', 'image')
+    assert blocker.should_block('https://example.com/font.woff2', 'font')
+    assert not blocker.should_block('https://example.com/app.js', 'script')
+
+
+def test_blocks_domains_and_their_subdomains():
+    blocker = ResourceBlocker(NetworkPolicy(block_domains=['.Tracker.com', 'ads.net']))
+
+    assert blocker.should_block('https://tracker.com/pixel', 'image')
+    assert blocker.should_block('https://cdn.eu.tracker.com/t.js', 'script')
+    assert blocker.should_block('https://ADS.NET/x', 'xhr')
+    # A suffix is only a match on a label boundary
+    assert not blocker.should_block('https://nottracker.com/t.js', 'script')
+    assert not blocker.should_block('https://tracker.com.example.org/t.js', 'script')
+
+
+def test_blocks_url_patterns():
+    blocker = ResourceBlocker(NetworkPolicy(block_url_patterns=['*/analytics/*', '*.mp4']))
+
+    assert blocker.should_block('https://example.com/analytics/collect?v=1', 'xhr')
+    assert blocker.should_block('https://video.example.com/intro.mp4', 'media')
+    assert not blocker.should_block('https://example.com/api/data', 'fetch')
+
+
+def test_disabled_policy_blocks_nothing():
+    blocker = ResourceBlocker(NetworkPolicy(enabled=False, block_resource_types=['image'],
+                                            block_domains=['tracker.com']))
+
+    assert not blocker.should_block('https://tracker.com/logo.png', 'image')
+
+
+def test_route_counts_blocked_and_allowed_requests():
+    blocker = ResourceBlocker(NetworkPolicy.default())
+    routes = [
+        FakeRoute('https://example.com/', 'document'),
+        FakeRoute('https://example.com/hero.jpg', 'image'),
+        FakeRoute('https://www.google-analytics.com/collect', 'xhr'),
+        FakeRoute('https://example.com/app.js', 'script'),
+    ]
+
+    async def route_all():
+        for route in routes:
+            await blocker._handle_route(route)
+
+    asyncio.run(route_all())
+
+    assert [route.outcome for route in routes] == ['continued', 'blockedbyclient', 'blockedbyclient', 'continued']
+    assert blocker.stats.allowed_requests == 2
+    assert blocker.stats.blocked_requests == 2
+    assert blocker.stats.blocked_by_type == {'image': 1, 'xhr': 1}
+
+
+def test_document_requests_are_never_blocked():
+    blocker = ResourceBlocker(NetworkPolicy(block_domains=['example.com']))
+    route = FakeRoute('https://example.com/', 'document')
+
+    asyncio.run(blocker._handle_route(route))
+
+    assert route.outcome == 'continued'
+
+
+def test_allowed_content_length_sums_declared_sizes():
+    blocker = ResourceBlocker(NetworkPolicy.default())
+
+    for headers in ({'content-length': '120'}, {}, {'content-length': 'chunked'}, {'content-length': '30'}):
+        blocker._on_response(SimpleNamespace(headers=headers))
+
+    assert blocker.stats.allowed_content_length == 150
+
+
+def test_context_hooks_run_limiter_then_har_then_blocker(monkeypatch, tmp_path):
+    limiter = SimpleNamespace(attach=object())
+    monkeypatch.setattr(network, 'get_rate_limiter', lambda: limiter)
+    cache = HttpCache(mode=HttpCacheMode.RECORD, cache_dir=tmp_path)
+    login = object()
+
+    hooks, blocker, har_plan = network.build_context_hooks(NetworkPolicy.default(), cache,
+                                                           'https://example.com/', extra_hooks=[login])
+
+    assert har_plan.action == 'record'
+    assert hooks == [limiter.attach, har_plan.attach, blocker.attach, login]
+
+
+def test_context_hooks_without_cache_or_limiter(monkeypatch):
+    monkeypatch.setattr(network, 'get_rate_limiter', lambda: None)
+
+    hooks, blocker, har_plan = network.build_context_hooks(NetworkPolicy.default(), HttpCache(),
+                                                           'https://example.com/')
+
+    assert har_plan is None
+    assert hooks == [blocker.attach]
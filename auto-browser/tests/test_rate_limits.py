@@ -0,0 +1,79 @@
+"""Tests for the shared token bucket rate limits."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from browser_automation.config import RateLimit, RateLimitPolicy
+from browser_automation.rate_limits import RateLimiter, TokenBucketStore
+
+
+def test_burst_is_free_then_requests_are_spaced(tmp_path):
+    store = TokenBucketStore(tmp_path / "buckets.sqlite")
+    limit = RateLimit(rate=2, burst=2)
+
+    waits = [store.reserve("example.com", limit) for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.5, abs=0.05)
+    assert waits[3] == pytest.approx(1.0, abs=0.05)
+
+
+def test_stores_on_the_same_file_share_buckets(tmp_path):
+    path = tmp_path / "buckets.sqlite"
+    first, second = TokenBucketStore(path), TokenBucketStore(path)
+    limit = RateLimit(rate=1, burst=1)
+
+    assert first.reserve("openai", limit) == 0.0
+    assert second.reserve("openai", limit) == pytest.approx(1.0, abs=0.05)
+    assert second.reserve("google", limit) == 0.0
+
+
+def test_waiting_for_a_locked_store_does_not_block_the_event_loop(tmp_path):
+    policy = RateLimitPolicy(state_path=tmp_path / "buckets.sqlite",
+                             domains={"default": RateLimit(rate=100, burst=100)})
+    limiter = RateLimiter(policy)
+    limiter.store  # create the table before another connection locks the file
+
+    # Another process holds the write lock for a while
+    locked, release = threading.Event(), threading.Event()
+
+    def hold_lock():
+        conn = sqlite3.connect(policy.state_path, isolation_level=None)
+        conn.execute("BEGIN IMMEDIATE")
+        locked.set()
+        release.wait(timeout=2)
+        conn.execute("COMMIT")
+        conn.close()
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    locked.wait()
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        waiter = asyncio.create_task(limiter.wait_for_host("example.com"))
+        await asyncio.sleep(0.3)
+        assert not waiter.done()
+        release.set()
+        await waiter
+        ticker.cancel()
+        return ticks
+
+    started = time.perf_counter()
+    ticks = asyncio.run(run())
+    holder.join()
+
+    assert ticks >= 10
+    assert time.perf_counter() - started < 5
@@ -0,0 +1,190 @@
+"""Tests for report generation."""
+
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from browser_automation.models import ModelConfig
+from browser_automation.processors import report
+from browser_automation.processors.report import MAX_REDUCE_ROUNDS, ReportGenerator
+from browser_automation.tokens import count_tokens
+
+
+class FakeLLM:
+    """Chat model answering chunk summaries with fixed text and streaming reports."""
+
+    def __init__(self, summary="- fact", stream=("# Report", "\n", "done"), fail_after=None, cache=None):
+        self.summary = summary
+        self.stream = stream
+        self.fail_after = fail_after
+        self.cache = cache
+        self.map_calls = []
+        self.report_messages = None
+
+    async def ainvoke(self, messages):
+        if messages[0]['content'] == report.MAP_SYSTEM_PROMPT:
+            self.map_calls.append(messages[1]['content'])
+            return SimpleNamespace(content=self.summary, usage_metadata=None)
+        self.report_messages = messages
+        return SimpleNamespace(content="".join(self.stream))
+
+    def invoke(self, messages):
+        self.report_messages = messages
+        return SimpleNamespace(content="".join(self.stream))
+
+    async def astream(self, messages):
+        self.report_messages = messages
+        for i, part in enumerate(self.stream):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise RuntimeError("connection dropped")
+            yield SimpleNamespace(content=part)
+
+
+def make_generator(monkeypatch, llm, **kwargs):
+    monkeypatch.setattr(report.ModelFactory, 'create_model', classmethod(lambda cls, config: llm))
+    config = ModelConfig(provider='openai', model_name='test', api_key='test')
+    return ReportGenerator(config, **kwargs)
+
+
+def big_content(lines=400):
+    return {'rows': [f"row {i}: value {i * 7} observed on site {i % 13}" for i in range(lines)]}
+
+
+def test_small_content_is_sent_whole(monkeypatch):
+    llm = FakeLLM()
+    generator = make_generator(monkeypatch, llm, max_input_tokens=10000, chunk_tokens=500)
+
+    result = asyncio.run(generator.agenerate_report({'title': 'Trial'}, "Summarize"))
+
+    assert result == "# Report\ndone"
+    assert llm.map_calls == []
+    assert "'title': 'Trial'" in llm.report_messages[1]['content']
+
+
+def test_split_text_respects_chunk_size(monkeypatch):
+    generator = make_generator(monkeypatch, FakeLLM(), chunk_tokens=50)
+    text = "\n".join(f"line {i} " * 5 for i in range(60)) + "\n" + "x" * 2000
+
+    chunks = generator.split_text(text)
+
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk) <= 50 + 5 for chunk in chunks)
+    assert "".join(chunks).replace("\n", "") == text.replace("\n", "")
+
+
+def test_large_content_is_map_reduced(monkeypatch):
+    llm = FakeLLM()
+    generator = make_generator(monkeypatch, llm, max_input_tokens=300, chunk_tokens=200)
+    content = big_content()
+
+    asyncio.run(generator.agenerate_report(content, "List the rows"))
+
+    chunks = generator.split_text(generator._serialize_content(content))
+    assert len(llm.map_calls) == len(chunks) > 1
+    assert all("Original Task: List the rows" in call for call in llm.map_calls)
+    assert f"Part {len(chunks)} of {len(chunks)}" in llm.map_calls[-1]
+    assert "### Part 1\n- fact" in llm.report_messages[1]['content']
+    assert generator._fits(llm.report_messages[1]['content'].split("Content to Analyze:")[1])
+
+
+def test_summaries_are_reduced_again_until_they_fit(monkeypatch):
+    # Each summary is long enough that the first round's summaries do not fit
+    llm = FakeLLM(summary="- summary fact " * 20)
+    generator = make_generator(monkeypatch, llm, max_input_tokens=400, chunk_tokens=200)
+    content = big_content()
+
+    asyncio.run(generator.agenerate_report(content, "List the rows"))
+
+    first_round = len(generator.split_text(generator._serialize_content(content)))
+    assert len(llm.map_calls) > first_round
+    assert any("### Part" in call for call in llm.map_calls[first_round:])
+    assert generator._fits(llm.report_messages[1]['content'].split("Content to Analyze:")[1])
+
+
+def test_content_still_too_large_is_truncated(monkeypatch, caplog):
+    # Summaries never shrink, so every reduce round still exceeds the limit
+    llm = FakeLLM(summary="\n".join(f"- fact {i} repeated" for i in range(60)))
+    generator = make_generator(monkeypatch, llm, max_input_tokens=200, chunk_tokens=100)
+
+    with caplog.at_level(logging.WARNING, logger=report.__name__):
+        asyncio.run(generator.agenerate_report(big_content(), "List the rows"))
+
+    assert f"after {MAX_REDUCE_ROUNDS} reduce rounds" in caplog.text
+    content = llm.report_messages[1]['content'].split("Content to Analyze:")[1]
+    assert count_tokens(content) <= 200 + 50
+
+
+def test_sync_report_uses_the_same_map_reduce(monkeypatch):
+    llm = FakeLLM()
+    generator = make_generator(monkeypatch, llm, max_input_tokens=300, chunk_tokens=200)
+
+    result = generator.generate_report(big_content(), "List the rows")
+
+    assert result == "# Report\ndone"
+    assert llm.map_calls
+    assert "### Part 1" in llm.report_messages[1]['content']
+
+
+def test_report_is_streamed_to_file(monkeypatch, tmp_path):
+    generator = make_generator(monkeypatch, FakeLLM())
+    output = tmp_path / "reports" / "report.md"
+
+    result = asyncio.run(generator.agenerate_report({'title': 'Trial'}, "Summarize", output))
+
+    assert output.read_text() == result == "# Report\ndone"
+    assert list(output.parent.iterdir()) == [output]
+
+
+def test_failed_stream_leaves_no_partial_report(monkeypatch, tmp_path):
+    generator = make_generator(monkeypatch, FakeLLM(fail_after=2))
+    output = tmp_path / "report.md"
+    output.write_text("previous report")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(generator.agenerate_report({'title': 'Trial'}, "Summarize", output))
+
+    assert output.read_text() == "previous report"
+    assert list(tmp_path.iterdir()) == [output]
+
+
+def test_cached_model_is_invoked_whole(monkeypatch, tmp_path):
+    llm = FakeLLM(fail_after=0, cache=object())
+    generator = make_generator(monkeypatch, llm)
+    output = tmp_path / "report.md"
+
+    result = asyncio.run(generator.agenerate_report({'title': 'Trial'}, "Summarize", output))
+
+    assert output.read_text() == result == "# Report\ndone"
+
+
+class SlowLLM(FakeLLM):
+    """Fake model that tracks how many chunk summaries run at once."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.running = 0
+        self.peak = 0
+
+    async def ainvoke(self, messages):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return await super().ainvoke(messages)
+
+
+def test_chunks_are_summarized_concurrently_within_the_limit(monkeypatch, tmp_path):
+    llm = SlowLLM()
+    generator = make_generator(monkeypatch, llm, max_input_tokens=300, chunk_tokens=100, map_concurrency=3)
+    output = tmp_path / "report.md"
+
+    result = asyncio.run(generator.agenerate_report(big_content(), "List the rows", output))
+
+    assert len(llm.map_calls) > 3
+    assert llm.peak == 3
+    # The final request carries only the joined summaries, not the raw rows
+    assert "row 399" not in llm.report_messages[1]['content']
+    assert count_tokens(llm.report_messages[1]['content']) < count_tokens(str(big_content()))
+    assert output.read_text() == result
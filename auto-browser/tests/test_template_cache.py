@@ -0,0 +1,105 @@
+"""Tests for the AI template cache."""
+
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+
+from browser_automation import browser, cli, template_cache
+from browser_automation.template_cache import TemplateCache
+from browser_automation.template_generator import Selector, Template
+
+
+def make_template(name="temp"):
+    return Template(name=name, description="Extract the trial", url_pattern="https://example.com/trials/1",
+                    selectors={'title': Selector(css="h1")})
+
+
+def test_urls_with_the_same_layout_share_an_entry(tmp_path):
+    cache = TemplateCache(tmp_path)
+    cache.put("https://www.example.com/trials/2023-1?page=2", "Extract  the Trial", make_template())
+
+    assert cache.get("https://example.com/trials/2024-7?page=5", "extract the trial").selectors['title'].css == "h1"
+    assert cache.get("https://example.com/trials/2024-7", "extract the trial") is None
+    assert cache.get("https://example.com/trials/2024-7?page=5", "Summarize") is None
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(template_cache.time, 'time', lambda: now[0])
+    cache = TemplateCache(tmp_path, ttl=60)
+    cache.put("https://example.com/a", "prompt", make_template())
+
+    now[0] += 59
+    assert cache.get("https://example.com/a", "prompt") is not None
+    now[0] += 2
+    assert cache.get("https://example.com/a", "prompt") is None
+    assert list(tmp_path.glob("*.json")) == []
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = TemplateCache(tmp_path, max_entries=2)
+    for i, page in enumerate(("a", "b")):
+        cache.put(f"https://example.com/{page}", "prompt", make_template())
+        os.utime(cache._entry_path(f"https://example.com/{page}", "prompt"), (i, i))
+
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("https://example.com/a", "prompt") is not None
+    cache.put("https://example.com/c", "prompt", make_template())
+
+    assert cache.get("https://example.com/b", "prompt") is None
+    assert cache.get("https://example.com/a", "prompt") is not None
+    assert cache.get("https://example.com/c", "prompt") is not None
+
+
+def test_eviction_skips_entries_removed_concurrently(tmp_path, monkeypatch):
+    cache = TemplateCache(tmp_path, max_entries=1)
+    cache.put("https://example.com/a", "prompt", make_template())
+    gone = tmp_path / "removed-by-another-job.json"
+    listed = [gone, *tmp_path.glob("*.json")]
+    monkeypatch.setattr(Path, 'glob', lambda self, pattern: iter(listed))
+
+    cache._evict()
+
+    assert cache.get("https://example.com/a", "prompt") is not None
+
+
+class TemplateReached(Exception):
+    """Raised by the fake browser once run_all_tasks has picked a template."""
+
+
+def test_refresh_template_bypasses_the_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generated = []
+
+    class FakeGenerator:
+        def __init__(self, **kwargs):
+            pass
+
+        async def create_template(self, url, name, description):
+            generated.append(url)
+            return make_template(name)
+
+    class FakeAutomation:
+        def __init__(self, config, *args, **kwargs):
+            self.config = config
+
+        async def process_url(self, url):
+            raise TemplateReached(self.config['selectors'])
+
+    monkeypatch.setattr(cli, 'TemplateGenerator', FakeGenerator)
+    monkeypatch.setattr(browser, 'BrowserAutomation', FakeAutomation)
+
+    def run(refresh_template):
+        with pytest.raises(TemplateReached) as reached:
+            asyncio.run(cli.run_all_tasks("https://example.com/trials/1", "Extract the trial", interactive=False,
+                                          verbose=False, report=False, refresh_template=refresh_template))
+        return reached.value.args[0]
+
+    assert run(refresh_template=False) == {'title': 'h1'}
+    assert run(refresh_template=False) == {'title': 'h1'}
+    assert len(generated) == 1
+    assert run(refresh_template=True) == {'title': 'h1'}
+    assert len(generated) == 2
+    assert len(list((tmp_path / "output" / ".cache" / "templates").glob("*.json"))) == 1
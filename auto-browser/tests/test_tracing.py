@@ -0,0 +1,167 @@
+"""Tests for timing spans and LLM call tracing."""
+
+import asyncio
+import time
+from typing import Any, List, Optional
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from browser_automation.tracing import Tracer, current_tracer, span, trace_agent
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers after a short delay and reports token usage."""
+
+    delay: float = 0.01
+    fail: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self):
+        return {"model_name": "fake-model"}
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("provider unavailable")
+        message = AIMessage(content="done", usage_metadata={"input_tokens": 12, "output_tokens": 3,
+                                                             "total_tokens": 15})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def events_named(tracer, name):
+    return [event for event in tracer.events if event["name"] == name]
+
+
+def test_spans_nest_on_one_track():
+    tracer = Tracer()
+    timings = {}
+
+    with tracer.activate():
+        with span("extract", timings=timings, url="https://example.com") as info:
+            with span("extract.selectors"):
+                pass
+            info["complete"] = True
+
+    outer, inner = events_named(tracer, "extract")[0], events_named(tracer, "extract.selectors")[0]
+    assert outer["tid"] == inner["tid"]
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"] + 1
+    assert outer["args"] == {"url": "https://example.com", "complete": True}
+    assert timings["extract"] >= 0
+    assert current_tracer() is None
+
+
+def test_concurrent_tasks_get_their_own_tracks():
+    tracer = Tracer()
+
+    async def job(name):
+        with span(name):
+            await asyncio.sleep(0.01)
+            with span(f"{name}.step"):
+                await asyncio.sleep(0)
+
+    async def run():
+        with tracer.activate():
+            with span("batch"):
+                await asyncio.gather(job("a"), job("b"))
+
+    asyncio.run(run())
+
+    tracks = {event["name"]: event["tid"] for event in tracer.events}
+    assert tracks["a"] == tracks["a.step"]
+    assert tracks["b"] == tracks["b.step"]
+    assert len({tracks["batch"], tracks["a"], tracks["b"]}) == 3
+
+
+def test_spans_are_only_recorded_while_a_tracer_is_active():
+    timings = {}
+    with span("report", timings=timings):
+        pass
+
+    assert "report" in timings
+    assert current_tracer() is None
+
+
+def test_llm_calls_record_tokens_and_latency_inside_a_span():
+    tracer = Tracer()
+    model = FakeChatModel(delay=0.02)
+
+    with tracer.activate():
+        with span("agent.extract", category="agent"):
+            assert model.invoke("Extract the title").content == "done"
+
+    call = events_named(tracer, "llm.call")[0]
+    agent = events_named(tracer, "agent.extract")[0]
+    assert call["cat"] == "llm"
+    assert call["args"]["input_tokens"] == 12
+    assert call["args"]["output_tokens"] == 3
+    assert call["dur"] >= 20000
+    assert call["tid"] == agent["tid"]
+    assert agent["ts"] <= call["ts"]
+
+
+def test_async_llm_calls_are_traced():
+    tracer = Tracer()
+    model = FakeChatModel()
+
+    async def run():
+        with tracer.activate():
+            with span("report"):
+                await model.ainvoke("Summarize")
+
+    asyncio.run(run())
+
+    assert events_named(tracer, "llm.call")[0]["args"]["output_tokens"] == 3
+
+
+def test_failed_llm_calls_are_recorded_with_the_error():
+    tracer = Tracer()
+    model = FakeChatModel(fail=True)
+
+    with tracer.activate():
+        with pytest.raises(RuntimeError):
+            model.invoke("Extract the title")
+
+    call = events_named(tracer, "llm.call")[0]
+    assert "provider unavailable" in call["args"]["error"]
+
+
+def test_llm_calls_are_not_traced_after_the_tracer_is_deactivated():
+    tracer = Tracer()
+    with tracer.activate():
+        pass
+
+    FakeChatModel().invoke("Extract the title")
+
+    assert tracer.events == []
+
+
+def test_agent_steps_become_spans():
+    class FakeStepAgent:
+        n_steps = 1
+
+        async def step(self):
+            self.n_steps += 1
+
+    tracer = Tracer()
+    agent = FakeStepAgent()
+
+    async def run():
+        with tracer.activate():
+            traced = trace_agent(agent, "agent.extract")
+            await traced.step()
+            await traced.step()
+
+    asyncio.run(run())
+
+    steps = events_named(tracer, "agent.extract.step")
+    assert [event["args"]["step"] for event in steps] == [1, 2]
+    assert all(event["cat"] == "agent" for event in steps)
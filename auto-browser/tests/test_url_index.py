@@ -0,0 +1,83 @@
+"""Tests for the URL-pattern template index."""
+
+import time
+
+from browser_automation.config import SiteRegistry
+from browser_automation.url_index import UrlPatternIndex
+
+
+def make_index():
+    return UrlPatternIndex([
+        ("trial", "https://euclinicaltrials.eu/ctis-public/view/{trial_id}"),
+        ("trial_search", "https://euclinicaltrials.eu/ctis-public/view/search"),
+        ("product", "https://shop.example.com/item-{sku}.html"),
+        ("category", "https://shop.example.com/{category}"),
+        ("results", "https://example.com/search?q={query}&lang=en"),
+    ])
+
+
+def test_placeholders_capture_url_values():
+    found = make_index().match("https://euclinicaltrials.eu/ctis-public/view/2022-500814-24-00")
+
+    assert found.name == "trial"
+    assert found.params == {"trial_id": "2022-500814-24-00"}
+
+
+def test_literal_segments_win_over_placeholders():
+    assert make_index().match("https://euclinicaltrials.eu/ctis-public/view/search").name == "trial_search"
+
+
+def test_mixed_segments_win_over_wildcards():
+    index = make_index()
+
+    product = index.match("https://shop.example.com/item-42.html")
+    assert product.name == "product" and product.params == {"sku": "42"}
+    assert index.match("https://shop.example.com/garden").name == "category"
+
+
+def test_scheme_www_and_trailing_slash_are_ignored():
+    found = make_index().match("http://www.euclinicaltrials.eu/ctis-public/view/ABC/")
+
+    assert found.name == "trial"
+    assert found.params == {"trial_id": "ABC"}
+
+
+def test_query_parameters_must_match():
+    index = make_index()
+
+    found = index.match("https://example.com/search?lang=en&q=aspirin&page=2")
+    assert found.name == "results" and found.params == {"query": "aspirin"}
+    assert index.match("https://example.com/search?q=aspirin&lang=de") is None
+    assert index.match("https://example.com/search?lang=en") is None
+
+
+def test_unknown_urls_do_not_match():
+    index = make_index()
+
+    assert index.match("https://other.example.org/view/1") is None
+    assert index.match("https://euclinicaltrials.eu/ctis-public/view/1/extra") is None
+
+
+def test_lookup_cost_does_not_grow_with_template_count():
+    index = UrlPatternIndex(
+        (f"site{i}", f"https://site{i}.example.com/products/{{id}}") for i in range(10000)
+    )
+    started = time.perf_counter()
+    for _ in range(1000):
+        found = index.match("https://site9999.example.com/products/17")
+    elapsed = time.perf_counter() - started
+
+    assert found.name == "site9999" and found.params == {"id": "17"}
+    assert elapsed < 1.0
+
+
+def test_site_registry_matches_raw_templates():
+    sites = SiteRegistry({
+        "trial": {"name": "trial", "url_pattern": "https://euclinicaltrials.eu/ctis-public/view/{trial_id}",
+                  "selectors": {"title": "h1"}},
+        "no_pattern": {"name": "no_pattern", "selectors": {}},
+    })
+
+    found = sites.match("https://euclinicaltrials.eu/ctis-public/view/2023-1")
+    assert found.name == "trial"
+    assert sites[found.name].selectors["title"].css == "h1"